@@ -0,0 +1,86 @@
+import sys
+import struct
+import subprocess
+
+from common import measure, metric
+
+# Benchmarks for the Linux memory backend (eolinux) against a real process.
+# A helper child process allocates a buffer with known contents and prints
+# its address; the bot's per-tick reads are timed as separate read_int calls
+# and as one batched read_many (one process_vm_readv), plus scanner-sized
+# chunk reads. Skipped where process_vm_readv isn't available or permitted.
+
+BUFFER_SIZE = 8 * 1024 * 1024
+CHUNK_SIZE = 4 * 1024 * 1024
+TICKS = 2000
+
+# Offsets into the helper's buffer standing in for the bot's addresses
+MOB_OFFSET = 0x1000       # spawn_face_addr: 8 ints
+PLAYER_OFFSET = 0x2000    # char_x_addr: 2 ints
+INDICATOR_OFFSET = 0x1000 + 0x14 + 0x98  # mob_id_addr1
+
+HELPER = r"""
+import sys, ctypes
+size = int(sys.argv[1])
+buffer = ctypes.create_string_buffer(bytes((i * 7) & 0xFF for i in range(256)) * (size // 256))
+print(ctypes.addressof(buffer), flush=True)
+sys.stdin.read()
+"""
+
+def expected(offset, size):
+    return bytes(((offset + i) * 7) & 0xFF for i in range(size))
+
+def run(options):
+    if not sys.platform.startswith('linux'):
+        print("  skipped: process_vm_readv is Linux-only")
+        return {}
+    from eolinux import LinuxProcess
+
+    helper = subprocess.Popen([sys.executable, '-c', HELPER, str(BUFFER_SIZE)],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    try:
+        base = int(helper.stdout.readline())
+        pm = LinuxProcess(helper.pid)
+        try:
+            if pm.read_bytes(base + MOB_OFFSET, 32) != expected(MOB_OFFSET, 32):
+                raise RuntimeError("read back the wrong bytes")
+        except MemoryError as e:
+            print(f"  skipped: {e} (ptrace not permitted?)")
+            return {}
+
+        mob, player, indicators = base + MOB_OFFSET, base + PLAYER_OFFSET, base + INDICATOR_OFFSET
+        spans = [(mob, 32), (player, 8)]
+
+        def separate():
+            # The bot's old tick: six mob ints, two player ints, four indicator bytes
+            for _ in range(TICKS):
+                for address in range(mob, mob + 32, 4):
+                    if address not in (mob + 12, mob + 16):
+                        pm.read_int(address)
+                pm.read_int(player)
+                pm.read_int(player + 4)
+                for offset in (0, 4, 8, 12):
+                    pm.read_bytes(indicators + offset, 1)
+
+        def batched():
+            for _ in range(TICKS):
+                blocks = pm.read_many(spans)
+                struct.unpack('<8i', blocks[0])
+                struct.unpack('<2i', blocks[1])
+                pm.read_bytes(indicators, 0xD)
+
+        separate_time, _ = measure(separate, options.repeat)
+        batched_time, _ = measure(batched, options.repeat)
+        chunk_time, data = measure(lambda: pm.read_bytes(base, CHUNK_SIZE), options.repeat)
+        if data != expected(0, 256) * (CHUNK_SIZE // 256):
+            raise RuntimeError("chunk read back the wrong bytes")
+    finally:
+        helper.stdin.close()
+        helper.wait()
+
+    return {
+        'memory.tick_reads_separate': metric(separate_time / TICKS * 1e6, 'us/tick', calls=12),
+        'memory.tick_reads_batched': metric(batched_time / TICKS * 1e6, 'us/tick', calls=2),
+        'memory.tick_reads_speedup': metric(separate_time / batched_time, 'x', better='higher'),
+        'memory.chunk_read': metric(CHUNK_SIZE / chunk_time / 1e6, 'MB/s', better='higher'),
+    }
@@ -0,0 +1,160 @@
+import random
+import struct
+import tracemalloc
+
+from common import eosim, measure, metric, synthetic_memory, plant_offsets
+from eosignatures import PLAYER, Signature, SignatureSet
+
+# Benchmarks for the signature scanners over generated buffers.
+# Each buffer gets a known number of planted signatures so the benchmark
+# also checks that every one of them is found.
+
+def mob_record(rng):
+    """A 32-byte record matching memoryscan-MOBloc's pattern."""
+    control = rng.randint(0, 3)
+    return struct.pack('<8I', rng.randint(0, 3), rng.randint(1, 255), rng.randint(1, 255),
+                       control, control, 0, 0, 0)
+
+def player_record(rng):
+    """A 32-byte record matching memoryscan-PLAYERloc_XYabove4's pattern."""
+    record = bytearray(32)
+    record[0] = rng.randint(4, 180)
+    record[4] = rng.randint(4, 180)
+    record[8:10] = bytes(rng.getrandbits(8) for _ in range(2))
+    record[12:14] = bytes(rng.getrandbits(8) for _ in range(2))
+    record[24:30] = bytes(rng.getrandbits(8) for _ in range(6))
+    record[30:32] = b'\xff\xff'
+    return bytes(record)
+
+def collect_scan(scanner, pm, cache=None):
+    """Run one scan into a ScanStore, the way the scanners' main() does."""
+    store = scanner.ScanStore()
+    store.add_scan(1, scanner.scan_memory(pm, 1) if cache is None else scanner.scan_memory(pm, 2, cache=cache))
+    return store
+
+def peak_memory(func):
+    """Peak traced allocation (bytes) while func runs."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def planted_buffer(size, count, make_record, seed):
+    rng = random.Random(seed)
+    data = synthetic_memory(size, seed)
+    offsets = plant_offsets(size, count, 32, seed)
+    for offset in offsets:
+        data[offset:offset + 32] = make_record(rng)
+    return data, offsets
+
+def bench_mob_scanner(options):
+    with eosim.quiet():
+        scanner = eosim.load_script('memoryscan-MOBloc.py')
+    size = scanner.END_ADDR - scanner.START_ADDR
+    data, offsets = planted_buffer(size, 16, mob_record, seed=1)
+    pm = eosim.BufferMemory(scanner.START_ADDR, data)
+
+    with eosim.quiet():
+        seconds, store = measure(lambda: collect_scan(scanner, pm), repeat=options.repeat)
+
+    found = set((store.addresses - scanner.START_ADDR).tolist())
+    missing = len(set(offsets) - found)
+    return {
+        'scanner.mob.window_scan': metric(seconds, 's', bytes=size, matches=len(store),
+                                          planted=len(offsets), missing=missing),
+        'scanner.mob.throughput': metric(size / seconds / 1e6, 'MB/s', better='higher'),
+    }
+
+def bench_player_scanner(options):
+    with eosim.quiet():
+        scanner = eosim.load_script('memoryscan-PLAYERloc_XYabove4.py')
+    size = int(options.player_mb * 1024 * 1024)
+    data, offsets = planted_buffer(size, 32, player_record, seed=2)
+    pm = eosim.BufferMemory(scanner.START_ADDR, data)
+
+    # Scan only the generated region instead of the full 48 MB window
+    scanner.END_ADDR = scanner.START_ADDR + size
+
+    with eosim.quiet():
+        seconds, store = measure(lambda: collect_scan(scanner, pm), repeat=options.repeat)
+        peak = peak_memory(lambda: collect_scan(scanner, pm))
+
+    found = set((store.addresses - scanner.START_ADDR).tolist())
+    missing = len(set(offsets) - found)
+
+    # Repeat scan with a page cache, a few pages changed since the first scan
+    cache = scanner.PageCache()
+    with eosim.quiet():
+        collect_scan(scanner, pm, cache)
+        changed = bytearray(data)
+        for offset in range(0, size, size // 8):
+            changed[offset:offset + 32] = bytes(32)
+        pm = eosim.BufferMemory(scanner.START_ADDR, changed)
+        rescan_seconds, rescan_store = measure(lambda: collect_scan(scanner, pm, cache), repeat=options.repeat)
+    rescan_missing = len(set(offsets) - set((rescan_store.addresses - scanner.START_ADDR).tolist()))
+    return {
+        'scanner.player.scan': metric(seconds, 's', bytes=size, matches=len(store),
+                                      planted=len(offsets), missing=missing),
+        'scanner.player.peak_memory': metric(peak / 1e6, 'MB', matches=len(store)),
+        'scanner.player.throughput': metric(size / seconds / 1e6, 'MB/s', better='higher'),
+        'scanner.player.rescan_throughput': metric(size / rescan_seconds / 1e6, 'MB/s', better='higher',
+                                                   matches=len(rescan_store), missing=rescan_missing),
+    }
+
+def bench_pattern_match(options):
+    """Raw is_pattern_match cost per offset for both signatures."""
+    results = {}
+    for name, filename in (('mob', 'memoryscan-MOBloc.py'),
+                           ('player', 'memoryscan-PLAYERloc_XYabove4.py')):
+        with eosim.quiet():
+            scanner = eosim.load_script(filename)
+        data = bytes(synthetic_memory(256 * 1024, seed=3))
+        match = scanner.is_pattern_match
+        limit = len(data) - 32
+
+        def run():
+            count = 0
+            for offset in range(limit):
+                if match(data, offset):
+                    count += 1
+            return count
+
+        seconds, _ = measure(run, repeat=options.repeat)
+        results[f'scanner.{name}.is_pattern_match'] = metric(seconds / limit * 1e9, 'ns/offset')
+    return results
+
+def extra_signature(i):
+    """Made-up 32-byte structures (HP/EXP/target-like) with an FF FF marker, like the player record."""
+    ranges = {0: (1, 200), 8: (0, 0), 9: (0, 0), 16: (i, i + 40), 28 + i % 3: (0xFF, 0xFF)}
+    ranges.update({index: (0, 0) for index in range(20, 24)})
+    return Signature(f'extra{i}', 32, ranges)
+
+def bench_signature_set(options):
+    """Several signatures over one buffer: one find() each vs one SignatureSet.find()."""
+    size = int(options.player_mb * 1024 * 1024)
+    data, offsets = planted_buffer(size, 32, player_record, seed=4)
+    data = bytes(data)
+    signatures = [PLAYER] + [extra_signature(i) for i in range(7)]
+
+    results = {}
+    for count in (1, 8):
+        chosen = signatures[:count]
+        signature_set = SignatureSet(chosen)
+        separate, found = measure(lambda: [s.find(data) for s in chosen], repeat=options.repeat)
+        together, matches = measure(lambda: signature_set.find(data), repeat=options.repeat)
+        mismatched = sum(set(a.tolist()) != set(matches[s].tolist()) for s, a in zip(chosen, found))
+        missing = len(set(offsets) - set(matches[PLAYER].tolist()))
+        results[f'scanner.signatures_{count}.separate'] = metric(separate * 1000, 'ms', bytes=size)
+        results[f'scanner.signatures_{count}.set'] = metric(together * 1000, 'ms', bytes=size,
+                                                            mismatched=mismatched, missing=missing)
+    return results
+
+def run(options):
+    results = {}
+    results.update(bench_pattern_match(options))
+    results.update(bench_signature_set(options))
+    results.update(bench_mob_scanner(options))
+    results.update(bench_player_scanner(options))
+    return results
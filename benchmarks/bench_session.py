@@ -0,0 +1,24 @@
+import statistics
+
+from common import eosim, metric
+
+# Full farming sessions: the real bot loop against the headless game model.
+
+def run(options):
+    results = {}
+    for name, npc_table in (('session', False), ('session.npc_table', True)):
+        kills_per_hour = []
+        real_seconds = 0.0
+        for seed in range(options.session_seeds):
+            result = eosim.run_bot_session(duration=options.session_hours * 3600, seed=seed,
+                                           npc_table=npc_table)
+            kills_per_hour.append(result['kills_per_hour'])
+            real_seconds += result['real_seconds']
+
+        sim_seconds = options.session_hours * 3600 * options.session_seeds
+        results[f'{name}.kills_per_hour'] = metric(
+            statistics.mean(kills_per_hour), 'kills/h', better='higher',
+            per_seed=kills_per_hour,
+            stdev=statistics.stdev(kills_per_hour) if len(kills_per_hour) > 1 else 0.0)
+        results[f'{name}.sim_speed'] = metric(sim_seconds / real_seconds, 'x realtime', better='higher')
+    return results
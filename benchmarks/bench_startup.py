@@ -0,0 +1,49 @@
+import os
+import sys
+import json
+import subprocess
+import importlib.util
+
+from common import REPO_DIR, measure, metric
+
+# Benchmarks for cold start: a fresh interpreter importing the bot and the
+# scanners' shared modules, which of the heavy modules that pulls in (they
+# should load only on the paths that use them), and the in-process
+# dependency check of install-dependencies.py.
+
+HEAVY_MODULES = ('numpy', 'psutil', 'pymem', 'http.server', 'cProfile', 'concurrent.futures')
+
+def python(code):
+    return subprocess.run([sys.executable, '-c', code], cwd=REPO_DIR, check=True,
+                          stdout=subprocess.PIPE).stdout
+
+def loaded_heavy_modules(module):
+    code = f"import sys, json, {module}; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    return json.loads(python(code))
+
+def load_installer():
+    spec = importlib.util.spec_from_file_location('install_dependencies',
+                                                  os.path.join(REPO_DIR, 'install-dependencies.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def run(options):
+    results = {}
+    interpreter, _ = measure(lambda: python('pass'), repeat=max(options.repeat, 5))
+    results['startup.interpreter'] = metric(interpreter * 1000, 'ms')
+    for name, module in (('bot', 'eobot032025'), ('watchdog', 'eowatchdog'), ('status', 'eostatus')):
+        seconds, _ = measure(lambda: python(f'import {module}'), repeat=max(options.repeat, 5))
+        results[f'startup.import_{name}'] = metric((seconds - interpreter) * 1000, 'ms')
+    heavy = loaded_heavy_modules('eobot032025')
+    results['startup.bot_heavy_modules'] = metric(len(heavy), 'modules', loaded=heavy)
+
+    installer = load_installer()
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            seconds, missing = measure(installer.missing_dependencies, repeat=options.repeat)
+        finally:
+            sys.stdout = stdout
+    results['startup.dependency_check'] = metric(seconds * 1000, 'ms', missing=missing)
+    return results
@@ -0,0 +1,69 @@
+import time
+import math
+
+from common import metric
+from eotiming import PreciseTimer, TimingStats
+
+# Benchmarks for key-hold timing (eotiming): the error of 30-50 ms waits
+# done with time.sleep and with PreciseTimer, on this machine's clock and on
+# a virtual clock whose sleeps wake on the next timer tick (how sleeps
+# behave on Windows), which gives the same numbers everywhere.
+
+DURATIONS = (0.03, 0.05, 0.03, 0.04)
+REAL_WAITS = 80
+VIRTUAL_WAITS = 2000
+COARSE_TICK = 0.0156   # default Windows timer
+FINE_TICK = 0.001      # after timeBeginPeriod(1)
+SPIN_COST = 0.000002   # virtual time per spin round
+
+class TickClock:
+    """Virtual clock whose sleeps end on the next tick; sleep(0) costs one spin round."""
+
+    def __init__(self, tick, start=0.0):
+        self.tick = tick
+        self.now = start
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds <= 0:
+            self.now += SPIN_COST
+        else:
+            self.now = math.ceil((self.now + seconds) / self.tick) * self.tick
+
+def plain_sleep_stats(clock, count):
+    stats = TimingStats()
+    for i in range(count):
+        duration = DURATIONS[i % len(DURATIONS)]
+        started = clock.perf_counter()
+        clock.sleep(duration)
+        stats.add(duration, clock.perf_counter() - started, 0.0)
+        # Presses don't start on tick boundaries
+        clock.sleep(0)
+    return stats
+
+def timer_stats(timer, count):
+    for i in range(count):
+        timer.wait(DURATIONS[i % len(DURATIONS)])
+        timer.clock.sleep(0)
+    return timer.stats
+
+def run(options):
+    results = {}
+
+    for name, tick in (('coarse', COARSE_TICK), ('fine', FINE_TICK)):
+        sleep = plain_sleep_stats(TickClock(tick, start=0.0037), VIRTUAL_WAITS)
+        timer = timer_stats(PreciseTimer(TickClock(tick, start=0.0037)), VIRTUAL_WAITS)
+        results[f'timing.{name}_tick.sleep_p95_error'] = metric(sleep.percentile(95) * 1000, 'ms')
+        results[f'timing.{name}_tick.timer_p95_error'] = metric(timer.percentile(95) * 1000, 'ms')
+        results[f'timing.{name}_tick.timer_spin_share'] = metric(timer.spin_time / timer.wait_time * 100, '%')
+
+    sleep = plain_sleep_stats(time, REAL_WAITS)
+    started_cpu = time.process_time()
+    timer = timer_stats(PreciseTimer(), REAL_WAITS)
+    cpu = time.process_time() - started_cpu
+    results['timing.real.sleep_p95_error'] = metric(sleep.percentile(95) * 1000, 'ms')
+    results['timing.real.timer_p95_error'] = metric(timer.percentile(95) * 1000, 'ms')
+    results['timing.real.timer_cpu_share'] = metric(cpu / timer.wait_time * 100, '%')
+    return results
@@ -0,0 +1,120 @@
+import random
+import struct
+
+from common import eosim, measure, metric
+from eotracker import MobTracker, FACE_OFFSETS
+import eonpctable
+
+# Benchmarks for mob tracking and target selection at different mob counts.
+
+MOB_COUNTS = (10, 100, 1000)
+MAP_SIZE = 200
+
+def populated_tracker(count, seed):
+    rng = random.Random(seed)
+    tracker = MobTracker(verbose=False)
+    taken = set()
+    while len(tracker.mobs) < count:
+        x, y = rng.randrange(1, MAP_SIZE), rng.randrange(1, MAP_SIZE)
+        if (x, y) not in taken:
+            taken.add((x, y))
+            tracker.on_spawn(rng.randrange(4), x, y, now=0.0)
+    return tracker
+
+def move_updates(tracker, count, seed):
+    """
+    Pre-generate "last moved mob" updates that follow real mob positions.
+    Like in the game, a mob doesn't step onto a tile another mob stands on.
+    Returns the updates and the mobs' final positions.
+    """
+    rng = random.Random(seed)
+    positions = {mob_id: (m['x'], m['y']) for mob_id, m in tracker.mobs.items()}
+    occupied = set(positions.values())
+    ids = list(positions)
+    updates = []
+    while len(updates) < count:
+        mob_id = rng.choice(ids)
+        face = rng.randrange(4)
+        dx, dy = FACE_OFFSETS[face]
+        x, y = positions[mob_id]
+        if (x + dx, y + dy) in occupied:
+            continue
+        occupied.discard((x, y))
+        occupied.add((x + dx, y + dy))
+        positions[mob_id] = (x + dx, y + dy)
+        updates.append((face, x + dx, y + dy))
+    return updates, set(positions.values())
+
+def covered(tracker, positions):
+    """How many of the real mob positions have a tracked mob on them."""
+    return len(positions & {(m['x'], m['y']) for m in tracker.mobs.values()})
+
+def npc_table_memory(count, seed):
+    """An NPC table (sim layout) with count live mobs and a few empty slots."""
+    layout = eosim.npc_table_layout(eosim.SimulatedGame(seed=seed))
+    layout.count = count + count // 4
+    rng = random.Random(seed)
+    data = bytearray(layout.size)
+    for slot in range(count):
+        entry = slot * layout.stride
+        for field, value in (('id', slot + 1), ('face', rng.randrange(4)), ('hp', 3),
+                             ('x', rng.randrange(1, MAP_SIZE)), ('y', rng.randrange(1, MAP_SIZE))):
+            struct.pack_into('<i', data, entry + layout.offsets[field], value)
+    return layout, eosim.BufferMemory(layout.base, data)
+
+def run(options):
+    with eosim.quiet():
+        bot = eosim.load_script('eobot032025.py', 'eobot_bench')
+
+    results = {}
+    for count in MOB_COUNTS:
+        # Tracker updates (identity matching against every tracked mob)
+        updates, positions = move_updates(populated_tracker(count, seed=count), 2000, seed=count)
+
+        def apply_updates():
+            tracker = populated_tracker(count, seed=count)
+            for i, (face, x, y) in enumerate(updates):
+                tracker.on_mob_move(face, x, y, now=i * 0.01)
+            return tracker
+
+        setup_seconds, _ = measure(lambda: populated_tracker(count, seed=count), repeat=options.repeat)
+        seconds, tracker = measure(apply_updates, repeat=options.repeat)
+
+        # Same updates with every fourth one missed by the sampler
+        missed = populated_tracker(count, seed=count)
+        for i, (face, x, y) in enumerate(updates):
+            if i % 4 != 3:
+                missed.on_mob_move(face, x, y, now=i * 0.01)
+
+        # phantom_mobs alone can hide lost ones (a wrong match moves a mob off
+        # its real tile), so also report how many real positions are tracked
+        results[f'tracker.update.{count}'] = metric(
+            (seconds - setup_seconds) / len(updates) * 1e6, 'us/update',
+            phantom_mobs=len(tracker.mobs) - count,
+            phantom_mobs_missed_samples=len(missed.mobs) - count,
+            tracked_positions=covered(tracker, positions),
+            tracked_positions_missed_samples=covered(missed, positions))
+
+        # NPC table: one bulk read per tick instead of per-update matching
+        layout, memory = npc_table_memory(count, seed=count)
+        table_tracker = eonpctable.NpcTableTracker(layout, verbose=False)
+        seconds, _ = measure(lambda: table_tracker.update(memory, now=1.0), repeat=options.repeat, number=50)
+        results[f'tracker.table_update.{count}'] = metric(seconds * 1e6, 'us/tick', mobs=len(table_tracker.mobs))
+
+        # Inactivity sweep
+        tracker = populated_tracker(count, seed=count)
+        seconds, _ = measure(lambda: tracker.sweep_inactive(now=1.0), repeat=options.repeat, number=50)
+        results[f'tracker.sweep.{count}'] = metric(seconds * 1e6, 'us/sweep')
+
+        # Target selection
+        rng = random.Random(count)
+        queries = [(rng.randrange(MAP_SIZE), rng.randrange(MAP_SIZE)) for _ in range(200)]
+        mob_ids = list(tracker.mobs)
+
+        def select_targets():
+            for i, (cx, cy) in enumerate(queries):
+                bot.get_closest_mob(tracker.mobs, cx, cy, mob_ids[i % len(mob_ids)], False)
+
+        seconds, _ = measure(select_targets, repeat=options.repeat)
+        results[f'targeting.get_closest_mob.{count}'] = metric(seconds / len(queries) * 1e6, 'us/call')
+    return results
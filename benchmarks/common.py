@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+import random
+
+# Make the repo's modules importable when running from benchmarks/
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+import eosim
+
+def measure(func, repeat=3, number=1):
+    """Run func number times per round, repeat rounds; return best seconds per call."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            result = func()
+        elapsed = (time.perf_counter() - start) / number
+        best = min(best, elapsed)
+    return best, result
+
+def metric(value, unit, better='lower', **extra):
+    """One benchmark result entry for the JSON report."""
+    entry = {'value': value, 'unit': unit, 'better': better}
+    entry.update(extra)
+    return entry
+
+def synthetic_memory(size, seed, zero_fraction=0.6):
+    """
+    Random bytes that look roughly like process memory (mostly zeros).
+
+    Returns a bytearray so callers can plant signatures into it.
+    """
+    rng = random.Random(seed)
+    if hasattr(rng, 'randbytes'):
+        data = rng.randbytes(size)
+    else:
+        data = bytes(rng.getrandbits(8) for _ in range(size))
+    cutoff = int(256 * zero_fraction)
+    table = bytes(0 if b < cutoff else b for b in range(256))
+    return bytearray(data.translate(table))
+
+def plant_offsets(size, count, record_size, seed, align=4):
+    """Pick `count` non-overlapping aligned offsets for planted records."""
+    rng = random.Random(seed)
+    slots = (size - 2 * record_size) // (record_size + align)
+    picked = sorted(rng.sample(range(slots), min(count, slots)))
+    return [record_size + i * (record_size + align) // align * align for i in picked]
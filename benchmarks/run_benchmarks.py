@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+
+import common
+import bench_scanners
+import bench_tracker
+import bench_session
+import bench_memory
+import bench_timing
+import bench_startup
+
+# Runs every benchmark suite and writes the results as JSON.
+# Compare against a saved run with --compare to catch regressions:
+#   python benchmarks/run_benchmarks.py --output new.json --compare baseline.json
+
+SUITES = {
+    'scanners': bench_scanners,
+    'tracker': bench_tracker,
+    'session': bench_session,
+    'memory': bench_memory,
+    'timing': bench_timing,
+    'startup': bench_startup,
+}
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'latest.json')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run bot/scanner benchmarks on synthetic data")
+    parser.add_argument('suites', nargs='*', metavar='SUITE',
+                        help=f"suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument('--compare', metavar='BASELINE', help="previous results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative change counted as a regression (default 0.10)")
+    parser.add_argument('--repeat', type=int, default=3, help="timing rounds per benchmark (best is kept)")
+    parser.add_argument('--player-mb', type=float, default=2.0,
+                        help="size of the generated player-scan buffer in MB")
+    parser.add_argument('--session-hours', type=float, default=1.0, help="simulated hours per session")
+    parser.add_argument('--session-seeds', type=int, default=3, help="number of simulated sessions")
+    return parser.parse_args()
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=common.REPO_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+def compare(results, baseline, threshold):
+    """Print changes against a baseline; return the names that regressed."""
+    regressions = []
+    print(f"\nComparison against baseline (threshold {threshold:.0%}):")
+    for name, entry in sorted(results.items()):
+        old = baseline.get(name)
+        if old is None or not old.get('value'):
+            continue
+        change = (entry['value'] - old['value']) / old['value']
+        worse = change > threshold if entry['better'] == 'lower' else change < -threshold
+        flag = "REGRESSION" if worse else ""
+        print(f"  {name:<40} {old['value']:12.3f} -> {entry['value']:12.3f} {entry['unit']:<10} "
+              f"{change:+7.1%} {flag}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+def main():
+    args = parse_args()
+    suites = args.suites or list(SUITES)
+    unknown = [name for name in suites if name not in SUITES]
+    if unknown:
+        print(f"Unknown suite(s): {', '.join(unknown)}")
+        sys.exit(2)
+
+    # Load the baseline first in case --output overwrites the same file
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    for name in suites:
+        print(f"Running {name} benchmarks...")
+        start = time.perf_counter()
+        suite_results = SUITES[name].run(args)
+        for key, entry in sorted(suite_results.items()):
+            print(f"  {key:<40} {entry['value']:12.3f} {entry['unit']}")
+        results.update(suite_results)
+        print(f"  ({time.perf_counter() - start:.1f}s)")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'suites': suites,
+        },
+        'results': results,
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\nResults written to: {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
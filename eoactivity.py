@@ -0,0 +1,245 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import defaultdict
+
+# Where a farming session's time goes.
+# The bot wraps each action in activity.doing(category); the time between
+# switches is written to an append-only log, one line per run of the same
+# category on the same tile:
+#
+#   w 12.345 0.450 15 20      category code, start (s), duration (s), x, y
+#   K 13.100 15 21            a kill at (x, y)
+#
+# Each session starts with a "# {json}" header line. The outermost action
+# owns the time: the steps of a stuck-recovery random move count as 'stuck',
+# not 'walk'. Time outside any action (reads, targeting) is 'loop'.
+#
+#   python eoactivity.py report activity.log
+
+CATEGORIES = {
+    'walk': 'w',       # moving toward a mob (steps, planned walks)
+    'face': 'f',       # turning to face a mob
+    'attack': 'a',     # Ctrl held / continuous attack
+    'kill_wait': 'k',  # waiting for the kill bytes after a swing
+    'stuck': 's',      # random moves after getting stuck
+    'idle': 'i',       # sleeping with no mob tracked
+    'wait': 'm',       # sleeping while mobs are tracked (waiting for updates)
+    'loop': 'l',       # reads, tracking, targeting
+    'paused': 'p',     # address watchdog rescanning
+    'reattach': 'r',   # waiting for the client to come back
+}
+NAMES = {code: name for name, code in CATEGORIES.items()}
+KILL = 'K'
+
+REGION_SIZE = 10  # tiles per side of a map region in the report
+FLUSH_INTERVAL = 5.0
+
+class _NullActivity:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_ACTIVITY = _NullActivity()
+
+class NullActivityLog:
+    """Drop-in log with no-op hooks (logging off)."""
+    enabled = False
+
+    def doing(self, category):
+        return _NULL_ACTIVITY
+
+    def position(self, x, y):
+        pass
+
+    def kill(self):
+        pass
+
+    def close(self):
+        pass
+
+class _Activity:
+    """Context manager for one category, reused like the profiler's phases."""
+    __slots__ = ('_log', '_category')
+
+    def __init__(self, log, category):
+        self._log = log
+        self._category = category
+
+    def __enter__(self):
+        log = self._log
+        if log._depth == 0:
+            log._switch(self._category)
+        log._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        log = self._log
+        log._depth -= 1
+        if log._depth == 0:
+            log._switch('loop')
+        return False
+
+class ActivityLog:
+    """
+    Append-only activity log for one bot session.
+
+    clock is the time function the bot runs on (the simulator's virtual
+    clock in eosim sessions).
+    """
+    enabled = True
+
+    def __init__(self, path, meta=None, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._activities = {}
+        self._depth = 0
+        self._started = clock()
+        self._category = 'loop'
+        self._since = self._started
+        self._x = self._y = 0
+        self._last_flush = self._started
+        self._file = open(path, 'a')
+        header = {'started': time.time()}
+        header.update(meta or {})
+        self._file.write(f"# {json.dumps(header)}\n")
+
+    def doing(self, category):
+        """Context manager attributing the time inside it to category."""
+        activity = self._activities.get(category)
+        if activity is None:
+            if category not in CATEGORIES:
+                raise ValueError(f"Unknown activity '{category}'")
+            activity = self._activities[category] = _Activity(self, category)
+        return activity
+
+    def position(self, x, y):
+        """The player's tile; a new tile starts a new record."""
+        if (x, y) != (self._x, self._y):
+            self._switch(self._category)
+            self._x, self._y = x, y
+
+    def kill(self):
+        self._file.write(f"{KILL} {self.clock() - self._started:.3f} {self._x} {self._y}\n")
+
+    def _switch(self, category):
+        now = self.clock()
+        duration = now - self._since
+        if duration > 0:
+            self._file.write(f"{CATEGORIES[self._category]} {self._since - self._started:.3f} "
+                             f"{duration:.3f} {self._x} {self._y}\n")
+        self._category = category
+        self._since = now
+        if now - self._last_flush >= FLUSH_INTERVAL:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._switch(self._category)
+        self._file.close()
+
+def read_sessions(path):
+    """Parse a log into [(header, records, kills)] with records as (category, start, duration, x, y)."""
+    sessions = []
+    with open(path) as f:
+        for line in f:
+            if line.startswith('#'):
+                sessions.append((json.loads(line[1:]), [], []))
+                continue
+            parts = line.split()
+            if not parts or not sessions:
+                continue
+            try:
+                if parts[0] == KILL:
+                    sessions[-1][2].append((float(parts[1]), int(parts[2]), int(parts[3])))
+                else:
+                    sessions[-1][1].append((NAMES[parts[0]], float(parts[1]), float(parts[2]),
+                                            int(parts[3]), int(parts[4])))
+            except (KeyError, IndexError, ValueError):
+                # A line cut short by a crash
+                continue
+    return sessions
+
+def region_of(x, y):
+    return (x // REGION_SIZE * REGION_SIZE, y // REGION_SIZE * REGION_SIZE)
+
+def summarize(records, kills):
+    """Totals for a set of records: seconds, kills and per-category / per-region breakdowns."""
+    by_category = defaultdict(float)
+    by_region = defaultdict(lambda: defaultdict(float))
+    kills_by_region = defaultdict(int)
+    for category, _, duration, x, y in records:
+        by_category[category] += duration
+        by_region[region_of(x, y)][category] += duration
+    for _, x, y in kills:
+        kills_by_region[region_of(x, y)] += 1
+    return {
+        'seconds': sum(by_category.values()),
+        'kills': len(kills),
+        'by_category': dict(by_category),
+        'by_region': {region: dict(categories) for region, categories in by_region.items()},
+        'kills_by_region': dict(kills_by_region),
+    }
+
+def kill_rates(seconds, kills):
+    per_hour = kills / seconds * 3600 if seconds > 0 else 0.0
+    per_kill = seconds / kills if kills else float('inf')
+    return per_hour, per_kill
+
+def print_report(summary, top_regions=10):
+    seconds, kills = summary['seconds'], summary['kills']
+    per_hour, per_kill = kill_rates(seconds, kills)
+    print(f"{seconds / 60:.1f} min, {kills} kills: {per_hour:.1f} kills/h, {per_kill:.1f} s/kill")
+
+    print("\nTime by activity:")
+    for category, spent in sorted(summary['by_category'].items(), key=lambda item: -item[1]):
+        share = spent / seconds * 100 if seconds else 0.0
+        per = f"{spent / kills:6.2f} s/kill" if kills else ""
+        print(f"  {category:10s} {spent:9.1f}s {share:5.1f}%  {per}")
+
+    print(f"\nBy map region ({REGION_SIZE}x{REGION_SIZE} tiles):")
+    regions = sorted(summary['by_region'], key=lambda r: -sum(summary['by_region'][r].values()))
+    for region in regions[:top_regions]:
+        categories = summary['by_region'][region]
+        spent = sum(categories.values())
+        region_kills = summary['kills_by_region'].get(region, 0)
+        region_per_hour, _ = kill_rates(spent, region_kills)
+        top = ', '.join(f"{name} {value / spent * 100:.0f}%"
+                        for name, value in sorted(categories.items(), key=lambda item: -item[1])[:3])
+        print(f"  ({region[0]:3d},{region[1]:3d})  {spent:8.1f}s  {region_kills:4d} kills  "
+              f"{region_per_hour:6.1f} kills/h  {top}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Where a farming session's time went")
+    sub = parser.add_subparsers(dest='command', required=True)
+    report = sub.add_parser('report', help="kills/h, s/kill and time by activity and map region")
+    report.add_argument('log', nargs='+')
+    report.add_argument('--session', type=int, action='append',
+                        help="only this session (0 = first, -1 = last; repeatable), default all")
+    report.add_argument('--regions', type=int, default=10, help="map regions to list")
+    args = parser.parse_args()
+
+    records, kills = [], []
+    for path in args.log:
+        if not os.path.exists(path):
+            print(f"{path}: not found")
+            return 1
+        sessions = read_sessions(path)
+        chosen = [sessions[i] for i in args.session] if args.session else sessions
+        for _, session_records, session_kills in chosen:
+            records.extend(session_records)
+            kills.extend(session_kills)
+        print(f"{path}: {len(chosen)} of {len(sessions)} sessions")
+    print_report(summarize(records, kills), args.regions)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,66 +1,125 @@
 import time
-import pymem
-import psutil
-import ctypes
+# Before the other imports, so the time to the first tick includes them
+STARTUP_STARTED = time.perf_counter()
 import math
+import struct
 import os
 import pathlib
 import random
+import json
+import argparse
+import threading
+import eoprofile
+import eoinput
+import eoprocess
+import eomemory
+import eonpctable
+import eowatchdog
+import eoactivity
+import eostatus
+import eocandidates
+from eotracker import MobTracker, INACTIVITY_TIMEOUT
 
-def read_address_from_file(filename):
-    """Read hex address from file."""
+def read_candidates_from_file(filename):
+    """Read the ranked hex addresses from file, best first (see eocandidates.py)."""
     try:
         script_dir = pathlib.Path(__file__).parent.absolute()
         file_path = os.path.join(script_dir, filename)
-        
-        with open(file_path, 'r') as f:
-            content = f.read().strip()
-            if content.lower().startswith('0x'):
-                return int(content, 16)
-            else:
-                return int(f"0x{content}", 16)
+        return eocandidates.read_candidates(file_path)
     except Exception as e:
         print(f"Error reading from {filename}: {e}")
-        return None
+        return []
 
-# Read addresses
-MOB_BASE_ADDR = read_address_from_file('mobxy.txt')
-CHAR_X_ADDR = read_address_from_file('playerxy.txt')
+def read_address_from_file(filename):
+    """Read the best (first) hex address from file."""
+    candidates = read_candidates_from_file(filename)
+    return candidates[0] if candidates else None
 
-# Calculate offsets
-if MOB_BASE_ADDR is not None:
-    # Movement addresses
-    FACE_ADDR = MOB_BASE_ADDR
-    Y_ADDR = MOB_BASE_ADDR + 0x4
-    X_ADDR = MOB_BASE_ADDR + 0x8
-    
-    # Spawn addresses - CORRECTED using 0x0019B4EC as the face reference
-    SPAWN_FACE_ADDR = MOB_BASE_ADDR - 0x14  
-    SPAWN_Y_ADDR = MOB_BASE_ADDR - 0x10     
-    SPAWN_X_ADDR = MOB_BASE_ADDR - 0xC      
-    
-    # Mob ID addresses (for hit detection)
-    MOB_ID_ADDR1 = MOB_BASE_ADDR + 0x98
-    MOB_ID_ADDR2 = MOB_BASE_ADDR + 0xA0
-    
-    # Kill detection addresses
-    KILL_ADDR1 = MOB_BASE_ADDR + 0x9C
-    KILL_ADDR2 = MOB_BASE_ADDR + 0xA4
-else:
-    print("Error: Failed to read mob address")
-    FACE_ADDR = Y_ADDR = X_ADDR = None
-    SPAWN_FACE_ADDR = SPAWN_Y_ADDR = SPAWN_X_ADDR = None
-    MOB_ID_ADDR1 = MOB_ID_ADDR2 = None
-
-if CHAR_X_ADDR is not None:
-    CHAR_Y_ADDR = CHAR_X_ADDR + 0x4
-else:
-    print("Error: Failed to read player address")
-    CHAR_Y_ADDR = None
-
-# Direction mapping
-FACE_OFFSETS = {0: (0, 1), 1: (-1, 0), 2: (0, -1), 3: (1, 0)}  # down, left, up, right
-FACE_NAMES = {0: 'down', 1: 'left', 2: 'up', 3: 'right'}
+class Addresses:
+    """
+    Every address the bot reads, calculated from the two scanned base addresses.
+
+    candidates holds the ranked alternatives for each base address
+    ({'mob': [...], 'player': [...]}) to fail over to.
+    """
+
+    def __init__(self, mob_base_addr, char_x_addr, candidates=None):
+        self.mob_base_addr = mob_base_addr
+        self.char_x_addr = char_x_addr
+        self.candidates = candidates or {
+            'mob': [mob_base_addr] if mob_base_addr is not None else [],
+            'player': [char_x_addr] if char_x_addr is not None else [],
+        }
+
+        if mob_base_addr is not None:
+            # Movement addresses
+            self.face_addr = mob_base_addr
+            self.y_addr = mob_base_addr + 0x4
+            self.x_addr = mob_base_addr + 0x8
+
+            # Spawn addresses - CORRECTED using 0x0019B4EC as the face reference
+            self.spawn_face_addr = mob_base_addr - 0x14
+            self.spawn_y_addr = mob_base_addr - 0x10
+            self.spawn_x_addr = mob_base_addr - 0xC
+
+            # Mob ID addresses (for hit detection)
+            self.mob_id_addr1 = mob_base_addr + 0x98
+            self.mob_id_addr2 = mob_base_addr + 0xA0
+
+            # Kill detection addresses
+            self.kill_addr1 = mob_base_addr + 0x9C
+            self.kill_addr2 = mob_base_addr + 0xA4
+        else:
+            self.face_addr = self.y_addr = self.x_addr = None
+            self.spawn_face_addr = self.spawn_y_addr = self.spawn_x_addr = None
+            self.mob_id_addr1 = self.mob_id_addr2 = None
+            self.kill_addr1 = self.kill_addr2 = None
+
+        self.char_y_addr = char_x_addr + 0x4 if char_x_addr is not None else None
+
+    def is_complete(self):
+        return self.mob_base_addr is not None and self.char_x_addr is not None
+
+def address_file(base, pid=None):
+    """mobxy/playerxy file name for a client: the per-client file if it exists."""
+    per_client = f"{base}-{pid}.txt"
+    script_dir = pathlib.Path(__file__).parent.absolute()
+    if pid is not None and os.path.exists(os.path.join(script_dir, per_client)):
+        return per_client
+    return f"{base}.txt"
+
+def load_addresses(pid=None):
+    """
+    Read the scanned addresses.
+
+    With a pid, per-client files (mobxy-<pid>.txt, playerxy-<pid>.txt) are
+    preferred so several clients can run with different address sets.
+    """
+    mob, player = (read_candidates_from_file(address_file(base, pid)) for base in ('mobxy', 'playerxy'))
+    addrs = Addresses(mob[0] if mob else None, player[0] if player else None,
+                      candidates={'mob': mob, 'player': player})
+    if addrs.mob_base_addr is None:
+        print("Error: Failed to read mob address")
+    if addrs.char_x_addr is None:
+        print("Error: Failed to read player address")
+    return addrs
+
+def save_addresses(addrs, pid=None, which=('mob', 'player')):
+    """
+    Put the confirmed addresses first in the files load_addresses reads
+    (atomically) and record them as known-good there; the other candidates
+    stay listed after them, and the scanners rank new candidates by their
+    distance from the known-good ones.
+    """
+    script_dir = pathlib.Path(__file__).parent.absolute()
+    for base, name, address in (('mobxy', 'mob', addrs.mob_base_addr), ('playerxy', 'player', addrs.char_x_addr)):
+        if name not in which:
+            continue
+        path = os.path.join(script_dir, address_file(base, pid))
+        try:
+            eocandidates.promote(path, address, confirmed=True)
+        except Exception as e:
+            print(f"Error writing {os.path.basename(path)}: {e}")
 
 # Virtual key codes
 VK_CODE = {'up': 0x68, 'left': 0x64, 'down': 0x62, 'right': 0x66, 'ctrl': 0x11}
@@ -73,17 +132,122 @@ MAX_CTRL_DURATION = 0.3
 FACING_DURATION = 0.5
 DURATION_INCREMENT = 0.05
 
-# Movement tracking
-movement_durations = {key: INITIAL_MOVEMENT_DURATION for key in ['up', 'down', 'left', 'right']}
-ctrl_duration = INITIAL_CTRL_DURATION
-movement_success_rate = {key: {'attempts': 0, 'successes': 0} for key in ['up', 'down', 'left', 'right', 'ctrl']}
+# Continuous attack: keep Ctrl down while the target stays on the faced tile,
+# polling the kill bytes and the target's position, instead of one swing per
+# loop iteration
+CONTINUOUS_ATTACK = True
+ENGAGE_POLL_INTERVAL = 0.02
+MAX_ENGAGE_TIME = 15.0
+ATTACK_REPEAT_INTERVAL = 0.5  # tap cadence when the input can't hold keys (shared focus)
+ENGAGE_MISS_TIMEOUT = 1.2     # give up when the hit bytes stay clear this long (nothing on the tile)
+DIRECTION_OFFSETS = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+ADJACENT_DIRECTIONS = {offset: key for key, offset in DIRECTION_OFFSETS.items()}
+
+# Packs: mobs on the adjacent tiles are attacked one after another without
+# going back to the main loop, the one already faced or recently hit first
+CHAIN_ENGAGEMENTS = True
+MAX_CHAINED_ENGAGEMENTS = 8
+RECENT_HIT_WINDOW = 5.0  # a mob hit this recently is finished before fresh ones
+
+# Speculative walking: hold the key along a planned path and confirm tiles
+# as the position changes, instead of press-then-poll per tile
+SPECULATIVE_MOVES = True
+MAX_PATH_STEPS = 8
+WALK_POLL_INTERVAL = 0.01
+WALK_WATCH_INTERVAL = 0.02
+WALK_STALL_TIMEOUT = 1.0  # no new tile for this long: blocked, replan
+
+# Targeting and loop timing
+MOVEMENT_COOLDOWN = 0.02  # re-issue moves toward the current target at most this often
+STUCK_TIMEOUT = 1.0       # no position change for this long: make a random move
+TARGET_HYSTERESIS = 2     # keep the current target unless another mob is this many tiles closer
+
+# Constants eotune.py searches over in the simulator; its best values are
+# written to tuned.json, which main() applies at startup
+TUNED_PROFILE_FILE = 'tuned.json'
+TUNABLE = ('INITIAL_MOVEMENT_DURATION', 'MAX_CTRL_DURATION', 'FACING_DURATION', 'MOVEMENT_COOLDOWN',
+           'STUCK_TIMEOUT', 'INACTIVITY_TIMEOUT', 'TARGET_HYSTERESIS')
 
-def select_endless_pid():
+# Blocks read per tick: spawn record + last-moved record (spawn_face_addr,
+# 0x20 bytes: spawn face/y/x, 8 unused bytes, face/y/x), the player's x/y,
+# and the hit/kill indicators (mob_id_addr1 .. kill_addr2)
+MOB_BLOCK = struct.Struct('<8i')
+PLAYER_BLOCK = struct.Struct('<2i')
+INDICATOR_BLOCK_SIZE = 0xD
+
+# Recovery: consecutive failed reads before the client is treated as lost
+MAX_READ_FAILURES = 3
+ADDRESS_RECHECK_INTERVAL = 1.0
+
+# Stable pointer chains found by eopointerscan.py; tried before the address files
+POINTER_CHAINS_FILE = 'pointerchains.json'
+MAX_CHAIN_CANDIDATES = 8
+
+# Several plausible player candidates: press direction keys at startup and
+# keep the ones whose x/y follow the step
+PROBE_PLAYER_CANDIDATES = True
+PROBE_KEYS = ('left', 'right', 'up', 'down')
+PROBE_SETTLE = 0.3  # after a probe press, for the step to land
+
+# Keeps lines from different client threads from interleaving
+_print_lock = threading.Lock()
+
+class BotClient:
+    """
+    State for one game client: process handle, addresses, input and adaptive timing.
+
+    Several BotClients can run side by side (see run_supervisor); nothing
+    here is shared between them.
+    """
+
+    def __init__(self, pm, addrs, key_input, name=None, profiler=None,
+                 pid=None, watcher=None, input_mode=None, npc_table=None, watchdog_interval=None):
+        self.pm = pm
+        self.addrs = addrs
+        self.npc_table = npc_table  # NpcTableLayout, or None to track the update record
+        self.input = key_input
+        self.name = name
+        self.pid = pid
+        self.watcher = watcher
+        self.input_mode = input_mode
+        self.profiler = profiler or eoprofile.NullProfiler()
+        self.activity = eoactivity.NullActivityLog()
+        self.status = eostatus.NullStatus()
+        self.kills = 0
+        self.tracker = None
+        self.started = None  # perf_counter() at startup; the first tick logs the time since
+        self.continuous_attack = CONTINUOUS_ATTACK
+        self.chain_engagements = CHAIN_ENGAGEMENTS
+        self.facing = None  # direction of the last direction key pressed, None if unknown
+        self.speculative_moves = SPECULATIVE_MOVES
+
+        # Address watchdog (see eowatchdog.py): paused while it rescans,
+        # pending_addrs holds relocated addresses until the loop picks them up
+        self.watchdog_interval = watchdog_interval
+        self.paused = threading.Event()
+        self.pending_addrs = None
+
+        # Movement tracking
+        self.movement_durations = {key: INITIAL_MOVEMENT_DURATION for key in ['up', 'down', 'left', 'right']}
+        self.ctrl_duration = INITIAL_CTRL_DURATION
+        self.movement_success_rate = {key: {'attempts': 0, 'successes': 0} for key in ['up', 'down', 'left', 'right', 'ctrl']}
+
+    def log(self, message):
+        with _print_lock:
+            if self.name:
+                print(f"[{self.name}] {message}")
+            else:
+                print(message)
+
+    def relocate(self, mob_base_addr, char_x_addr):
+        """Hand new addresses to the running loop and remember them for the next start."""
+        addrs = Addresses(mob_base_addr, char_x_addr, candidates=self.addrs.candidates)
+        save_addresses(addrs, self.pid)
+        self.pending_addrs = addrs
+
+def select_endless_pid(finder=None):
     """Find endless.exe process."""
-    endless_pids = []
-    for proc in psutil.process_iter():
-        if proc.name().lower() == 'endless.exe':
-            endless_pids.append(proc.pid)
+    endless_pids = (finder or eoprocess.ProcessFinder()).find()
 
     if not endless_pids:
         print("No 'endless.exe' found.")
@@ -106,33 +270,37 @@ def select_endless_pid():
                 return endless_pids[index - 1]
         print("Invalid choice.")
 
-def press_key(key, duration=None, with_feedback=False, pm=None, char_x=None, char_y=None):
+def press_key(client, key, duration=None, with_feedback=False, char_x=None, char_y=None):
     """Press key with adaptive duration based on success rate."""
     vk_code = VK_CODE.get(key.lower())
     if not vk_code:
-        print(f"Error: Unknown key '{key}'")
+        client.log(f"Error: Unknown key '{key}'")
         return False, (None, None) if with_feedback else None
     
     # Use adaptive duration
     if duration is None:
         if key == 'ctrl':
-            duration = ctrl_duration
+            duration = client.ctrl_duration
         else:
-            duration = movement_durations.get(key, INITIAL_MOVEMENT_DURATION)
+            duration = client.movement_durations.get(key, INITIAL_MOVEMENT_DURATION)
     
     # Press key
-    ctypes.windll.user32.keybd_event(vk_code, 0, 0, 0)  # Down
-    time.sleep(duration)
-    ctypes.windll.user32.keybd_event(vk_code, 0, 2, 0)  # Up
+    with client.activity.doing('walk'), client.profiler.phase('key_hold'):
+        client.input.hold(vk_code, duration)
+    if key in DIRECTION_OFFSETS:
+        client.facing = key
     
-    if not with_feedback or pm is None:
+    if not with_feedback:
         return True
     
     # Check if movement succeeded
-    time.sleep(0.02)
-    new_char_x = pm.read_int(CHAR_X_ADDR)
-    new_char_y = pm.read_int(CHAR_Y_ADDR)
+    with client.activity.doing('walk'), client.profiler.phase('confirm_move'):
+        time.sleep(0.02)
+        new_char_x = client.pm.read_int(client.addrs.char_x_addr)
+        new_char_y = client.pm.read_int(client.addrs.char_y_addr)
     
+    movement_durations = client.movement_durations
+    movement_success_rate = client.movement_success_rate
     movement_success_rate[key]['attempts'] += 1
     
     # Check movement success
@@ -152,89 +320,225 @@ def press_key(key, duration=None, with_feedback=False, pm=None, char_x=None, cha
         success_rate = movement_success_rate[key]['successes'] / movement_success_rate[key]['attempts']
         if success_rate > 0.8 and movement_durations[key] > INITIAL_MOVEMENT_DURATION:
             movement_durations[key] = max(INITIAL_MOVEMENT_DURATION, movement_durations[key] - DURATION_INCREMENT)
-            print(f"Success rate: {success_rate:.2f} - Reducing {key} to {movement_durations[key]*1000:.0f}ms")
+            client.log(f"Success rate: {success_rate:.2f} - Reducing {key} to {movement_durations[key]*1000:.0f}ms")
     else:
         movement_durations[key] = min(MAX_MOVEMENT_DURATION, movement_durations[key] + DURATION_INCREMENT)
     
     return success, (new_char_x, new_char_y)
 
-def press_ctrl_for_interaction(pm):
-    """Press Ctrl with adaptive duration and check for hit/kill."""
-    global ctrl_duration
-    
-    # Read kill indicators before hitting
+def read_indicators(client):
+    """
+    The hit (mob id) and kill bytes in one read: (mob_id1, kill1, mob_id2, kill2).
+    They sit within 13 bytes of each other; None if they can't be read.
+    """
     try:
-        before_kill_val1 = pm.read_bytes(KILL_ADDR1, 1)[0]
-        before_kill_val2 = pm.read_bytes(KILL_ADDR2, 1)[0]
+        data = client.pm.read_bytes(client.addrs.mob_id_addr1, INDICATOR_BLOCK_SIZE)
     except Exception as e:
-        print(f"Error reading kill indicators: {e}")
-        before_kill_val1 = before_kill_val2 = 0
+        client.log(f"Error reading indicators: {e}")
+        return None
+    return data[0], data[4], data[8], data[12]
+
+def read_kill_bytes(client, indicators=None):
+    """The two kill indicator bytes ((0, 0) if they can't be read)."""
+    indicators = indicators or read_indicators(client)
+    if indicators is None:
+        return 0, 0
+    return indicators[1], indicators[3]
+
+def record_kill(client):
+    client.kills += 1
+    client.activity.kill()
+
+def kill_message(before, after):
+    """Why the kill bytes show a new kill, or None."""
+    (before_kill_val1, before_kill_val2), (after_kill_val1, after_kill_val2) = before, after
+    # Looking for new non-zero values to indicate a kill
+    if ((before_kill_val1 == 0 and after_kill_val1 != 0) or 
+        (before_kill_val2 == 0 and after_kill_val2 != 0)):
+        return f"New values appeared: {after_kill_val1}, {after_kill_val2}"
+    # Alternate detection for changing non-zero values
+    if ((before_kill_val1 != after_kill_val1 and after_kill_val1 != 0) or 
+        (before_kill_val2 != after_kill_val2 and after_kill_val2 != 0)):
+        return f"Values changed: {before_kill_val1}->{after_kill_val1}, {before_kill_val2}->{after_kill_val2}"
+    return None
+
+def hit_registered(client, indicators=None):
+    """True if the mob id bytes show we hit something."""
+    indicators = indicators or read_indicators(client)
+    if indicators is None:
+        return False
+    return indicators[0] != 0 or indicators[2] != 0
+
+def update_ctrl_duration(client, hit_detected):
+    """Adapt the Ctrl hold to how often swings land."""
+    movement_success_rate = client.movement_success_rate
+    if hit_detected:
+        movement_success_rate['ctrl']['successes'] += 1
+        
+        # Prevent division by zero
+        if movement_success_rate['ctrl']['attempts'] > 0:
+            success_rate = movement_success_rate['ctrl']['successes'] / movement_success_rate['ctrl']['attempts']
+            if success_rate > 0.8 and client.ctrl_duration > INITIAL_CTRL_DURATION:
+                client.ctrl_duration = max(INITIAL_CTRL_DURATION, client.ctrl_duration - DURATION_INCREMENT)
+                client.log(f"Ctrl success: {success_rate:.2f} - Reducing to {client.ctrl_duration*1000:.0f}ms")
+    else:
+        # Prevent division by zero here too
+        if movement_success_rate['ctrl']['attempts'] > 0:
+            client.ctrl_duration = min(MAX_CTRL_DURATION, client.ctrl_duration + DURATION_INCREMENT)
+            client.log(f"Ctrl failed - Increasing to {client.ctrl_duration*1000:.0f}ms")
+
+def press_ctrl_for_interaction(client):
+    """Press Ctrl with adaptive duration and check for hit/kill."""
+    # Read kill indicators before hitting
+    before = read_kill_bytes(client)
     
     # Press Ctrl
-    ctypes.windll.user32.keybd_event(0x11, 0, 0, 0)  # Ctrl down
-    time.sleep(ctrl_duration)
-    ctypes.windll.user32.keybd_event(0x11, 0, 2, 0)  # Ctrl up
+    with client.activity.doing('attack'), client.profiler.phase('ctrl_hold'):
+        client.input.hold(VK_CODE['ctrl'], client.ctrl_duration)
     
     # Give more time for kill registration
-    time.sleep(0.2)  # Increased to 200ms
+    with client.activity.doing('kill_wait'), client.profiler.phase('kill_wait'):
+        time.sleep(0.2)  # Increased to 200ms
     
     # Count this attempt BEFORE any potential division operation
-    movement_success_rate['ctrl']['attempts'] += 1
-    
-    hit_detected = False
-    kill_detected = False
+    client.movement_success_rate['ctrl']['attempts'] += 1
     
     # Check kill indicators - looking for new non-zero values
-    try:
-        after_kill_val1 = pm.read_bytes(KILL_ADDR1, 1)[0]
-        after_kill_val2 = pm.read_bytes(KILL_ADDR2, 1)[0]
-        
-        # Looking for new non-zero values to indicate a kill
-        if ((before_kill_val1 == 0 and after_kill_val1 != 0) or 
-            (before_kill_val2 == 0 and after_kill_val2 != 0)):
-            print(f"Kill detected! New values appeared: {after_kill_val1}, {after_kill_val2}")
-            kill_detected = True
-            hit_detected = True
-        # Alternate detection for changing non-zero values
-        elif ((before_kill_val1 != after_kill_val1 and after_kill_val1 != 0) or 
-              (before_kill_val2 != after_kill_val2 and after_kill_val2 != 0)):
-            print(f"Kill detected! Values changed: {before_kill_val1}->{after_kill_val1}, {before_kill_val2}->{after_kill_val2}")
-            kill_detected = True
-            hit_detected = True
-    except Exception as e:
-        print(f"Error checking kill: {e}")
+    message = kill_message(before, read_kill_bytes(client))
+    kill_detected = message is not None
+    if kill_detected:
+        client.log(f"Kill detected! {message}")
+        record_kill(client)
     
     # Skip the hit check if we already detected a kill
+    hit_detected = kill_detected or hit_registered(client)
     if not hit_detected:
-        try:
-            mob_id1 = pm.read_bytes(MOB_ID_ADDR1, 1)[0]
-            mob_id2 = pm.read_bytes(MOB_ID_ADDR2, 1)[0]
-            
-            if mob_id1 != 0 or mob_id2 != 0:
-                hit_detected = True
-            else:
-                print(f"No hit detected")
-        except Exception as e:
-            print(f"Error checking hit: {e}")
-    
-    # Update ctrl duration
-    if hit_detected:
-        movement_success_rate['ctrl']['successes'] += 1
-        
-        # Prevent division by zero
-        if movement_success_rate['ctrl']['attempts'] > 0:
-            success_rate = movement_success_rate['ctrl']['successes'] / movement_success_rate['ctrl']['attempts']
-            if success_rate > 0.8 and ctrl_duration > INITIAL_CTRL_DURATION:
-                ctrl_duration = max(INITIAL_CTRL_DURATION, ctrl_duration - DURATION_INCREMENT)
-                print(f"Ctrl success: {success_rate:.2f} - Reducing to {ctrl_duration*1000:.0f}ms")
-    else:
-        # Prevent division by zero here too
-        if movement_success_rate['ctrl']['attempts'] > 0:
-            ctrl_duration = min(MAX_CTRL_DURATION, ctrl_duration + DURATION_INCREMENT)
-            print(f"Ctrl failed - Increasing to {ctrl_duration*1000:.0f}ms")
+        client.log(f"No hit detected")
     
+    update_ctrl_duration(client, hit_detected)
     return kill_detected
 
+def engage(client, direction_key, char_x, char_y, watch):
+    """
+    Attack the mob on the faced tile until it dies or leaves the tile.
+
+    Ctrl stays down (the client repeats swings at the server's cadence) while
+    the kill bytes, hit bytes and the target's position are polled; watch()
+    returns the target's tracked entry, or None once it is gone. Returns why
+    it ended: "killed" (kill bytes changed), "gone" (left the tracker without
+    a kill, e.g. a ghost: drop it, but it is neither a kill nor a hit),
+    "moved away", "no hits" or "timeout".
+    """
+    dx, dy = DIRECTION_OFFSETS[direction_key]
+    target_tile = (char_x + dx, char_y + dy)
+    vk_ctrl = VK_CODE['ctrl']
+    # Holding Ctrl in foreground mode would keep the focus lock from other clients
+    tap = getattr(client.input, 'shared_focus', False)
+
+    before = read_kill_bytes(client)
+    client.movement_success_rate['ctrl']['attempts'] += 1
+    started = time.time()
+    next_tap = last_hit = started
+    reason = "timeout"
+    if not tap:
+        client.input.key_down(vk_ctrl)
+    try:
+        with client.activity.doing('attack'), client.profiler.phase('engage'):
+            while time.time() - started < MAX_ENGAGE_TIME and not client.paused.is_set():
+                if tap and time.time() >= next_tap:
+                    client.input.hold(vk_ctrl, client.ctrl_duration)
+                    next_tap += ATTACK_REPEAT_INTERVAL
+                time.sleep(ENGAGE_POLL_INTERVAL)
+
+                # Kill and hit bytes from the same read
+                indicators = read_indicators(client)
+                message = kill_message(before, read_kill_bytes(client, indicators))
+                if message is not None:
+                    client.log(f"Kill detected! {message}")
+                    record_kill(client)
+                    reason = "killed"
+                    break
+                mob = watch()
+                if mob is None:
+                    # Left the table / tracker without a kill byte: nothing left to attack
+                    reason = "gone"
+                    break
+                if (mob['x'], mob['y']) != target_tile:
+                    reason = "moved away"
+                    break
+                if hit_registered(client, indicators):
+                    last_hit = mob['last_hit_time'] = time.time()
+                elif time.time() - last_hit > ENGAGE_MISS_TIMEOUT:
+                    # Stale position: nothing there to hit
+                    reason = "no hits"
+                    break
+    finally:
+        if not tap:
+            client.input.key_up(vk_ctrl)
+
+    client.log(f"Engagement ended ({reason}) after {time.time() - started:.2f}s")
+    update_ctrl_duration(client, reason == "killed" or last_hit > started)
+    return reason
+
+def face(client, direction_key):
+    """Turn toward direction_key; free when the last direction pressed was the same."""
+    if client.facing == direction_key:
+        return
+    with client.activity.doing('face'), client.profiler.phase('facing_hold'):
+        client.input.hold(VK_CODE[direction_key], FACING_DURATION)
+    client.facing = direction_key
+
+def plan_engagements(tracked_mobs, char_x, char_y, facing, now, skip=()):
+    """
+    Order the mobs on the four adjacent tiles for attacking: recently hit
+    ones first (finish what was started), then the one already faced (no
+    turn), then the weakest. Returns [(mob_id, direction_key)].
+    """
+    plan = []
+    for mob_id, mob in tracked_mobs.items():
+        if mob_id in skip:
+            continue
+        offset = (mob['x'] - char_x, mob['y'] - char_y)
+        direction_key = ADJACENT_DIRECTIONS.get(offset)
+        if direction_key is None:
+            continue
+        recent = now - mob.get('last_hit_time', float('-inf')) <= RECENT_HIT_WINDOW
+        plan.append(((not recent, direction_key != facing, mob.get('hp', 0)), mob_id, direction_key))
+    plan.sort(key=lambda entry: entry[0])
+    return [(mob_id, direction_key) for _, mob_id, direction_key in plan]
+
+def clear_adjacent(client, char_x, char_y, tracked_mobs, watch_mob):
+    """
+    Attack the mobs on the adjacent tiles one after another (plan_engagements
+    order, re-planned after each one) until none is left to attack.
+    watch_mob(mob_id) is engage's watch for that mob; mobs that leave the
+    tracker without a kill are dropped from tracked_mobs too. Returns the ids
+    killed.
+    """
+    killed = []
+    skip = set()
+    for _ in range(MAX_CHAINED_ENGAGEMENTS):
+        if client.paused.is_set():
+            break
+        plan = plan_engagements(tracked_mobs, char_x, char_y, client.facing, time.time(), skip)
+        if not plan:
+            break
+        mob_id, direction_key = plan[0]
+        if killed:
+            client.log(f"Chaining to mob {mob_id} ({direction_key}), {len(plan) - 1} more adjacent")
+        face(client, direction_key)
+        outcome = engage(client, direction_key, char_x, char_y, lambda: watch_mob(mob_id))
+        if outcome == "killed":
+            killed.append(mob_id)
+            if tracked_mobs.pop(mob_id, None) is not None:
+                client.log(f"Removing killed mob {mob_id}")
+        elif outcome == "gone":
+            if tracked_mobs.pop(mob_id, None) is not None:
+                client.log(f"Removing mob {mob_id}, gone without a kill")
+        else:
+            skip.add(mob_id)
+    return killed
+
 def calculate_distance(x1, y1, x2, y2):
     """Calculate Manhattan distance."""
     return abs(x1 - x2) + abs(y1 - y2)
@@ -268,20 +572,114 @@ def get_closest_mob(tracked_mobs, char_x, char_y, current_target_id=None, target
     closest_mob_id = closest_mobs[0][0]
     closest_distance = closest_mobs[0][3]
     
-    # Keep current target if it's within 2 blocks
+    # Keep current target unless another mob is more than TARGET_HYSTERESIS tiles closer
     if current_target_id in tracked_mobs:
         current_dist = calculate_distance(
             char_x, char_y, 
             tracked_mobs[current_target_id]['x'], 
             tracked_mobs[current_target_id]['y']
         )
-        if current_dist <= closest_distance + 2:
+        if current_dist <= closest_distance + TARGET_HYSTERESIS:
             return current_target_id
     
     return closest_mob_id
 
-def move_toward_mob(pm, mob_coords, char_x, char_y, mob_id=None, tracked_mobs=None, targeting_locked=False):
-    """Move toward mob or interact if close."""
+def plan_path(char_x, char_y, mob_x, mob_y, blocked=(), max_steps=MAX_PATH_STEPS):
+    """
+    Directions for an L-shaped walk to the tile next to the mob.
+
+    The longer axis goes first, as in move_toward_mob; the other order is
+    used if the first one crosses a blocked tile. Empty if both are blocked.
+    """
+    x_key = 'right' if mob_x > char_x else 'left'
+    y_key = 'down' if mob_y > char_y else 'up'
+    x_steps, y_steps = [x_key] * abs(mob_x - char_x), [y_key] * abs(mob_y - char_y)
+    orders = [x_steps + y_steps, y_steps + x_steps]
+    if abs(mob_x - char_x) <= abs(mob_y - char_y):
+        orders.reverse()
+
+    for keys in orders:
+        # Stop on the tile before the mob
+        keys = keys[:-1][:max_steps]
+        x, y = char_x, char_y
+        for key in keys:
+            dx, dy = DIRECTION_OFFSETS[key]
+            x, y = x + dx, y + dy
+            if (x, y) in blocked:
+                break
+        else:
+            return keys
+    return []
+
+def walk_path(client, keys, char_x, char_y, watch=None):
+    """
+    Walk a planned path without waiting for each tile.
+
+    The key for the current leg stays down (the client walks at the server's
+    rate) and the position is polled against the expected tiles; at a turn
+    the next key goes down as soon as the turn tile is reached. Stops when
+    the path is done, the position leaves the path, no tile is reached for
+    WALK_STALL_TIMEOUT, or the target (watch(), every WALK_WATCH_INTERVAL)
+    moves or disappears.
+    Returns the number of tiles walked.
+    """
+    expected = []
+    x, y = char_x, char_y
+    for key in keys:
+        dx, dy = DIRECTION_OFFSETS[key]
+        x, y = x + dx, y + dy
+        expected.append((x, y))
+    target = watch() if watch is not None else None
+    target_tile = (target['x'], target['y']) if target is not None else None
+
+    pm, addrs = client.pm, client.addrs
+    done = 0
+    held = None
+    last_progress = next_watch = time.time()
+    try:
+        with client.activity.doing('walk'), client.profiler.phase('walk'):
+            while done < len(keys) and not client.paused.is_set():
+                if held != keys[done]:
+                    if held is not None:
+                        client.input.key_up(VK_CODE[held])
+                    held = keys[done]
+                    client.input.key_down(VK_CODE[held])
+                    client.facing = held
+                time.sleep(WALK_POLL_INTERVAL)
+
+                position = (pm.read_int(addrs.char_x_addr), pm.read_int(addrs.char_y_addr))
+                if position in expected[done:]:
+                    done = expected.index(position, done) + 1
+                    last_progress = time.time()
+                    client.activity.position(*position)
+                elif position != (expected[done - 1] if done else (char_x, char_y)):
+                    client.log(f"Walk diverged at {position}, replanning")
+                    break
+                elif time.time() - last_progress > WALK_STALL_TIMEOUT:
+                    break
+
+                if watch is not None and done < len(keys) and time.time() >= next_watch:
+                    next_watch = time.time() + WALK_WATCH_INTERVAL
+                    mob = watch()
+                    if mob is None or (mob['x'], mob['y']) != target_tile:
+                        break
+    finally:
+        if held is not None:
+            client.input.key_up(VK_CODE[held])
+    return done
+
+def move_toward_mob(client, mob_coords, char_x, char_y, mob_id=None, tracked_mobs=None, targeting_locked=False,
+                    watch=None, watch_mob=None):
+    """
+    Move toward mob or interact if close.
+
+    With watch (see engage) and client.continuous_attack, a mob on an
+    adjacent tile is attacked until it dies or moves away; with watch_mob
+    (watch for any mob id) and client.chain_engagements, every adjacent mob
+    is attacked in turn (clear_adjacent). With client.speculative_moves, the
+    way there is walked in one go (walk_path), unless the input shares the
+    focus with other clients.
+    """
     mob_x, mob_y = mob_coords['x'], mob_coords['y']
     
     # If close, interact
@@ -290,6 +688,11 @@ def move_toward_mob(pm, mob_coords, char_x, char_y, mob_id=None, tracked_mobs=No
     
     if x_diff <= 1 and y_diff <= 1:
         
+        if (client.continuous_attack and client.chain_engagements and watch_mob is not None
+                and tracked_mobs is not None and x_diff + y_diff == 1):
+            killed = clear_adjacent(client, char_x, char_y, tracked_mobs, watch_mob)
+            return True, mob_id not in killed and mob_id in tracked_mobs
+        
         # Face mob - use FACING_DURATION (500ms)
         direction_key = None
         if mob_x > char_x:
@@ -302,23 +705,34 @@ def move_toward_mob(pm, mob_coords, char_x, char_y, mob_id=None, tracked_mobs=No
             direction_key = 'up'
             
         if direction_key:
-            vk_code = VK_CODE.get(direction_key.lower())
-            if vk_code:
-                ctypes.windll.user32.keybd_event(vk_code, 0, 0, 0)
-                time.sleep(FACING_DURATION)
-                ctypes.windll.user32.keybd_event(vk_code, 0, 2, 0)
+            face(client, direction_key)
         
         time.sleep(0.02)
         
         # Attack and check for kill
-        mob_killed = press_ctrl_for_interaction(pm)
+        mob_gone = False
+        if client.continuous_attack and watch is not None and x_diff + y_diff == 1:
+            outcome = engage(client, direction_key, char_x, char_y, watch)
+            mob_killed, mob_gone = outcome == "killed", outcome == "gone"
+        else:
+            mob_killed = press_ctrl_for_interaction(client)
         
-        if mob_killed and mob_id is not None and tracked_mobs is not None and mob_id in tracked_mobs:
-            print(f"Removing killed mob {mob_id}")
+        if (mob_killed or mob_gone) and mob_id is not None and tracked_mobs is not None and mob_id in tracked_mobs:
+            client.log(f"Removing {'killed' if mob_killed else 'gone'} mob {mob_id}")
             del tracked_mobs[mob_id]
             return True, False
         
-        return True, not mob_killed
+        return True, not (mob_killed or mob_gone)
+    
+    # Walk the whole way while the target stays put. Not with a shared focus:
+    # walk_path keeps a key down for a whole leg, which holds the focus lock
+    # from the other clients; pressing per tile lets them in between steps.
+    if (client.speculative_moves and watch is not None
+            and not getattr(client.input, 'shared_focus', False)):
+        blocked = {(mob['x'], mob['y']) for other_id, mob in (tracked_mobs or {}).items() if other_id != mob_id}
+        keys = plan_path(char_x, char_y, mob_x, mob_y, blocked)
+        if keys and walk_path(client, keys, char_x, char_y, watch):
+            return True, targeting_locked
     
     # Determine movement direction
     primary_moves = []
@@ -341,7 +755,7 @@ def move_toward_mob(pm, mob_coords, char_x, char_y, mob_id=None, tracked_mobs=No
     
     # Try primary movement
     for move in primary_moves:
-        success, _ = press_key(move, with_feedback=True, pm=pm, char_x=char_x, char_y=char_y)
+        success, _ = press_key(client, move, with_feedback=True, char_x=char_x, char_y=char_y)
         
         if success:
             return True, targeting_locked
@@ -364,37 +778,329 @@ def move_toward_mob(pm, mob_coords, char_x, char_y, mob_id=None, tracked_mobs=No
             alternative_moves.append('left')
     
     for move in alternative_moves:
-        success, _ = press_key(move, with_feedback=True, pm=pm, char_x=char_x, char_y=char_y)
+        success, _ = press_key(client, move, with_feedback=True, char_x=char_x, char_y=char_y)
         
         if success:
             return True, targeting_locked
     
     return False, targeting_locked
 
-def make_random_move(pm, char_x, char_y):
+def make_random_move(client, char_x, char_y):
     """Make random move when stuck."""
     direction = random.choice(['up', 'down', 'left', 'right'])
-    success, _ = press_key(direction, with_feedback=True, pm=pm, char_x=char_x, char_y=char_y)
+    success, _ = press_key(client, direction, with_feedback=True, char_x=char_x, char_y=char_y)
     return success
 
-def main():
-    # Verify addresses
-    if None in (FACE_ADDR, Y_ADDR, X_ADDR, SPAWN_FACE_ADDR, SPAWN_Y_ADDR, SPAWN_X_ADDR, 
-                MOB_ID_ADDR1, MOB_ID_ADDR2, KILL_ADDR1, KILL_ADDR2, 
-                CHAR_X_ADDR, CHAR_Y_ADDR):
-        print("ERROR: Missing addresses.")
-        return
+def parse_args():
+    parser = argparse.ArgumentParser(description="Endless Online mob farming bot")
+    parser.add_argument('--all', action='store_true',
+                        help="run one bot per endless.exe client from this process")
+    parser.add_argument('--pid', type=int, action='append', default=[],
+                        help="attach to this client (repeat for several clients)")
+    parser.add_argument('--input', choices=eoinput.INPUT_MODES, default=None,
+                        help="how keys reach the client: keybd (focused window, default for one client), "
+                             "foreground (focus each client's window in turn, default for several) "
+                             "or window (post messages to the window, no focus needed)")
+    parser.add_argument('--no-npc-table', action='store_true',
+                        help="ignore npctable.json and track mobs from the last-moved-mob record")
+    parser.add_argument('--single-swing', action='store_true',
+                        help="one Ctrl press per loop iteration instead of attacking until the mob dies or moves")
+    parser.add_argument('--one-at-a-time', action='store_true',
+                        help="attack only the current target, not every adjacent mob in turn")
+    parser.add_argument('--step-by-step', action='store_true',
+                        help="confirm every step before the next one instead of walking planned paths")
+    parser.add_argument('--activity-log', nargs='?', const='activity.log', metavar='FILE',
+                        help="append where the session's time goes to FILE (default activity.log, "
+                             "activity-<pid>.log with several clients); see eoactivity.py report")
+    parser.add_argument('--watchdog', type=float, default=eowatchdog.CHECK_INTERVAL, metavar='SECONDS',
+                        help="re-check the address signatures this often and rescan when they break "
+                             f"(default {eowatchdog.CHECK_INTERVAL:g}, 0 disables)")
+    parser.add_argument('--status-port', type=int, nargs='?', const=eostatus.DEFAULT_PORT, metavar='PORT',
+                        help="serve live status on http://127.0.0.1:PORT/ "
+                             f"(default {eostatus.DEFAULT_PORT}); open it in a browser for the grid view")
+    parser.add_argument('--tuned', metavar='FILE',
+                        help=f"tuned constants to load (default {TUNED_PROFILE_FILE} next to the script, if present)")
+    parser.add_argument('--no-tuned', action='store_true', help="ignore the tuned profile, use the built-in constants")
+    parser.add_argument('--profile', action='store_true',
+                        help="time each phase of the control loop and print a breakdown at exit")
+    parser.add_argument('--profile-capture', choices=['cprofile', 'sample'],
+                        help="also capture a cProfile or sampling profile (implies --profile)")
+    parser.add_argument('--profile-window', type=float, default=30.0,
+                        help="seconds to run the cProfile/sampling capture for (default 30)")
+    parser.add_argument('--profile-stacks', metavar='FILE',
+                        help="write collapsed stacks from the sampling capture to FILE "
+                             "(FILE-<pid> per client with several clients)")
+    return parser.parse_args()
 
-    pid = select_endless_pid()
-    if pid is None:
-        return
+def per_client_path(path, pid, multi):
+    """path, or path with -<pid> before the extension when several clients share the option."""
+    if path is None or not multi:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{pid}{ext}"
+
+def addresses_look_valid(pm, addrs):
+    """Cheap sanity check that the addresses point at live game data."""
+    try:
+        char_x = pm.read_int(addrs.char_x_addr)
+        char_y = pm.read_int(addrs.char_y_addr)
+        face = pm.read_int(addrs.face_addr)
+        spawn_face = pm.read_int(addrs.spawn_face_addr)
+        pm.read_bytes(addrs.kill_addr1, 1)
+        pm.read_bytes(addrs.kill_addr2, 1)
+    except Exception:
+        return False
+    return position_looks_live(char_x, char_y) and 0 <= face <= 3 and 0 <= spawn_face <= 3
+
+def position_plausible(char_x, char_y):
+    """Coordinates a map can have."""
+    return 0 <= char_x <= 255 and 0 <= char_y <= 255
+
+def position_looks_live(char_x, char_y):
+    # Zeroed memory reads as (0, 0), so that is no proof of a live address
+    return position_plausible(char_x, char_y) and not (char_x == 0 and char_y == 0)
+
+def plausible_candidates(pm, target, addresses):
+    """
+    The candidate base addresses ('player' or 'mob') whose data passes
+    addresses_look_valid's checks, in order. All of them are read in one call.
+    """
+    if target == 'player':
+        blocks = eomemory.read_each(pm, [(address, PLAYER_BLOCK.size) for address in addresses])
+        return [address for address, block in zip(addresses, blocks)
+                if block is not None and position_looks_live(*PLAYER_BLOCK.unpack(block))]
+
+    spans = []
+    for address in addresses:
+        addrs = Addresses(address, None)
+        spans += [(addrs.spawn_face_addr, MOB_BLOCK.size), (addrs.mob_id_addr1, INDICATOR_BLOCK_SIZE)]
+    blocks = eomemory.read_each(pm, spans)
+    plausible = []
+    for i, address in enumerate(addresses):
+        mob_block, indicators = blocks[2 * i], blocks[2 * i + 1]
+        if mob_block is None or indicators is None:
+            continue
+        values = MOB_BLOCK.unpack(mob_block)
+        if 0 <= values[0] <= 3 and 0 <= values[5] <= 3:
+            plausible.append(address)
+    return plausible
+
+def probe_player_candidates(pm, key_input, candidates, log=print):
+    """
+    Order player candidates by live behaviour: press direction keys (each at
+    most once, until one moves the player; a blocked step moves nothing) and
+    put the candidates whose x/y moved one tile that way first. All
+    candidates are read together before and after each press. If no press
+    moved any of them, candidates itself is returned.
+    """
+    spans = [(address, PLAYER_BLOCK.size) for address in candidates]
+
+    def positions():
+        return [PLAYER_BLOCK.unpack(block) if block is not None else None
+                for block in eomemory.read_each(pm, spans)]
+
+    before = positions()
+    for key in PROBE_KEYS:
+        key_input.hold(VK_CODE[key], MAX_MOVEMENT_DURATION)
+        time.sleep(PROBE_SETTLE)
+        after = positions()
+        dx, dy = DIRECTION_OFFSETS[key]
+        live = [address for address, old, new in zip(candidates, before, after)
+                if old is not None and new is not None and (new[0] - old[0], new[1] - old[1]) == (dx, dy)]
+        if live:
+            log(f"Player candidates following the '{key}' step: {', '.join(f'0x{a:08X}' for a in live)}")
+            return live + [address for address in candidates if address not in live]
+        before = after
+    log("No probe step moved any player candidate, keeping the scanners' order")
+    return candidates
+
+def confirm_player_address(pm, key_input, addrs, pid=None, log=print):
+    """
+    With several plausible player candidates, use the one that follows key
+    presses (probe_player_candidates). When one did, it is moved to the top
+    of the address file and recorded as known-good.
+    """
+    candidates = addrs.candidates['player']
+    if not PROBE_PLAYER_CANDIDATES or len(candidates) < 2:
+        return addrs
+    ranked = probe_player_candidates(pm, key_input, candidates, log)
+    if ranked is candidates:
+        # Nothing followed the probe steps
+        return addrs
+    confirmed = Addresses(addrs.mob_base_addr, ranked[0], candidates={'mob': addrs.candidates['mob'], 'player': ranked})
+    if ranked[0] != addrs.char_x_addr:
+        log(f"Using player address 0x{ranked[0]:08X} instead of 0x{addrs.char_x_addr:08X}")
+    save_addresses(confirmed, pid, which=('player',))
+    return confirmed
+
+def load_pointer_chains():
+    """Read pointerchains.json ({'player': [...], 'mob': [...]}), or None if there isn't one."""
+    path = os.path.join(pathlib.Path(__file__).parent.absolute(), POINTER_CHAINS_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)['targets']
+    except Exception as e:
+        print(f"Error reading {POINTER_CHAINS_FILE}: {e}")
+        return None
+
+def load_tuned_profile(path=None):
+    """
+    Apply the constants from tuned.json (written by eotune.py). Returns the
+    applied {name: value}, empty if there is no profile.
+    """
+    if path is not None and not os.path.exists(path):
+        print(f"Tuned profile {path} not found, using the built-in constants")
+        return {}
+    path = path or os.path.join(pathlib.Path(__file__).parent.absolute(), TUNED_PROFILE_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+    except Exception as e:
+        print(f"Error reading {os.path.basename(path)}: {e}")
+        return {}
+
+    applied = {}
+    for name, value in profile.get('params', {}).items():
+        if name not in TUNABLE:
+            print(f"Ignoring unknown tuned constant {name}")
+            continue
+        # Keep integer constants integers
+        value = type(globals()[name])(value)
+        globals()[name] = value
+        applied[name] = value
+    if applied:
+        score = profile.get('kills_per_hour')
+        stdev = profile.get('stdev')
+        result = f" ({score:.1f} +- {stdev:.1f} kills/h in simulation)" if score is not None and stdev is not None else ""
+        print(f"Tuned profile {os.path.basename(path)}{result}: "
+              + ', '.join(f"{name}={value:g}" for name, value in applied.items()))
+    return applied
+
+def locate_addresses(pm, pid=None):
+    """
+    Find the addresses for an opened client.
+
+    Pointer chains survive client restarts, so they are tried first, then
+    the scanned candidates in the files' order; for each base address the
+    first one holding live data wins. The plausible ones are kept, ranked,
+    in addrs.candidates to fail over to. With none plausible, the files'
+    first picks are returned (callers check addresses_look_valid).
+    """
+    addrs = load_addresses(pid)
+    chains = load_pointer_chains()
+    bases = None
+    if chains:
+        try:
+            bases = eomemory.module_bases(pm)
+        except Exception:
+            pass
 
-    pm = pymem.Pymem(pid)
+    candidates = {}
+    for target, scanned in (('mob', addrs.candidates['mob']), ('player', addrs.candidates['player'])):
+        found = []
+        for chain in (chains.get(target, []) if bases is not None else []):
+            address = eomemory.resolve_module_chain(pm, chain, bases)
+            if address is not None and address not in found:
+                found.append(address)
+                if len(found) >= MAX_CHAIN_CANDIDATES:
+                    break
+        found += [address for address in scanned if address not in found]
+        candidates[target] = plausible_candidates(pm, target, found)
+
+    mob_addr = candidates['mob'][0] if candidates['mob'] else addrs.mob_base_addr
+    player_addr = candidates['player'][0] if candidates['player'] else addrs.char_x_addr
+    return Addresses(mob_addr, player_addr, candidates=candidates)
 
-    # Initialize tracking
-    tracked_mobs = {}
-    spawn_locations = {}
-    next_mob_id = 1
+def load_npc_table(pm, pid=None):
+    """The NPC table layout for this client, or None if there is none or it can't be read."""
+    layout = eonpctable.load_layout(pid)
+    if layout is None:
+        return None
+    if not eonpctable.table_readable(pm, layout):
+        print(f"NPC table at 0x{layout.base:08X} is not readable, rerun eonpcscan.py discover")
+        return None
+    return layout
+
+def create_tracker(client):
+    """Bulk-read the NPC table when its layout is known, else infer mobs from updates."""
+    if client.npc_table is not None:
+        return eonpctable.NpcTableTracker(client.npc_table, log=client.log)
+    return MobTracker(log=client.log, inactivity_timeout=INACTIVITY_TIMEOUT)
+
+def reattach_client(client, stop_event=None, deadline=None):
+    """
+    Reconnect a client whose process died or stopped answering reads.
+
+    Waits for the same process (or a restarted one), reopens it, re-reads the
+    address files and waits until the addresses hold live data. Returns False
+    if stopped or past the deadline first.
+    """
+    watcher = client.watcher
+    try:
+        client.pm.close_process()
+    except Exception:
+        pass
+    watcher.release(client.pid)
+
+    while stop_event is None or not stop_event.is_set():
+        client.log("Waiting for the client process...")
+        pid = watcher.wait_for_client(client.pid, stop_event, deadline)
+        if pid is None:
+            return False
+
+        try:
+            pm = eomemory.open_process(pid)
+        except Exception as e:
+            client.log(f"Could not open PID {pid}: {e}")
+            watcher.release(pid)
+            time.sleep(ADDRESS_RECHECK_INTERVAL)
+            continue
+
+        # Chains and address files are re-read on every check, so rescanning
+        # while the bot waits is picked up without a restart
+        warned = False
+        while watcher.is_alive(pid):
+            addrs = locate_addresses(pm, pid)
+            if addrs.is_complete() and addresses_look_valid(pm, addrs):
+                try:
+                    key_input = eoinput.create_input(client.input_mode, pid) if client.input_mode else client.input
+                except Exception as e:
+                    client.log(f"Input not ready: {e}")
+                else:
+                    addrs = confirm_player_address(pm, key_input, addrs, pid, log=client.log)
+                    client.pm, client.pid, client.addrs, client.input = pm, pid, addrs, key_input
+                    if client.npc_table is not None:
+                        client.npc_table = load_npc_table(pm, pid)
+                    client.log(f"Reattached to PID {pid}")
+                    return True
+            elif not warned:
+                client.log("Addresses don't hold valid data yet (still logging in, or rerun the scanners)")
+                warned = True
+
+            if (stop_event is not None and stop_event.is_set()) or (deadline is not None and time.time() >= deadline):
+                watcher.release(pid)
+                return False
+            time.sleep(ADDRESS_RECHECK_INTERVAL)
+
+        client.log(f"PID {pid} exited")
+        watcher.release(pid)
+    return False
+
+def run_bot(client, duration=None, stop_event=None):
+    """
+    Run the farming loop for one client.
+
+    duration limits the run to that many seconds (None runs until Ctrl+C or
+    until stop_event is set). Returns the client's tracker.
+    """
+    pm, addrs, profiler = client.pm, client.addrs, client.profiler
+    tracker = client.tracker = create_tracker(client)
+    tracked_mobs = tracker.mobs
+    use_table = client.npc_table is not None
 
     # Last memory values
     last_face_val = last_x_val = last_y_val = None
@@ -402,31 +1108,98 @@ def main():
     
     # Movement state
     last_movement_time = 0
-    movement_cooldown = 0.02
+    movement_cooldown = MOVEMENT_COOLDOWN
     current_target_mob_id = None
     targeting_locked = False
     last_successful_movement_time = time.time()
-    stuck_timeout = 1.0
+    stuck_timeout = STUCK_TIMEOUT
     just_made_random_move = False
     last_char_x = last_char_y = None
+    end_time = time.time() + duration if duration is not None else None
+    read_failures = 0
+    restart_tracking = False
+
+    watchdog = None
+    if client.watchdog_interval:
+        watchdog = eowatchdog.AddressWatchdog(client, client.watchdog_interval,
+                                              locate=lambda pm: locate_addresses(pm, client.pid),
+                                              stop_event=stop_event, plausible=plausible_candidates)
+        watchdog.start()
 
-    print(f"Starting with movement: {INITIAL_MOVEMENT_DURATION*1000:.0f}ms, Ctrl: {INITIAL_CTRL_DURATION*1000:.0f}ms")
-    print(f"Facing duration: {FACING_DURATION*1000:.0f}ms")
+    def watch_target(mob_id):
+        """Re-read mob positions mid-engagement; the target's entry, or None once it's gone."""
+        nonlocal last_face_val, last_x_val, last_y_val
+        if use_table:
+            tracker.update(pm, time.time())
+        else:
+            mob_block, = eomemory.read_many(pm, [(addrs.spawn_face_addr, MOB_BLOCK.size)])
+            _, _, _, _, _, face_val, y_val, x_val = MOB_BLOCK.unpack(mob_block)
+            if ((face_val, x_val, y_val) != (last_face_val, last_x_val, last_y_val)
+                    and not (x_val == 0 and y_val == 0)):
+                last_face_val, last_x_val, last_y_val = face_val, x_val, y_val
+                tracker.on_mob_move(face_val, x_val, y_val, time.time())
+        return tracked_mobs.get(mob_id)
+
+    client.log(f"Starting with movement: {INITIAL_MOVEMENT_DURATION*1000:.0f}ms, Ctrl: {INITIAL_CTRL_DURATION*1000:.0f}ms")
+    client.log(f"Facing duration: {FACING_DURATION*1000:.0f}ms")
 
     try:
-        while True:
+        while ((end_time is None or time.time() < end_time) and
+               (stop_event is None or not stop_event.is_set())):
+            profiler.tick()
+            if client.started is not None:
+                client.log(f"First tick {(time.perf_counter() - client.started) * 1000:.0f}ms after startup")
+                client.started = None
+
+            # Addresses relocated by the watchdog's rescan
+            if client.pending_addrs is not None:
+                client.addrs, client.pending_addrs = client.pending_addrs, None
+                restart_tracking = True
+
+            if restart_tracking:
+                # Start tracking from scratch against the new process / addresses
+                pm, addrs = client.pm, client.addrs
+                tracker = client.tracker = create_tracker(client)
+                tracked_mobs = tracker.mobs
+                use_table = client.npc_table is not None
+                last_face_val = last_x_val = last_y_val = None
+                last_spawn_face_val = last_spawn_y_val = last_spawn_x_val = None
+                current_target_mob_id = None
+                targeting_locked = False
+                last_char_x = last_char_y = None
+                last_successful_movement_time = time.time()
+                read_failures = 0
+                client.facing = None
+                restart_tracking = False
+
+            if client.paused.is_set():
+                with client.activity.doing('paused'), profiler.phase('paused'):
+                    time.sleep(0.1)
+                continue
+
             try:
                 # Read memory
-                face_val = pm.read_int(FACE_ADDR)
-                y_val = pm.read_int(Y_ADDR)
-                x_val = pm.read_int(X_ADDR)
+                with profiler.phase('read_memory'):
+                    # Mobs and player in one call (one syscall on the Linux backend)
+                    if use_table:
+                        layout = tracker.layout
+                        table, player = eomemory.read_many(pm, [(layout.base, layout.size),
+                                                                (addrs.char_x_addr, PLAYER_BLOCK.size)])
+                        table_changed, table_removed = tracker.update(pm, time.time(), data=table)
+                    else:
+                        mob_block, player = eomemory.read_many(pm, [(addrs.spawn_face_addr, MOB_BLOCK.size),
+                                                                    (addrs.char_x_addr, PLAYER_BLOCK.size)])
+                        (spawn_face_val, spawn_y_val, spawn_x_val, _, _,
+                         face_val, y_val, x_val) = MOB_BLOCK.unpack(mob_block)
+                    char_x, char_y = PLAYER_BLOCK.unpack(player)
                 
-                spawn_face_val = pm.read_int(SPAWN_FACE_ADDR)
-                spawn_y_val = pm.read_int(SPAWN_Y_ADDR)
-                spawn_x_val = pm.read_int(SPAWN_X_ADDR)
-                
-                char_x = pm.read_int(CHAR_X_ADDR)
-                char_y = pm.read_int(CHAR_Y_ADDR)
+                if not position_plausible(char_x, char_y):
+                    # The player address went bad: fail over now, not at the watchdog's next check
+                    if watchdog is not None:
+                        watchdog.alert()
+                    with profiler.phase('sleep'):
+                        time.sleep(0.1)
+                    continue
                 
                 # Check character movement
                 if last_char_x is not None and last_char_y is not None:
@@ -435,70 +1208,55 @@ def main():
                         just_made_random_move = False
                 
                 last_char_x, last_char_y = char_x, char_y
+                client.activity.position(char_x, char_y)
+                client.status.publish(client, char_x, char_y, tracked_mobs, current_target_mob_id)
                 current_time = time.time()
+                read_failures = 0
             except Exception as e:
-                print(f"Memory error: {e}")
-                time.sleep(0.5)
-                continue
-                
-            # Detect spawns
-            if (spawn_face_val != last_spawn_face_val or
-                spawn_y_val != last_spawn_y_val or
-                spawn_x_val != last_spawn_x_val):
-                
-                last_spawn_face_val = spawn_face_val
-                last_spawn_y_val = spawn_y_val
-                last_spawn_x_val = spawn_x_val
-                
-                # Skip zero values
-                if spawn_x_val == 0 or spawn_y_val == 0:
+                client.log(f"Memory error: {e}")
+                read_failures += 1
+                if client.watcher is not None and (read_failures >= MAX_READ_FAILURES or
+                                                   not client.watcher.is_alive(client.pid)):
+                    with client.activity.doing('reattach'), profiler.phase('reattach'):
+                        if not reattach_client(client, stop_event, end_time):
+                            break
+                    restart_tracking = True
                     continue
+                with profiler.phase('sleep'):
+                    time.sleep(0.5)
+                continue
                 
-                spawn_key = f"{spawn_x_val}_{spawn_y_val}"
-                facing = FACE_NAMES.get(spawn_face_val, '?')
-                print(f"New spawn at ({spawn_x_val}, {spawn_y_val}) facing {facing}")
-                
-                spawn_locations[spawn_key] = {
-                    'face': spawn_face_val,
-                    'x': spawn_x_val,
-                    'y': spawn_y_val,
-                    'time': current_time
-                }
-                
-                tracked_mobs[next_mob_id] = {
-                    'x': spawn_x_val,
-                    'y': spawn_y_val,
-                    'last_x': spawn_x_val,
-                    'last_y': spawn_y_val,
-                    'last_activity_time': current_time,
-                    'from_spawn': True
-                }
-                print(f"Added spawn as mob #{next_mob_id}")
-                next_mob_id += 1
-
-            # Update inactive mobs
-            for mob_id in list(tracked_mobs.keys()):
-                mob = tracked_mobs[mob_id]
-                
-                if mob['x'] == mob.get('last_x') and mob['y'] == mob.get('last_y'):
-                    if 'last_activity_time' not in mob:
-                        mob['last_activity_time'] = current_time
-                    elif current_time - mob['last_activity_time'] >= 7:
-                        print(f"Mob {mob_id} inactive for 4s, removing")
-                        del tracked_mobs[mob_id]
-                        if current_target_mob_id == mob_id:
-                            current_target_mob_id = None
-                            targeting_locked = False
-                        continue
-                else:
-                    mob['last_activity_time'] = current_time
-                
-                mob['last_x'], mob['last_y'] = mob['x'], mob['y']
+            if use_table:
+                # Mobs that left the table are gone for good
+                if current_target_mob_id in table_removed:
+                    current_target_mob_id = None
+                    targeting_locked = False
+            else:
+                # Detect spawns
+                with profiler.phase('spawn_detection'):
+                    if (spawn_face_val != last_spawn_face_val or
+                        spawn_y_val != last_spawn_y_val or
+                        spawn_x_val != last_spawn_x_val):
+
+                        last_spawn_face_val = spawn_face_val
+                        last_spawn_y_val = spawn_y_val
+                        last_spawn_x_val = spawn_x_val
+
+                        # Skip zero values
+                        if tracker.on_spawn(spawn_face_val, spawn_x_val, spawn_y_val, current_time) is None:
+                            continue
+
+                # Update inactive mobs
+                with profiler.phase('inactivity_sweep'):
+                    if current_target_mob_id in tracker.sweep_inactive(current_time):
+                        current_target_mob_id = None
+                        targeting_locked = False
 
             # Target and move toward mobs
             if tracked_mobs:
-                new_closest_mob_id = get_closest_mob(tracked_mobs, char_x, char_y, 
-                                                   current_target_mob_id, targeting_locked)
+                with profiler.phase('get_closest_mob'):
+                    new_closest_mob_id = get_closest_mob(tracked_mobs, char_x, char_y, 
+                                                       current_target_mob_id, targeting_locked)
                 
                 if (new_closest_mob_id != current_target_mob_id or 
                     (current_target_mob_id is not None and current_time - last_movement_time >= movement_cooldown)):
@@ -509,9 +1267,12 @@ def main():
                     if current_target_mob_id is not None:
                         status = "LOCKED" if targeting_locked else "moving toward"
                         
-                        move_success, still_targeting = move_toward_mob(
-                            pm, tracked_mobs[current_target_mob_id], 
-                            char_x, char_y, current_target_mob_id, tracked_mobs, targeting_locked)
+                        with profiler.phase('move_toward_mob'):
+                            target_id = current_target_mob_id
+                            move_success, still_targeting = move_toward_mob(
+                                client, tracked_mobs[current_target_mob_id], 
+                                char_x, char_y, current_target_mob_id, tracked_mobs, targeting_locked,
+                                watch=lambda: watch_target(target_id), watch_mob=watch_target)
                         
                         last_movement_time = current_time
                         targeting_locked = still_targeting
@@ -521,15 +1282,22 @@ def main():
                         
                         # Handle stuck state
                         if not move_success and current_time - last_successful_movement_time > stuck_timeout and not just_made_random_move:
-                            make_random_move(pm, char_x, char_y)
+                            with client.activity.doing('stuck'), profiler.phase('random_move'):
+                                make_random_move(client, char_x, char_y)
                             just_made_random_move = True
                             last_movement_time = current_time
 
+            if use_table:
+                with profiler.phase('sleep'), client.activity.doing('wait' if tracked_mobs else 'idle'):
+                    time.sleep(0.03 if table_changed else 0.04)
+                continue
+
             # Track mob movement
             if (face_val == last_face_val and
                 x_val == last_x_val and
                 y_val == last_y_val):
-                time.sleep(0.04)
+                with profiler.phase('sleep'), client.activity.doing('wait' if tracked_mobs else 'idle'):
+                    time.sleep(0.04)
                 continue
 
             last_face_val = face_val
@@ -540,50 +1308,144 @@ def main():
             if x_val == 0 and y_val == 0:
                 continue
 
-            # Calculate previous position
-            dx, dy = FACE_OFFSETS.get(face_val, (0, 0))
-            old_x = x_val - dx
-            old_y = y_val - dy
+            with profiler.phase('mob_tracking'):
+                tracker.on_mob_move(face_val, x_val, y_val, current_time)
 
-            # Check if from spawn
-            spawn_key = f"{x_val}_{y_val}"
-            is_from_spawn = spawn_key in spawn_locations
-            
-            found_mob_id = None
-            
-            # Check if existing mob
-            for mob_id, coords in tracked_mobs.items():
-                if coords['x'] == old_x and coords['y'] == old_y:
-                    found_mob_id = mob_id
-                    break
-            
-            if found_mob_id is not None:
-                # Update existing mob
-                tracked_mobs[found_mob_id]['x'] = x_val
-                tracked_mobs[found_mob_id]['y'] = y_val
-                tracked_mobs[found_mob_id]['last_activity_time'] = current_time
-                facing = FACE_NAMES.get(face_val, '?')
-                print(f"[Mob {found_mob_id}] => ({x_val}, {y_val}) facing {facing}")
-            else:
-                # New mob detected
-                tracked_mobs[next_mob_id] = {
-                    'x': x_val, 
-                    'y': y_val, 
-                    'last_x': x_val, 
-                    'last_y': y_val,
-                    'last_activity_time': current_time,
-                    'from_spawn': is_from_spawn
-                }
-                facing = FACE_NAMES.get(face_val, '?')
-                print(f"New mob #{next_mob_id} => ({x_val}, {y_val}) facing {facing}")
-                next_mob_id += 1
-
-            time.sleep(0.03)
+            # The target may have turned out to be a ghost
+            if current_target_mob_id is not None and current_target_mob_id not in tracked_mobs:
+                current_target_mob_id = None
+                targeting_locked = False
+
+            with profiler.phase('sleep'), client.activity.doing('wait' if tracked_mobs else 'idle'):
+                time.sleep(0.03)
             
     except KeyboardInterrupt:
-        print("\nExiting...")
+        client.log("\nExiting...")
     except Exception as e:
-        print(f"Error: {e}")
+        client.log(f"Error: {e}")
+    finally:
+        if watchdog is not None:
+            watchdog.stop()
+        client.activity.close()
+        client.status.close(client)
+        timer = getattr(client.input, 'timer', None)
+        if timer is not None and timer.stats.count:
+            client.log(f"Key holds: {timer.stats.summary()}")
+        with _print_lock:
+            profiler.report()
+
+    return tracker
+
+def attach_client(pid, input_mode, watcher, name=None, profiler=None, use_npc_table=True,
+                  watchdog_interval=None):
+    """Open the process and build a BotClient for it (None if its addresses are missing)."""
+    pm = eomemory.open_process(pid)
+    addrs = locate_addresses(pm, pid)
+    if not addrs.is_complete():
+        print(f"ERROR: Missing addresses for PID {pid}.")
+        pm.close_process()
+        return None
+
+    npc_table = load_npc_table(pm, pid) if use_npc_table else None
+    if npc_table is not None:
+        print(f"Tracking mobs through the NPC table: {npc_table}")
+
+    watcher.claim(pid)
+    key_input = eoinput.create_input(input_mode, pid)
+    addrs = confirm_player_address(pm, key_input, addrs, pid)
+    return BotClient(pm, addrs, key_input, name=name, profiler=profiler,
+                     pid=pid, watcher=watcher, input_mode=input_mode, npc_table=npc_table,
+                     watchdog_interval=watchdog_interval)
+
+def run_supervisor(clients, duration=None):
+    """
+    Run several clients from one process, one worker thread each.
+
+    Workers spend nearly all their time sleeping or in memory reads, so a
+    thread per client scales to dozens of clients. Ctrl+C stops them all.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    stop_event = threading.Event()
+    with ThreadPoolExecutor(max_workers=len(clients), thread_name_prefix='bot') as pool:
+        futures = [pool.submit(run_bot, client, duration, stop_event) for client in clients]
+        try:
+            while not all(future.done() for future in futures):
+                time.sleep(0.2)
+        except KeyboardInterrupt:
+            print("\nStopping all clients...")
+            stop_event.set()
+    return [future.result() for future in futures]
+
+def main():
+    args = parse_args()
+    if not eoinput.input_available():
+        print("The bot sends keys through the Windows API, which isn't available on this platform. "
+              "The scanners and eolinux.py's memory reads work here, the bot doesn't.")
+        return
+    if not args.no_tuned:
+        load_tuned_profile(args.tuned)
+    watcher = eoprocess.ProcessWatcher()
+
+    # Decide which clients to drive
+    if args.all:
+        pids = watcher.finder.find()
+        if not pids:
+            print("No 'endless.exe' found.")
+            return
+    elif args.pid:
+        pids = args.pid
+    else:
+        pid = select_endless_pid(watcher.finder)
+        if pid is None:
+            return
+        pids = [pid]
+
+    multi = len(pids) > 1
+    input_mode = args.input or ('foreground' if multi else 'keybd')
+    profiling = args.profile or args.profile_capture is not None
+
+    clients = []
+    for pid in pids:
+        profiler = eoprofile.create_profiler(profiling,
+                                             capture=args.profile_capture,
+                                             capture_window=args.profile_window,
+                                             sample_file=per_client_path(args.profile_stacks, pid, multi))
+        client = attach_client(pid, input_mode, watcher, name=f"PID {pid}" if multi else None,
+                               profiler=profiler, use_npc_table=not args.no_npc_table,
+                               watchdog_interval=args.watchdog or None)
+        if client is not None:
+            client.continuous_attack = not args.single_swing
+            client.chain_engagements = not args.one_at_a_time
+            client.speculative_moves = not args.step_by_step
+            if args.activity_log:
+                client.activity = eoactivity.ActivityLog(per_client_path(args.activity_log, pid, multi),
+                                                         meta={'pid': pid})
+            client.started = STARTUP_STARTED
+            clients.append(client)
+
+    if not clients:
+        return
+
+    server = None
+    if args.status_port is not None:
+        board = eostatus.StatusBoard()
+        for client in clients:
+            client.status = eostatus.StatusPublisher(board, client.name or f"PID {client.pid}")
+        try:
+            server = eostatus.serve(board, args.status_port)
+            print(f"Status page: http://127.0.0.1:{args.status_port}/")
+        except OSError as e:
+            print(f"Could not start the status server on port {args.status_port}: {e}")
+
+    try:
+        if len(clients) == 1:
+            run_bot(clients[0])
+        else:
+            print(f"Supervising {len(clients)} clients (input: {input_mode})")
+            run_supervisor(clients)
+    finally:
+        if server is not None:
+            server.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
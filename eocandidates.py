@@ -0,0 +1,167 @@
+import os
+
+# Ranked address candidates.
+# The scanners used to write one address (the mob scanner its first valid
+# one), so when that pick was wrong the only way out was a full rescan. Now
+# every qualifying address is written, best first, one per line:
+#
+#   0x0019B4EC score=0.88 consistency=1.00 variance=9 distance=0x0
+#
+# Readers only need the first column: a file holding one bare address (the
+# old format) is a one-candidate list. The score adds up
+#
+#   consistency  share of the passes (or sampled window changes) the address matched in
+#   variance     distinct values seen in the record's changing fields (mob only)
+#   moved        share of the player's test steps the X/Y followed (player only)
+#   distance     how far it is from a known-good address
+#
+# Known-good addresses are the ones the bot has confirmed live (probing or
+# the watchdog's checks), recorded at the end of the file, newest first:
+#
+#   # confirmed 0x0019B4EC
+#
+# These are comments to every reader and survive rescans, so a scanner's
+# own unconfirmed pick never becomes the reference.
+#
+# The bot tries the candidates in this order and fails over to the next one
+# when its pick stops holding live data (eowatchdog).
+
+CONSISTENCY_WEIGHT = 0.6
+VARIANCE_WEIGHT = 0.25
+MOVED_WEIGHT = 0.25
+PROXIMITY_WEIGHT = 0.15
+VARIANCE_SCALE = 12       # distinct values at which a record counts as fully varied
+NEAR_DISTANCE = 0x10000   # proximity is halved this far from a known-good address
+CONFIRMED_MARKER = '# confirmed'
+MAX_CONFIRMED = 4         # confirmed addresses kept per file
+
+def score(consistency, variance=None, distance=None, moved=None):
+    total = CONSISTENCY_WEIGHT * consistency
+    if variance is not None:
+        total += VARIANCE_WEIGHT * min(1.0, variance / VARIANCE_SCALE)
+    if moved is not None:
+        total += MOVED_WEIGHT * moved
+    if distance is not None:
+        total += PROXIMITY_WEIGHT * NEAR_DISTANCE / (NEAR_DISTANCE + distance)
+    return total
+
+class Candidate:
+    """One scanned address and the evidence for it."""
+
+    def __init__(self, address, consistency, variance=None, distance=None, moved=None):
+        self.address = address
+        self.consistency = consistency
+        self.variance = variance
+        self.distance = distance
+        self.moved = moved
+        self.score = score(consistency, variance, distance, moved)
+
+    def line(self):
+        parts = [f"0x{self.address:08X}", f"score={self.score:.2f}", f"consistency={self.consistency:.2f}"]
+        if self.variance is not None:
+            parts.append(f"variance={self.variance}")
+        if self.moved is not None:
+            parts.append(f"moved={self.moved:.2f}")
+        if self.distance is not None:
+            parts.append(f"distance=0x{self.distance:X}")
+        return ' '.join(parts)
+
+    def __repr__(self):
+        return self.line()
+
+def rank(addresses, consistency, variance=None, known=(), moved=None):
+    """
+    Candidates for addresses, best first (ties keep the given order).
+    consistency, variance and moved map address -> value.
+    """
+    candidates = []
+    for address in addresses:
+        distance = min((abs(address - good) for good in known), default=None)
+        candidates.append(Candidate(address, consistency.get(address, 0.0),
+                                    variance.get(address) if variance is not None else None, distance,
+                                    moved.get(address, 0.0) if moved is not None else None))
+    candidates.sort(key=lambda candidate: candidate.score, reverse=True)
+    return candidates
+
+def store_consistency(store, passes):
+    """address -> share of the passes it matched in (an eoscanstore.ScanStore)."""
+    addresses, scan_counts = store.scan_counts()
+    return dict(zip(addresses.tolist(), (scan_counts / max(passes, 1)).tolist()))
+
+def store_variance(store, offsets=(0, 4, 8)):
+    """address -> distinct values of the bytes at offsets, added up (as varied_addresses counts them)."""
+    total = None
+    for offset in offsets:
+        addresses, values = store.distinct_values(offset)
+        total = values if total is None else total + values
+    return dict(zip(addresses.tolist(), total.tolist()))
+
+def parse_line(line):
+    """The address on one line of a candidate file, or None for blank and comment lines."""
+    line = line.split('#', 1)[0].strip()
+    if not line:
+        return None
+    return int(line.split()[0], 16)
+
+def read_candidates(path):
+    """The addresses in a candidate file, best first. Raises OSError / ValueError."""
+    with open(path) as f:
+        return [address for address in map(parse_line, f) if address is not None]
+
+def _confirmed_line(address):
+    return f"{CONFIRMED_MARKER} 0x{address:08X}"
+
+def format_candidates(candidates, confirmed=()):
+    """File text for Candidates or plain addresses, in the given order, then the confirmed addresses."""
+    lines = [candidate.line() if isinstance(candidate, Candidate) else f"0x{candidate:08X}"
+             for candidate in candidates]
+    return '\n'.join(lines + [_confirmed_line(address) for address in confirmed]) + '\n'
+
+def write_candidates(path, candidates):
+    """Write a candidate file atomically, keeping the confirmed addresses it records."""
+    confirmed = known_good(path)
+    with open(path + '.tmp', 'w') as f:
+        f.write(format_candidates(candidates, confirmed))
+    os.replace(path + '.tmp', path)
+
+def _read_lines(path):
+    try:
+        with open(path) as f:
+            return [line.rstrip('\n') for line in f if line.strip()]
+    except OSError:
+        return []
+
+def _confirmed(lines):
+    addresses = []
+    for line in lines:
+        if line.startswith(CONFIRMED_MARKER):
+            try:
+                addresses.append(int(line[len(CONFIRMED_MARKER):].split()[0], 16))
+            except (IndexError, ValueError):
+                pass
+    return addresses
+
+def known_good(path):
+    """The addresses the bot has confirmed in this file, newest first ([] if none)."""
+    return _confirmed(_read_lines(path))
+
+def promote(path, address, confirmed=False):
+    """
+    Move address to the top of a candidate file (adding it if missing); the
+    other lines are kept as they are, in their order. With confirmed (the bot
+    has seen it hold live data) it is also recorded as known-good.
+    """
+    lines = _read_lines(path)
+    known = _confirmed(lines)
+    lines = [line for line in lines if not line.startswith(CONFIRMED_MARKER)]
+    try:
+        first = [line for line in lines if parse_line(line) == address][:1] or [f"0x{address:08X}"]
+        rest = [line for line in lines if parse_line(line) != address]
+    except ValueError:
+        # Unreadable leftovers: start over with just this address
+        first, rest = [f"0x{address:08X}"], []
+    if confirmed:
+        known = ([address] + [good for good in known if good != address])[:MAX_CONFIRMED]
+    with open(path + '.tmp', 'w') as f:
+        f.write('\n'.join(first + rest + [_confirmed_line(good) for good in known]) + '\n')
+    os.replace(path + '.tmp', path)
@@ -0,0 +1,214 @@
+import os
+import time
+import argparse
+import threading
+
+import eomemory
+import eocandidates
+from eoscanstore import ScanStore
+from eosignatures import PLAYER, MOB, ChangeSampler, PageCache, scan_regions, stable_addresses, varied_addresses
+
+# Both address scans in one go.
+# Replaces running memoryscan-PLAYERloc_XYabove4.py and memoryscan-MOBloc.py
+# one after the other: the client is selected and opened once, its regions
+# are enumerated once, and the two searches run at the same time. Searches
+# whose ranges overlap share a worker, so each chunk is read once per pass.
+# Both address files are written (atomically) when both searches are done,
+# every candidate ranked best first (eocandidates.py).
+# The mob window is small, so by default it is sampled at a high rate
+# (ChangeSampler) instead of scanned once per second; that search has its
+# own thread and finishes as soon as a mob has moved a few times.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PASS_DELAY = 1.0
+
+# Same criteria as the scanners
+PLAYER_PASSES = 2
+MOB_MIN_SCANS = 4
+MOB_MAX_SCANS = 100
+MOB_MIN_VALUES = 4
+MOB_SAMPLE_TIMEOUT = 30.0
+
+class Search:
+    """One signature search: its matches so far and when it is done."""
+
+    def __init__(self, name, signature, filename, min_passes, max_passes, select, start=None, end=None,
+                 sampled=False):
+        self.name = name
+        self.signature = signature
+        self.filename = filename
+        self.min_passes = min_passes
+        self.max_passes = max_passes
+        self.select = select
+        self.start, self.end = signature.window if start is None else (start, end)
+        self.store = ScanStore(signature.size)
+        self.sampler = ChangeSampler(signature, self.start, self.end, self.store) if sampled else None
+        self.passes = 0
+        self.addresses = []
+        self.done = False
+        self.elapsed = None
+
+    def update(self, started):
+        """Re-evaluate after a pass; marks the search done once it has an answer or gave up."""
+        self.passes += 1
+        if self.passes >= self.min_passes and len(self.store):
+            self.addresses = self.select(self.store, self.passes)
+        if (self.passes >= self.min_passes and self.addresses) or self.passes >= self.max_passes:
+            self.done = True
+            self.elapsed = time.time() - started
+
+    def ranked(self, known=()):
+        """The addresses found, as ranked candidates."""
+        if self.sampler is not None:
+            consistency = {address: self.sampler.confidence(address) for address in self.addresses}
+        else:
+            consistency = eocandidates.store_consistency(self.store, self.passes)
+        # Only the mob record has fields that are meant to change
+        variance = eocandidates.store_variance(self.store) if self.signature is MOB and len(self.store) else None
+        return eocandidates.rank(self.addresses, consistency, variance, known)
+
+def player_search():
+    return Search('player', PLAYER, 'playerxy', PLAYER_PASSES, PLAYER_PASSES, stable_addresses)
+
+def mob_search(sampled=True):
+    return Search('mob', MOB, 'mobxy', MOB_MIN_SCANS, MOB_MAX_SCANS,
+                  lambda store, passes: varied_addresses(store, MOB_MIN_VALUES, MOB_MIN_SCANS),
+                  sampled=sampled)
+
+def group_searches(searches):
+    """Split searches into groups whose address ranges overlap (transitively)."""
+    groups = []
+    for search in sorted(searches, key=lambda s: s.start):
+        if groups and search.start < max(s.end for s in groups[-1]):
+            groups[-1].append(search)
+        else:
+            groups.append([search])
+    return groups
+
+def run_sampled(pm, search, started, stop_event):
+    """High-rate sampling until a candidate qualifies; addresses most confident first."""
+    sampler = search.sampler
+    found = sampler.run(pm, lambda s: search.select(s.store, s.samples), MOB_SAMPLE_TIMEOUT,
+                        stop_event=stop_event)
+    search.addresses = sorted(found or [], key=sampler.confidence, reverse=True)
+    search.passes = sampler.samples
+    search.done = True
+    search.elapsed = time.time() - started
+    print(f"{search.name}: {sampler.reads} reads, {sampler.samples} changes")
+    for address in search.addresses:
+        print(f"  0x{address:08X}: matched in {sampler.matched[address]}/{sampler.samples} changes "
+              f"(confidence {sampler.confidence(address):.0%})")
+
+def run_group(pm, regions, searches, started, stop_event):
+    """Scan passes for one group until all its searches are done."""
+    scan_number = 0
+    cache = PageCache()
+    while not stop_event.is_set():
+        active = [search for search in searches if not search.done]
+        if not active:
+            return
+        if scan_number and stop_event.wait(PASS_DELAY):
+            return
+        scan_number += 1
+        scan_regions(pm, regions, [(s.signature, s.store, s.start, s.end) for s in active], scan_number,
+                     cache=cache)
+        for search in active:
+            search.update(started)
+            state = f"{len(search.addresses)} candidates" if search.passes >= search.min_passes else \
+                f"{len(search.store.unique_addresses())} addresses tracked"
+            print(f"{search.name} pass {search.passes}: {state}")
+
+def discover(pm, searches, stop_event=None):
+    """Run the searches concurrently against an opened client. Returns the real time taken."""
+    stop_event = stop_event or threading.Event()
+    started = time.time()
+    regions = eomemory.enumerate_regions(pm, min(s.start for s in searches), max(s.end for s in searches))
+    print(f"{len(regions)} regions, {sum(r.size for r in regions) / 1e6:.1f} MB")
+
+    threads = [threading.Thread(target=run_group, args=(pm, regions, group, started, stop_event),
+                                name='discover-' + '+'.join(s.name for s in group), daemon=True)
+               for group in group_searches([s for s in searches if s.sampler is None])]
+    threads += [threading.Thread(target=run_sampled, args=(pm, search, started, stop_event),
+                                 name='discover-' + search.name, daemon=True)
+                for search in searches if search.sampler is not None]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.2)
+    except KeyboardInterrupt:
+        stop_event.set()
+        raise
+    return time.time() - started
+
+def output_path(search, pid=None):
+    name = f"{search.filename}-{pid}.txt" if pid is not None else f"{search.filename}.txt"
+    return os.path.join(SCRIPT_DIR, name)
+
+def write_results(searches, pid=None):
+    """
+    Write every successful search's file: all temp files first, then one
+    rename each, so the bot never sees a half-written or mismatched pair.
+    """
+    pending = []
+    for search in searches:
+        if not search.addresses:
+            continue
+        path = output_path(search, pid)
+        known = eocandidates.known_good(path)
+        candidates = search.ranked(known)
+        for candidate in candidates:
+            print(f"  {search.name} {candidate.line()}")
+        with open(path + '.tmp', 'w') as f:
+            f.write(eocandidates.format_candidates(candidates, known))
+        pending.append(path)
+    for path in pending:
+        os.replace(path + '.tmp', path)
+        print(f"Address written to: {path}")
+    return pending
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the player and mob addresses in one run")
+    parser.add_argument('--pid', type=int, help="client to scan (asks when several are running)")
+    parser.add_argument('--per-client', action='store_true',
+                        help="write mobxy-<pid>.txt / playerxy-<pid>.txt instead of the shared files")
+    parser.add_argument('--only', choices=['player', 'mob'], help="run just one of the searches")
+    parser.add_argument('--mob-passes', action='store_true',
+                        help="scan the mob window once per second instead of sampling it at a high rate")
+    args = parser.parse_args()
+
+    pid = args.pid
+    if pid is None:
+        from eobot032025 import select_endless_pid
+        pid = select_endless_pid()
+        if pid is None:
+            return
+    pm = eomemory.open_process(pid)
+    print(f"Successfully attached to process ID {pid}")
+
+    searches = []
+    if args.only in (None, 'player'):
+        searches.append(player_search())
+    if args.only in (None, 'mob'):
+        searches.append(mob_search(sampled=not args.mob_passes))
+    try:
+        elapsed = discover(pm, searches)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+        return
+    finally:
+        pm.close_process()
+
+    for search in searches:
+        if search.addresses:
+            print(f"{search.name}: {', '.join(f'0x{a:08X}' for a in search.addresses)} "
+                  f"({search.passes} {'changes' if search.sampler else 'passes'}, {search.elapsed:.1f}s)")
+        else:
+            print(f"{search.name}: nothing found after {search.passes} {'changes' if search.sampler else 'passes'} "
+                  f"(the mob search needs mobs moving on screen)")
+    write_results(searches, pid if args.per_client else None)
+    print(f"Done in {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    main()
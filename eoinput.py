@@ -0,0 +1,167 @@
+import sys
+import ctypes
+import threading
+
+import eotiming
+
+# Keyboard input backends for the bot.
+# Every backend offers key_down/key_up/hold. hold() is the unit of
+# serialization: a down + wait + up sequence is never interleaved with another
+# sequence aimed at the same window. Each backend times its holds with its
+# own eotiming.PreciseTimer (timer.stats has the achieved-vs-requested error).
+# All of them go through user32, so they only exist on Windows; elsewhere
+# (a client under Wine) only the memory side runs (eolinux.py).
+
+KEYEVENTF_KEYUP = 0x0002
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+MAPVK_VK_TO_VSC = 0
+SW_RESTORE = 9
+
+# keybd_event goes to whichever window has focus, so all foreground-mode
+# clients share one lock
+_foreground_lock = threading.RLock()
+
+# One lock per window for message-based input
+_window_locks = {}
+_window_locks_guard = threading.Lock()
+
+def _window_lock(hwnd):
+    with _window_locks_guard:
+        lock = _window_locks.get(hwnd)
+        if lock is None:
+            lock = _window_locks[hwnd] = threading.RLock()
+        return lock
+
+def find_process_window(pid):
+    """Return the handle of the first visible top-level window owned by pid (or None)."""
+    user32 = ctypes.windll.user32
+    found = []
+
+    @ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
+    def callback(hwnd, _lparam):
+        owner = ctypes.c_ulong()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+        if owner.value == pid and user32.IsWindowVisible(hwnd):
+            found.append(hwnd)
+            return False
+        return True
+
+    user32.EnumWindows(callback, 0)
+    return found[0] if found else None
+
+class KeybdEventInput:
+    """keybd_event to the focused window. Right for a single client in front."""
+
+    def __init__(self):
+        self.timer = eotiming.PreciseTimer()
+
+    def key_down(self, vk_code):
+        ctypes.windll.user32.keybd_event(vk_code, 0, 0, 0)
+
+    def key_up(self, vk_code):
+        ctypes.windll.user32.keybd_event(vk_code, 0, KEYEVENTF_KEYUP, 0)
+
+    def hold(self, vk_code, duration):
+        with _foreground_lock:
+            self.key_down(vk_code)
+            self.timer.wait(duration)
+            self.key_up(vk_code)
+
+class ForegroundWindowInput(KeybdEventInput):
+    """
+    Bring the client's window to the front, then use keybd_event.
+
+    Works with any client, but only one window can have focus, so presses
+    from all clients in this mode are serialized through one lock.
+    """
+
+    # Every client in this mode shares the focus, so keys can't stay down for long
+    shared_focus = True
+
+    def __init__(self, hwnd):
+        super().__init__()
+        self.hwnd = hwnd
+
+    def _activate(self):
+        user32 = ctypes.windll.user32
+        if user32.GetForegroundWindow() != self.hwnd:
+            if user32.IsIconic(self.hwnd):
+                user32.ShowWindow(self.hwnd, SW_RESTORE)
+            user32.SetForegroundWindow(self.hwnd)
+
+    def key_down(self, vk_code):
+        _foreground_lock.acquire()
+        self._activate()
+        super().key_down(vk_code)
+
+    def key_up(self, vk_code):
+        try:
+            super().key_up(vk_code)
+        finally:
+            _foreground_lock.release()
+
+    def hold(self, vk_code, duration):
+        with _foreground_lock:
+            self._activate()
+            super().key_down(vk_code)
+            self.timer.wait(duration)
+            super().key_up(vk_code)
+
+class WindowMessageInput:
+    """
+    Post WM_KEYDOWN/WM_KEYUP directly to the client's window.
+
+    No focus needed, so clients don't wait on each other; presses to the
+    same window are still serialized.
+    """
+
+    def __init__(self, hwnd):
+        self.hwnd = hwnd
+        self._lock = _window_lock(hwnd)
+        self.timer = eotiming.PreciseTimer()
+
+    def _lparam(self, vk_code, key_up):
+        scan_code = ctypes.windll.user32.MapVirtualKeyW(vk_code, MAPVK_VK_TO_VSC)
+        lparam = 1 | (scan_code << 16)
+        if key_up:
+            lparam |= (1 << 30) | (1 << 31)
+        return lparam
+
+    def key_down(self, vk_code):
+        self._lock.acquire()
+        ctypes.windll.user32.PostMessageW(self.hwnd, WM_KEYDOWN, vk_code, self._lparam(vk_code, False))
+
+    def key_up(self, vk_code):
+        try:
+            ctypes.windll.user32.PostMessageW(self.hwnd, WM_KEYUP, vk_code, self._lparam(vk_code, True))
+        finally:
+            self._lock.release()
+
+    def hold(self, vk_code, duration):
+        with self._lock:
+            self.key_down(vk_code)
+            self.timer.wait(duration)
+            self.key_up(vk_code)
+
+INPUT_MODES = ('keybd', 'foreground', 'window')
+
+def input_available():
+    """True where the backends can send keys (Windows)."""
+    return sys.platform == 'win32'
+
+def create_input(mode, pid=None):
+    """Build the input backend for one client ('keybd', 'foreground' or 'window')."""
+    if not input_available():
+        raise RuntimeError(f"Keyboard input needs Windows (user32), not available on {sys.platform}")
+    if mode == 'keybd':
+        return KeybdEventInput()
+
+    hwnd = find_process_window(pid)
+    if hwnd is None:
+        raise RuntimeError(f"No window found for PID {pid}")
+    if mode == 'foreground':
+        return ForegroundWindowInput(hwnd)
+    if mode == 'window':
+        return WindowMessageInput(hwnd)
+    raise ValueError(f"Unknown input mode '{mode}'")
@@ -0,0 +1,137 @@
+import os
+import ctypes
+import struct
+
+from eomemory import Region, Module
+
+# Reading another process's memory on Linux, e.g. the client running under
+# Wine, where pymem isn't available. Regions and modules come from
+# /proc/<pid>/maps; reads use process_vm_readv, which takes arrays of
+# (address, length) pairs, so several blocks cost a single syscall
+# (read_many). Same interface as the pymem.Pymem methods the bot uses.
+#
+# Needs permission to ptrace the target: same user and
+# /proc/sys/kernel/yama/ptrace_scope 0, or CAP_SYS_PTRACE.
+
+# Windows protection constants for the maps permissions, so eomemory's
+# readable/writable filters work unchanged
+PROTECT = {
+    'r--': 0x02,  # PAGE_READONLY
+    'rw-': 0x04,  # PAGE_READWRITE
+    'r-x': 0x20,  # PAGE_EXECUTE_READ
+    'rwx': 0x40,  # PAGE_EXECUTE_READWRITE
+}
+
+# Kernel limit on iovecs per call
+IOV_MAX = 1024
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+_readv = None
+
+def _process_vm_readv():
+    global _readv
+    if _readv is None:
+        libc = ctypes.CDLL(None, use_errno=True)
+        readv = libc.process_vm_readv
+        readv.argtypes = [ctypes.c_int, ctypes.POINTER(_IOVec), ctypes.c_ulong,
+                          ctypes.POINTER(_IOVec), ctypes.c_ulong, ctypes.c_ulong]
+        readv.restype = ctypes.c_ssize_t
+        _readv = readv
+    return _readv
+
+def parse_maps(text):
+    """(start, end, perms, path) for each line of a /proc/<pid>/maps file."""
+    mappings = []
+    for line in text.splitlines():
+        parts = line.split(None, 5)
+        if len(parts) < 5:
+            continue
+        start, end = (int(value, 16) for value in parts[0].split('-'))
+        path = parts[5].strip() if len(parts) > 5 else ''
+        mappings.append((start, end, parts[1], path))
+    return mappings
+
+class LinuxProcess:
+    """A process opened for reading through process_vm_readv."""
+
+    def __init__(self, pid):
+        if not os.path.isdir(f"/proc/{pid}"):
+            raise ProcessLookupError(f"No process with PID {pid}")
+        self.process_id = pid
+        self._readv = _process_vm_readv()
+
+    def _maps(self):
+        with open(f"/proc/{self.process_id}/maps") as f:
+            return parse_maps(f.read())
+
+    def regions(self):
+        """Readable mappings as eomemory.Region (kernel pseudo-mappings left out)."""
+        regions = []
+        for start, end, perms, path in self._maps():
+            protect = PROTECT.get(perms[:3])
+            if protect is None or path in ('[vvar]', '[vsyscall]', '[vdso]'):
+                continue
+            regions.append(Region(start, end - start, protect))
+        return regions
+
+    def modules(self):
+        """File-backed mappings grouped per file: Wine maps each PE image (endless.exe, DLLs) this way."""
+        extents = {}
+        for start, end, _, path in self._maps():
+            if not path.startswith('/'):
+                continue
+            low, high = extents.get(path, (start, end))
+            extents[path] = (min(low, start), max(high, end))
+        return [Module(os.path.basename(path), low, high - low) for path, (low, high) in extents.items()]
+
+    def read_many(self, spans):
+        """
+        Read several (address, size) blocks; one syscall per IOV_MAX blocks.
+
+        Returns the bytes of each block. Raises MemoryError naming the first
+        block that couldn't be read.
+        """
+        results = []
+        for first in range(0, len(spans), IOV_MAX):
+            batch = spans[first:first + IOV_MAX]
+            count = len(batch)
+            total = sum(size for _, size in batch)
+            buffer = ctypes.create_string_buffer(total)
+            local = (_IOVec * count)()
+            remote = (_IOVec * count)()
+            base = ctypes.addressof(buffer)
+            offset = 0
+            for i, (address, size) in enumerate(batch):
+                local[i].iov_base, local[i].iov_len = base + offset, size
+                remote[i].iov_base, remote[i].iov_len = address, size
+                offset += size
+
+            got = self._readv(self.process_id, local, count, remote, count, 0)
+            if got != total:
+                error = os.strerror(ctypes.get_errno()) if got < 0 else "partial read"
+                # The kernel stops at the first block it can't read
+                done = max(got, 0)
+                for address, size in batch:
+                    if done < size:
+                        raise MemoryError(f"Could not read memory at: {address}, length: {size} ({error})")
+                    done -= size
+                raise MemoryError(f"Could not read memory ({error})")
+
+            raw = buffer.raw
+            offset = 0
+            for _, size in batch:
+                results.append(raw[offset:offset + size])
+                offset += size
+        return results
+
+    def read_bytes(self, address, size):
+        return self.read_many([(address, size)])[0]
+
+    def read_int(self, address):
+        return struct.unpack('<i', self.read_bytes(address, 4))[0]
+
+    def close_process(self):
+        # No handle to release; kept for pymem compatibility
+        pass
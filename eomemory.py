@@ -0,0 +1,142 @@
+import sys
+import struct
+from collections import namedtuple
+
+# Helpers for walking a process's address space.
+# Functions take a pymem.Pymem-like object; objects that provide their own
+# regions()/modules() methods (e.g. offline dumps) are used through those.
+
+MEM_COMMIT = 0x1000
+PAGE_NOACCESS = 0x01
+PAGE_GUARD = 0x100
+READABLE_PROTECT = 0x02 | 0x04 | 0x08 | 0x20 | 0x40 | 0x80
+WRITABLE_PROTECT = 0x04 | 0x08 | 0x40 | 0x80
+
+# The client is a 32-bit process
+MIN_ADDRESS = 0x00010000
+MAX_ADDRESS = 0xFFFF0000
+POINTER_SIZE = 4
+
+Region = namedtuple('Region', 'start size protect')
+Module = namedtuple('Module', 'name base size')
+
+def open_process(pid):
+    """
+    Open a client for reading: pymem.Pymem on Windows, elsewhere (a client
+    under Wine) eolinux.LinuxProcess, which reads through process_vm_readv.
+    """
+    if sys.platform == 'win32':
+        import pymem
+        return pymem.Pymem(pid)
+    from eolinux import LinuxProcess
+    return LinuxProcess(pid)
+
+def read_many(pm, spans):
+    """
+    Read several (address, size) blocks: in one call where the backend
+    supports it (LinuxProcess.read_many), else one read_bytes each.
+    """
+    if hasattr(pm, 'read_many'):
+        return pm.read_many(spans)
+    return [pm.read_bytes(address, size) for address, size in spans]
+
+def read_each(pm, spans):
+    """Like read_many, but None for the blocks that can't be read instead of failing them all."""
+    try:
+        return read_many(pm, spans)
+    except Exception:
+        results = []
+        for address, size in spans:
+            try:
+                results.append(pm.read_bytes(address, size))
+            except Exception:
+                results.append(None)
+        return results
+
+def enumerate_regions(pm, start=MIN_ADDRESS, end=MAX_ADDRESS, writable_only=False):
+    """Return committed, readable regions between start and end, clipped to that range."""
+    if hasattr(pm, 'regions'):
+        regions = pm.regions()
+    else:
+        import pymem.memory
+        regions = []
+        address = start
+        while address < end:
+            try:
+                mbi = pymem.memory.virtual_query(pm.process_handle, address)
+            except Exception:
+                break
+            base = mbi.BaseAddress or 0
+            size = mbi.RegionSize
+            if size == 0:
+                break
+            if (mbi.State == MEM_COMMIT and mbi.Protect & READABLE_PROTECT
+                    and not mbi.Protect & PAGE_GUARD):
+                regions.append(Region(base, size, mbi.Protect))
+            address = base + size
+
+    clipped = []
+    for region in regions:
+        if writable_only and not region.protect & WRITABLE_PROTECT:
+            continue
+        lo = max(region.start, start)
+        hi = min(region.start + region.size, end)
+        if hi > lo:
+            clipped.append(Region(lo, hi - lo, region.protect))
+    return clipped
+
+def enumerate_modules(pm):
+    """Return the loaded modules (name, base, size) of the process."""
+    if hasattr(pm, 'modules'):
+        return list(pm.modules())
+    import pymem.process
+    modules = []
+    for info in pymem.process.enum_process_module(pm.process_handle):
+        modules.append(Module(info.name, info.lpBaseOfDll, info.SizeOfImage))
+    return modules
+
+def read_chunks(pm, start, size, chunk_size=1024 * 1024):
+    """Yield (address, bytes) for [start, start+size), skipping chunks that can't be read."""
+    address = start
+    end = start + size
+    while address < end:
+        length = min(chunk_size, end - address)
+        try:
+            yield address, pm.read_bytes(address, length)
+        except Exception:
+            pass
+        address += length
+
+def read_pointer(pm, address):
+    """Read a 32-bit pointer."""
+    return struct.unpack('<I', pm.read_bytes(address, POINTER_SIZE))[0]
+
+def resolve_pointer_chain(pm, base_address, offsets):
+    """
+    Follow a pointer chain: [[base] + o1] + o2 ... + on.
+
+    base_address holds the first pointer; every offset except the last is
+    added before dereferencing, the last one gives the final address.
+    """
+    address = read_pointer(pm, base_address)
+    for offset in offsets[:-1]:
+        address = read_pointer(pm, address + offset)
+    return address + offsets[-1]
+
+def module_bases(pm):
+    """Map lower-case module name -> base address."""
+    return {m.name.lower(): m.base for m in enumerate_modules(pm)}
+
+def resolve_module_chain(pm, chain, bases):
+    """
+    Resolve a module-relative chain ({'module', 'module_offset', 'offsets'}).
+
+    Returns None if the module isn't loaded or a pointer can't be read.
+    """
+    base = bases.get(chain['module'].lower())
+    if base is None:
+        return None
+    try:
+        return resolve_pointer_chain(pm, base + chain['module_offset'], chain['offsets'])
+    except Exception:
+        return None
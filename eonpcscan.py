@@ -0,0 +1,353 @@
+import time
+import argparse
+from collections import Counter, defaultdict
+
+import numpy as np
+
+import eomemory
+import eonpctable
+
+# NPC table discovery.
+#   1. watch the "last moved mob" record for a while to learn where mobs are
+#   2. search writable memory for (x, y) pairs matching several of those mobs
+#   3. the table is where the matches line up at a common stride
+#   4. sample the table over time to find the id, face and hp fields
+#      (hp is only found if you hit a mob while sampling)
+# The result is saved to npctable.json and used by the bot automatically.
+
+COORD_LIMIT = 255            # largest valid map coordinate
+Y_DELTAS = (4, -4, 8, -8)    # y field position relative to x
+MIN_STRIDE = 8
+MAX_STRIDE = 0x400
+MAX_COUNT = 256              # largest table considered
+TRAILING_SLACK = 16          # empty slots kept after the last occupied one
+FACE_BY_STEP = {(0, 1): 0, (-1, 0): 1, (0, -1): 2, (1, 0): 3}
+
+def find_coordinate_pairs(blocks, positions, y_deltas=Y_DELTAS):
+    """
+    Find every aligned int32 x followed (at each y delta) by the matching y.
+
+    Returns a list of (x_address, position_index, y_delta).
+    """
+    wanted = {(x, y): i for i, (x, y) in enumerate(positions)}
+    xs = np.array(sorted({x for x, _ in positions}), dtype=np.int32)
+    encoded = np.array(sorted(x * 65536 + y for x, y in positions), dtype=np.int64)
+
+    hits = []
+    for base, data in blocks:
+        skip = (-base) % 4
+        count = (len(data) - skip) // 4
+        if count <= 0:
+            continue
+        words = np.frombuffer(data, dtype='<i4', count=count, offset=skip)
+        index = np.flatnonzero(np.isin(words, xs))
+        for delta in y_deltas:
+            step = delta // 4
+            other = index + step
+            ok = (other >= 0) & (other < count)
+            x_index, y_index = index[ok], other[ok]
+            pairs = words[x_index].astype(np.int64) * 65536 + words[y_index]
+            for i in np.flatnonzero(np.isin(pairs, encoded)):
+                address = base + skip + int(x_index[i]) * 4
+                position = (int(words[x_index[i]]), int(words[y_index[i]]))
+                hits.append((address, wanted[position], delta))
+    return hits
+
+def infer_tables(hits, min_mobs=3, max_stride=MAX_STRIDE, max_count=MAX_COUNT):
+    """
+    Group hits into arrays: same y delta, addresses a multiple of the stride
+    apart and within one table's span.
+
+    Returns candidates sorted best first as dicts with anchor (lowest x
+    address), stride, y_delta and mobs (distinct positions matched).
+    """
+    by_delta = defaultdict(list)
+    for address, position, delta in hits:
+        by_delta[delta].append((address, position))
+
+    candidates = []
+    for delta, group in by_delta.items():
+        for stride in range(max_stride, MIN_STRIDE - 1, -4):
+            span = stride * max_count
+            residues = defaultdict(list)
+            for address, position in group:
+                residues[address % stride].append((address, position))
+
+            for members in residues.values():
+                if len({p for _, p in members}) < min_mobs:
+                    continue
+                members.sort()
+                # Sliding window: most distinct positions within one span,
+                # starting as late as possible so stray matches before the
+                # table don't become the anchor
+                counts = Counter()
+                end = 0
+                best = (0, None)
+                for start, (address, _) in enumerate(members):
+                    while end < len(members) and members[end][0] - address < span:
+                        counts[members[end][1]] += 1
+                        end += 1
+                    if len(counts) >= best[0]:
+                        best = (len(counts), address)
+                    counts[members[start][1]] -= 1
+                    if counts[members[start][1]] == 0:
+                        del counts[members[start][1]]
+                if best[0] >= min_mobs:
+                    candidates.append({'anchor': best[1], 'stride': stride,
+                                       'y_delta': delta, 'mobs': best[0]})
+
+    # More matched mobs first; for equal matches the largest stride, since
+    # every divisor of the real stride matches too
+    candidates.sort(key=lambda c: (-c['mobs'], -c['stride']))
+    return candidates
+
+def _plausible(x, y):
+    return 0 <= x <= COORD_LIMIT and 0 <= y <= COORD_LIMIT
+
+def measure_extent(pm, anchor, stride, y_delta, max_count=MAX_COUNT):
+    """
+    Walk slots from the anchor in both directions while they hold plausible
+    coordinates. Returns (first_x_address, count).
+    """
+    def slot(address):
+        try:
+            x = eomemory.read_pointer(pm, address)
+            y = eomemory.read_pointer(pm, address + y_delta)
+        except Exception:
+            return None
+        return x, y
+
+    first = anchor
+    for _ in range(max_count):
+        values = slot(first - stride)
+        if values is None or not _plausible(*values):
+            break
+        first -= stride
+
+    count = 0
+    last_occupied = 0
+    while count < max_count:
+        values = slot(first + count * stride)
+        if values is None or not _plausible(*values):
+            break
+        if values != (0, 0):
+            last_occupied = count
+        count += 1
+
+    # Zeroed memory after the table looks like empty slots
+    return first, min(count, last_occupied + 1 + TRAILING_SLACK)
+
+def sample_columns(pm, first, stride, count, y_delta, samples, interval):
+    """
+    Read the table (plus one stride on each side) several times.
+
+    Returns (snapshots, offsets): snapshots[k][slot] maps offset relative to
+    x -> int32 value, for offsets in (-stride, stride).
+    """
+    offsets = list(range(-stride + 4, stride, 4))
+    start = first - stride
+    words_per_slot = stride // 4
+    snapshots = []
+    for k in range(samples):
+        data = pm.read_bytes(start, (count + 2) * stride)
+        words = np.frombuffer(data, dtype='<i4')
+        table = []
+        for slot in range(count):
+            x_word = (slot + 1) * words_per_slot
+            table.append({offset: int(words[x_word + offset // 4]) for offset in offsets})
+        snapshots.append(table)
+        if k + 1 < samples:
+            time.sleep(interval)
+    return snapshots, [o for o in offsets if o not in (0, y_delta)]
+
+def _occupied(entry, y_delta):
+    x, y = entry[0], entry[y_delta]
+    return (x, y) != (0, 0) and _plausible(x, y)
+
+def find_fields(snapshots, offsets, y_delta, stride):
+    """
+    Score every column as id, face and hp field.
+
+    id: non-zero, distinct across live mobs, constant while a mob lives.
+    face: 0-3 and matches the direction of every observed step.
+    hp: positive, never rises while a mob lives and drops at least once.
+    Returns {field: offset relative to x} for the fields that were found.
+    """
+    found = {}
+    scores = {}
+    for offset in offsets:
+        id_ok = id_total = 0
+        face_ok = face_total = 0
+        face_range = True
+        hp_valid = True
+        hp_drops = 0
+
+        for k, table in enumerate(snapshots):
+            live = [entry for entry in table if _occupied(entry, y_delta)]
+            values = [entry[offset] for entry in live]
+            id_total += 1
+            if values and all(v != 0 for v in values) and len(set(values)) == len(values):
+                id_ok += 1
+            face_range = face_range and all(0 <= v <= 3 for v in values)
+            hp_valid = hp_valid and all(0 < v <= 100000 for v in values)
+
+            if k == 0:
+                continue
+            for before, after in zip(snapshots[k - 1], table):
+                if not (_occupied(before, y_delta) and _occupied(after, y_delta)):
+                    continue
+                step = (after[0] - before[0], after[y_delta] - before[y_delta])
+                if abs(step[0]) + abs(step[1]) > 1:
+                    continue  # slot reused by a different mob
+                id_total += 1
+                if after[offset] == before[offset]:
+                    id_ok += 1
+                if step in FACE_BY_STEP:
+                    face_total += 1
+                    if after[offset] == FACE_BY_STEP[step]:
+                        face_ok += 1
+                if after[offset] > before[offset]:
+                    hp_valid = False
+                elif after[offset] < before[offset]:
+                    hp_drops += 1
+
+        scores[offset] = {
+            'id': id_ok / id_total if id_total else 0.0,
+            'face': face_ok / face_total if face_range and face_total >= 3 else 0.0,
+            'hp': 1.0 if hp_valid and hp_drops else 0.0,
+        }
+
+    for field, threshold in (('face', 0.9), ('hp', 1.0), ('id', 0.95)):
+        ranked = sorted((s[field], o) for o, s in scores.items()
+                        if o not in found.values() and s[field] >= threshold)
+        if ranked:
+            # Prefer the best score, then the column closest to x
+            best = max(score for score, _ in ranked)
+            found[field] = min((o for score, o in ranked if score == best), key=abs)
+
+    # All fields must fit in one entry
+    while found:
+        span = max([0, y_delta] + list(found.values())) - min([0, y_delta] + list(found.values()))
+        if span < stride:
+            break
+        found.pop(max(found, key=lambda f: abs(found[f])))
+    return found
+
+def build_layout(first_x, stride, count, y_delta, fields):
+    """Turn offsets relative to x into an NpcTableLayout anchored at the entry start."""
+    relative = dict(fields, x=0, y=y_delta)
+    lead = -min(relative.values())
+    return eonpctable.NpcTableLayout(
+        first_x - lead, stride, count, relative['x'] + lead, relative['y'] + lead,
+        id_offset=relative['id'] + lead if 'id' in relative else None,
+        hp_offset=relative['hp'] + lead if 'hp' in relative else None,
+        face_offset=relative['face'] + lead if 'face' in relative else None)
+
+def observe_mobs(pm, addrs, seconds):
+    """Follow the "last moved mob" record and return the mobs' latest positions."""
+    from eotracker import MobTracker
+
+    tracker = MobTracker(verbose=False)
+    last = None
+    end = time.time() + seconds
+    while time.time() < end:
+        values = (pm.read_int(addrs.face_addr), pm.read_int(addrs.x_addr), pm.read_int(addrs.y_addr))
+        if values != last and values[1:] != (0, 0):
+            tracker.on_mob_move(*values)
+            last = values
+        time.sleep(0.02)
+    tracker.sweep_inactive()
+    return sorted({(m['x'], m['y']) for m in tracker.mobs.values()})
+
+def discover(args):
+    from eobot032025 import select_endless_pid, load_addresses
+
+    pid = select_endless_pid()
+    if pid is None:
+        return
+    pm = eomemory.open_process(pid)
+    addrs = load_addresses(pid)
+    if addrs.mob_base_addr is None:
+        print("Run memoryscan-MOBloc.py first.")
+        return
+
+    print(f"Watching mob movement for {args.observe:g}s (stay near several moving mobs)...")
+    positions = observe_mobs(pm, addrs, args.observe)
+    print(f"Mobs seen at: {positions}")
+    if len(positions) < args.min_mobs:
+        print(f"Need at least {args.min_mobs} mobs, try again with more mobs around.")
+        return
+
+    start = time.time()
+    regions = eomemory.enumerate_regions(pm, writable_only=True)
+    blocks = (block for region in regions
+              for block in eomemory.read_chunks(pm, region.start, region.size, 4 * 1024 * 1024))
+    hits = find_coordinate_pairs(blocks, positions)
+    print(f"{len(hits)} coordinate matches ({time.time() - start:.1f}s)")
+
+    candidates = infer_tables(hits, args.min_mobs)
+    if not candidates:
+        print("No table found. Mobs may have moved during the scan; try again.")
+        return
+    for c in candidates[:5]:
+        print(f"  0x{c['anchor']:08X} stride 0x{c['stride']:X} y{c['y_delta']:+d}: {c['mobs']} mobs")
+
+    best = candidates[0]
+    first, count = measure_extent(pm, best['anchor'], best['stride'], best['y_delta'])
+    print(f"Table: 0x{first:08X}, {count} slots of 0x{best['stride']:X} bytes")
+
+    print(f"Sampling the table for {args.samples * args.interval:g}s "
+          f"(hit a mob now to find the hp field)...")
+    snapshots, offsets = sample_columns(pm, first, best['stride'], count, best['y_delta'],
+                                        args.samples, args.interval)
+    fields = find_fields(snapshots, offsets, best['y_delta'], best['stride'])
+    for field in ('id', 'face', 'hp'):
+        if field in fields:
+            print(f"  {field}: x{fields[field]:+d}")
+        else:
+            print(f"  {field}: not found")
+
+    layout = build_layout(first, best['stride'], count, best['y_delta'], fields)
+    path = eonpctable.save_layout(layout, args.output)
+    print(f"\n{layout}\nSaved to: {path}")
+
+def show(args):
+    """Print the live table using the saved layout."""
+    from eobot032025 import select_endless_pid
+
+    pid = select_endless_pid()
+    if pid is None:
+        return
+    layout = eonpctable.load_layout(pid)
+    if layout is None:
+        print("No NPC table layout yet, run 'discover' first.")
+        return
+    pm = eomemory.open_process(pid)
+    print(layout)
+    for slot, fields in eonpctable.read_entries(pm, layout):
+        print(f"  slot {slot:3d}: " + ', '.join(f"{name}={value}" for name, value in fields.items()))
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the client's NPC table")
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    discover_parser = commands.add_parser('discover', help="locate the table and its fields")
+    discover_parser.add_argument('--observe', type=float, default=15.0,
+                                 help="seconds to watch mob movement first (default 15)")
+    discover_parser.add_argument('--min-mobs', type=int, default=3,
+                                 help="mobs that must line up in the table (default 3)")
+    discover_parser.add_argument('--samples', type=int, default=40)
+    discover_parser.add_argument('--interval', type=float, default=0.25,
+                                 help="seconds between table samples")
+    discover_parser.add_argument('--output', help="layout file (default npctable.json)")
+    discover_parser.set_defaults(func=discover)
+
+    show_parser = commands.add_parser('show', help="print the table with the saved layout")
+    show_parser.set_defaults(func=show)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import struct
+
+# The client's NPC table: a fixed-size array with one entry per visible NPC.
+# Reading the whole array once per tick gives every mob's position (and id /
+# hp when their fields are known) directly, so nothing has to be inferred
+# from the single "last moved mob" record. eonpcscan.py finds the layout.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+NPC_TABLE_FILE = 'npctable.json'
+
+FIELDS = ('x', 'y', 'id', 'hp', 'face')
+
+class NpcTableLayout:
+    """
+    Where the table is and what an entry looks like.
+
+    Field offsets are relative to the start of an entry; x and y are
+    required, id/hp/face are None when unknown.
+    """
+
+    def __init__(self, base, stride, count, x_offset, y_offset,
+                 id_offset=None, hp_offset=None, face_offset=None):
+        self.base = base
+        self.stride = stride
+        self.count = count
+        self.offsets = {'x': x_offset, 'y': y_offset, 'id': id_offset,
+                        'hp': hp_offset, 'face': face_offset}
+
+    @property
+    def size(self):
+        return self.stride * self.count
+
+    def entry_struct(self):
+        """
+        A struct.Struct that unpacks one entry into the known fields.
+
+        Fields come out in the order of fields_in_struct().
+        """
+        fmt = '<'
+        position = 0
+        for name in self.fields_in_struct():
+            offset = self.offsets[name]
+            if offset > position:
+                fmt += f'{offset - position}x'
+            fmt += 'i'
+            position = offset + 4
+        if self.stride > position:
+            fmt += f'{self.stride - position}x'
+        return struct.Struct(fmt)
+
+    def fields_in_struct(self):
+        known = [name for name in FIELDS if self.offsets[name] is not None]
+        return sorted(known, key=lambda name: self.offsets[name])
+
+    def to_dict(self):
+        data = {'base': f"0x{self.base:08X}", 'stride': self.stride, 'count': self.count}
+        for name in FIELDS:
+            data[f'{name}_offset'] = self.offsets[name]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        base = data['base']
+        if isinstance(base, str):
+            base = int(base, 16)
+        return cls(base, data['stride'], data['count'], data['x_offset'], data['y_offset'],
+                   data.get('id_offset'), data.get('hp_offset'), data.get('face_offset'))
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}+0x{self.offsets[name]:X}" for name in self.fields_in_struct())
+        return f"NpcTableLayout(0x{self.base:08X}, {self.count} x 0x{self.stride:X}: {fields})"
+
+def layout_path(pid=None):
+    """npctable-<pid>.json if it exists (per-client layout), else npctable.json."""
+    if pid is not None:
+        per_client = os.path.join(SCRIPT_DIR, f"npctable-{pid}.json")
+        if os.path.exists(per_client):
+            return per_client
+    return os.path.join(SCRIPT_DIR, NPC_TABLE_FILE)
+
+def load_layout(pid=None):
+    """Read the saved layout, or None if no table has been discovered."""
+    path = layout_path(pid)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            return NpcTableLayout.from_dict(json.load(f))
+    except Exception as e:
+        print(f"Error reading {os.path.basename(path)}: {e}")
+        return None
+
+def save_layout(layout, path=None):
+    path = path or os.path.join(SCRIPT_DIR, NPC_TABLE_FILE)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(layout.to_dict(), f, indent=1)
+    os.replace(tmp, path)
+    return path
+
+def read_entries(pm, layout, entry_struct=None, data=None):
+    """
+    Read the table in one call and return (slot, fields) for occupied entries.
+
+    fields is a dict with every known field. An entry is empty when its
+    position is (0, 0), its id is 0 or its hp is 0 or less. data is the
+    table's bytes when the caller already read them (batched with other reads).
+    """
+    entry_struct = entry_struct or layout.entry_struct()
+    names = layout.fields_in_struct()
+    if data is None:
+        data = pm.read_bytes(layout.base, layout.size)
+    entries = []
+    for slot, values in enumerate(entry_struct.iter_unpack(data)):
+        fields = dict(zip(names, values))
+        if fields['x'] == 0 and fields['y'] == 0:
+            continue
+        if fields.get('id', 1) == 0 or fields.get('hp', 1) <= 0:
+            continue
+        entries.append((slot, fields))
+    return entries
+
+class NpcTableTracker:
+    """
+    Track mobs from a bulk read of the NPC table.
+
+    mobs has the same shape as MobTracker.mobs (plus hp/face/slot when
+    known). Mob ids are the table's id field, or the slot index when the id
+    field is unknown, so they stay stable while the mob is alive and mobs
+    leave as soon as their entry is cleared.
+    """
+
+    def __init__(self, layout, verbose=True, log=print):
+        self.layout = layout
+        self.mobs = {}
+        self.verbose = verbose
+        self.log = log
+        self._struct = layout.entry_struct()
+        self._has_id = layout.offsets['id'] is not None
+
+    def _log(self, message):
+        if self.verbose:
+            self.log(message)
+
+    def update(self, pm, now=None, data=None):
+        """
+        Read the table (or take its bytes as data) and sync mobs with it.
+
+        Returns (changed, removed): whether any mob appeared, moved or left,
+        and the ids of mobs that left. Read errors propagate to the caller.
+        """
+        if now is None:
+            now = time.time()
+
+        seen = set()
+        changed = False
+        for slot, fields in read_entries(pm, self.layout, self._struct, data):
+            mob_id = fields['id'] if self._has_id else slot
+            seen.add(mob_id)
+            x, y = fields['x'], fields['y']
+            mob = self.mobs.get(mob_id)
+            if mob is None:
+                mob = self.mobs[mob_id] = {
+                    'x': x, 'y': y, 'last_x': x, 'last_y': y,
+                    'last_activity_time': now, 'from_spawn': False,
+                }
+                changed = True
+                self._log(f"Mob #{mob_id} at ({x}, {y})")
+            elif mob['x'] != x or mob['y'] != y:
+                mob['last_x'], mob['last_y'] = mob['x'], mob['y']
+                mob['x'], mob['y'] = x, y
+                mob['last_activity_time'] = now
+                changed = True
+            mob['slot'] = slot
+            if 'hp' in fields:
+                mob['hp'] = fields['hp']
+            if 'face' in fields:
+                mob['face'] = fields['face']
+
+        removed = [mob_id for mob_id in self.mobs if mob_id not in seen]
+        for mob_id in removed:
+            del self.mobs[mob_id]
+            self._log(f"Mob #{mob_id} left the table")
+        return changed or bool(removed), removed
+
+    def remove(self, mob_id):
+        """Forget a mob (e.g. after a kill); it comes back if its entry is still live."""
+        self.mobs.pop(mob_id, None)
+
+def table_readable(pm, layout):
+    """True if the whole table can be read."""
+    try:
+        pm.read_bytes(layout.base, layout.size)
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,328 @@
+import os
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import eomemory
+
+# Pointer-chain scanner.
+# The player and mob structures live on the heap, so their addresses change
+# every session. This finds chains of pointers from a module's static data
+# (e.g. "endless.exe"+0x1A2B3C -> +0x10 -> +0x4) that lead to them, which
+# turns address discovery at startup into a handful of pointer reads.
+#
+#   1. scan: build a reverse pointer index over readable memory and walk
+#      backwards (BFS) from the target to module-relative static addresses
+#   2. repeat in later sessions and intersect the results to keep only the
+#      chains that survive restarts
+#   3. the bot resolves pointerchains.json at startup (see eobot032025.py)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CHAINS_FILE = 'pointerchains.json'
+
+DEFAULT_MAX_DEPTH = 4
+DEFAULT_MAX_OFFSET = 0x800
+DEFAULT_MAX_NODES = 200000    # frontier cap per BFS level
+DEFAULT_MAX_RESULTS = 5000
+PENDING_BLOCKS_PER_WORKER = 2  # blocks read ahead of the workers (bounds memory while indexing)
+
+class PointerIndex:
+    """
+    Every aligned 32-bit value in readable memory that points into readable memory.
+
+    Stored as two parallel arrays sorted by pointer value, so "who points into
+    [lo, hi]" is a pair of binary searches.
+    """
+
+    def __init__(self, addresses, values):
+        order = np.argsort(values, kind='stable')
+        self.addresses = addresses[order]
+        self.values = values[order]
+
+    def __len__(self):
+        return len(self.values)
+
+    @classmethod
+    def build(cls, blocks, regions, workers=None):
+        """
+        Build the index from (base_address, bytes) blocks.
+
+        regions are the readable regions used to decide whether a value is a
+        valid pointer. Blocks are processed in parallel; blocks is consumed
+        only PENDING_BLOCKS_PER_WORKER blocks per worker ahead of the results,
+        so a generator that reads memory doesn't have it all in RAM at once.
+        """
+        starts = np.array([r.start for r in regions], dtype=np.int64)
+        ends = np.array([r.start + r.size for r in regions], dtype=np.int64)
+        order = np.argsort(starts)
+        starts, ends = starts[order], ends[order]
+
+        def pointers_in(block):
+            base, data = block
+            skip = (-base) % eomemory.POINTER_SIZE
+            usable = (len(data) - skip) // 4 * 4
+            if usable <= 0:
+                return None
+            values = np.frombuffer(data, dtype='<u4', count=usable // 4, offset=skip).astype(np.int64)
+            slot = np.searchsorted(starts, values, side='right') - 1
+            valid = (slot >= 0) & (values < ends[np.maximum(slot, 0)])
+            index = np.flatnonzero(valid)
+            return base + skip + index * 4, values[index]
+
+        if workers is None:
+            workers = min(32, (os.cpu_count() or 1) + 4)  # ThreadPoolExecutor's default
+        parts = []
+        pending = deque()
+
+        def collect():
+            part = pending.popleft().result()
+            if part is not None:
+                parts.append(part)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for block in blocks:
+                if len(pending) >= workers * PENDING_BLOCKS_PER_WORKER:
+                    collect()
+                pending.append(pool.submit(pointers_in, block))
+            while pending:
+                collect()
+
+        if not parts:
+            return cls(np.empty(0, np.int64), np.empty(0, np.int64))
+        return cls(np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts]))
+
+    def pointers_into(self, lows, highs):
+        """Vectorized lookup: for each [low, high] range, the index range of pointers into it."""
+        return (np.searchsorted(self.values, lows, side='left'),
+                np.searchsorted(self.values, highs, side='right'))
+
+def _expand_ranges(lo, hi):
+    """Concatenate arange(lo[i], hi[i]) for all i, plus the owning i of each element."""
+    counts = hi - lo
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(lo)), counts)
+    within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(lo, counts) + within, owner
+
+def find_chains(index, target, modules, max_depth=DEFAULT_MAX_DEPTH, max_offset=DEFAULT_MAX_OFFSET,
+                max_nodes=DEFAULT_MAX_NODES, max_results=DEFAULT_MAX_RESULTS):
+    """
+    Breadth-first search from target back to pointers stored inside modules.
+
+    Each level finds every pointer whose value is within max_offset below the
+    current frontier. Pointers located in a module image end a chain; the
+    rest become the next frontier. Returns chains as dicts with module,
+    module_offset and offsets (applied from the static pointer towards target).
+    """
+    mod_starts = np.array([m.base for m in modules], dtype=np.int64)
+    mod_ends = np.array([m.base + m.size for m in modules], dtype=np.int64)
+    order = np.argsort(mod_starts)
+    mod_starts, mod_ends = mod_starts[order], mod_ends[order]
+    mod_names = [modules[i].name for i in order]
+
+    frontier = np.array([target], dtype=np.int64)
+    visited = frontier.copy()
+    levels = []   # per level: (parent index into previous frontier, offset)
+    chains = []
+
+    for depth in range(1, max_depth + 1):
+        lo, hi = index.pointers_into(frontier - max_offset, frontier)
+        positions, owner = _expand_ranges(lo, hi)
+        if len(positions) == 0:
+            break
+
+        pointer_addrs = index.addresses[positions]
+        offsets = frontier[owner] - index.values[positions]
+
+        slot = np.searchsorted(mod_starts, pointer_addrs, side='right') - 1
+        static = (slot >= 0) & (pointer_addrs < mod_ends[np.maximum(slot, 0)])
+
+        for i in np.flatnonzero(static):
+            path = [int(offsets[i])]
+            parent = int(owner[i])
+            for level_parent, level_offset in reversed(levels):
+                path.append(int(level_offset[parent]))
+                parent = int(level_parent[parent])
+            module = int(slot[i])
+            chains.append({
+                'module': mod_names[module],
+                'module_offset': int(pointer_addrs[i] - mod_starts[module]),
+                'offsets': path,
+            })
+            if len(chains) >= max_results:
+                return chains
+
+        # Heap pointers continue the search (each address once)
+        dynamic = np.flatnonzero(~static)
+        next_addrs, first = np.unique(pointer_addrs[dynamic], return_index=True)
+        fresh = ~np.isin(next_addrs, visited)
+        keep = dynamic[first[fresh]][:max_nodes]
+        if len(keep) == 0:
+            break
+
+        levels.append((owner[keep], offsets[keep]))
+        frontier = pointer_addrs[keep]
+        visited = np.union1d(visited, frontier)
+        print(f"  Depth {depth}: {len(positions)} pointers, {len(chains)} chains so far, "
+              f"{len(frontier)} heap nodes to follow")
+
+    return chains
+
+def chain_key(chain):
+    return (chain['module'].lower(), chain['module_offset'], tuple(chain['offsets']))
+
+def format_chain(chain):
+    """Cheat-Engine-like notation: "endless.exe"+0x1234 -> +0x10 -> +0x4."""
+    text = f"\"{chain['module']}\"+0x{chain['module_offset']:X}"
+    for offset in chain['offsets']:
+        text += f" -> +0x{offset:X}"
+    return text
+
+def intersect_results(results):
+    """Keep, per target, only the chains found in every result set."""
+    merged = {}
+    for target in results[0]['targets']:
+        common = None
+        for result in results:
+            keys = {chain_key(c): c for c in result['targets'].get(target, [])}
+            common = keys if common is None else {k: v for k, v in common.items() if k in keys}
+        # Shorter chains first: fewer reads and fewer things to break
+        merged[target] = sorted(common.values(), key=lambda c: (len(c['offsets']), c['module_offset']))
+    return merged
+
+def load_chains(path=None):
+    """Load the chains file written by 'intersect' (None if there isn't one)."""
+    path = path or os.path.join(SCRIPT_DIR, CHAINS_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)['targets']
+
+def write_json(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+def scan(args):
+    from eobot032025 import select_endless_pid, read_address_from_file
+
+    targets = {}
+    if args.target in ('player', 'both'):
+        targets['player'] = read_address_from_file('playerxy.txt')
+    if args.target in ('mob', 'both'):
+        targets['mob'] = read_address_from_file('mobxy.txt')
+    targets = {name: addr for name, addr in targets.items() if addr is not None}
+    if not targets:
+        print("No target addresses. Run the scanners first.")
+        return
+
+    pid = select_endless_pid()
+    if pid is None:
+        return
+    pm = eomemory.open_process(pid)
+
+    start = time.time()
+    regions = eomemory.enumerate_regions(pm)
+    modules = eomemory.enumerate_modules(pm)
+    total = sum(r.size for r in regions)
+    print(f"{len(regions)} readable regions ({total / 1e6:.1f} MB), {len(modules)} modules")
+
+    def blocks():
+        for region in regions:
+            for address, data in eomemory.read_chunks(pm, region.start, region.size, 4 * 1024 * 1024):
+                yield address, data
+
+    index = PointerIndex.build(blocks(), regions, workers=args.workers)
+    print(f"Pointer index: {len(index)} pointers ({time.time() - start:.1f}s)")
+
+    result = {'pid': pid, 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'targets': {}}
+    for name, address in targets.items():
+        print(f"\nSearching chains to {name} (0x{address:08X})...")
+        chains = find_chains(index, address, modules, args.depth, args.max_offset,
+                             max_results=args.max_results)
+        result['targets'][name] = chains
+        print(f"Found {len(chains)} chains")
+        for chain in chains[:10]:
+            print(f"  {format_chain(chain)}")
+
+    output = args.output or os.path.join(SCRIPT_DIR, f"pointerscan-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    write_json(output, result)
+    print(f"\nResults written to: {output} ({time.time() - start:.1f}s total)")
+
+def intersect(args):
+    results = []
+    for path in args.files:
+        with open(path) as f:
+            results.append(json.load(f))
+    merged = intersect_results(results)
+
+    for target, chains in merged.items():
+        print(f"{target}: {len(chains)} chains in all {len(results)} sessions")
+        for chain in chains[:10]:
+            print(f"  {format_chain(chain)}")
+
+    output = args.output or os.path.join(SCRIPT_DIR, CHAINS_FILE)
+    write_json(output, {'sessions': len(results), 'targets': merged})
+    print(f"\nStable chains written to: {output}")
+
+def validate(args):
+    """Drop chains that don't lead to the current session's scanned addresses."""
+    from eobot032025 import select_endless_pid, read_address_from_file
+
+    path = args.chains or os.path.join(SCRIPT_DIR, CHAINS_FILE)
+    chains = load_chains(path)
+    if chains is None:
+        print(f"No chains file at {path}")
+        return
+
+    pid = select_endless_pid()
+    if pid is None:
+        return
+    pm = eomemory.open_process(pid)
+    bases = eomemory.module_bases(pm)
+    expected = {'player': read_address_from_file('playerxy.txt'), 'mob': read_address_from_file('mobxy.txt')}
+
+    for target, target_chains in chains.items():
+        if expected.get(target) is None:
+            continue
+        kept = [c for c in target_chains if eomemory.resolve_module_chain(pm, c, bases) == expected[target]]
+        print(f"{target}: {len(kept)}/{len(target_chains)} chains still valid")
+        chains[target] = kept
+
+    write_json(path, {'targets': chains})
+    print(f"Updated {path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Find stable pointer chains to the player and mob structures")
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    scan_parser = commands.add_parser('scan', help="scan the running client (needs playerxy.txt/mobxy.txt)")
+    scan_parser.add_argument('--target', choices=['player', 'mob', 'both'], default='both')
+    scan_parser.add_argument('--depth', type=int, default=DEFAULT_MAX_DEPTH, help="maximum chain length")
+    scan_parser.add_argument('--max-offset', type=lambda v: int(v, 0), default=DEFAULT_MAX_OFFSET,
+                             help="largest offset per level (default 0x800)")
+    scan_parser.add_argument('--max-results', type=int, default=DEFAULT_MAX_RESULTS)
+    scan_parser.add_argument('--workers', type=int, default=None, help="threads for building the index")
+    scan_parser.add_argument('--output')
+    scan_parser.set_defaults(func=scan)
+
+    intersect_parser = commands.add_parser('intersect', help="keep chains common to several scan results")
+    intersect_parser.add_argument('files', nargs='+')
+    intersect_parser.add_argument('--output')
+    intersect_parser.set_defaults(func=intersect)
+
+    validate_parser = commands.add_parser('validate', help="prune chains against the running client")
+    validate_parser.add_argument('--chains')
+    validate_parser.set_defaults(func=validate)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import time
+import threading
+
+# Finding and watching game client processes.
+# psutil.process_iter() + proc.name() opens every process on the system on
+# every call; ProcessFinder only looks up names of PIDs it hasn't seen before.
+# psutil is imported by the methods that use it, so tools that never look
+# for a client (eosim, eotune) don't load it.
+
+CLIENT_NAME = 'endless.exe'
+
+class ProcessFinder:
+    """Find client processes, caching which PIDs are (not) clients."""
+
+    def __init__(self, name=CLIENT_NAME):
+        self.name = name.lower()
+        self._known = {}  # pid -> create_time for clients, None for other processes
+        self._lock = threading.Lock()
+
+    def find(self):
+        """Return the PIDs of all running clients."""
+        import psutil
+        with self._lock:
+            pids = psutil.pids()
+            alive = set(pids)
+
+            # Forget exited processes so reused PIDs get looked up again
+            for pid in [pid for pid in self._known if pid not in alive]:
+                del self._known[pid]
+
+            found = []
+            for pid in pids:
+                if pid not in self._known:
+                    self._known[pid] = self._lookup(pid)
+                if self._known.get(pid) is not None:
+                    found.append(pid)
+            return found
+
+    def _lookup(self, pid):
+        import psutil
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                if proc.name().lower() != self.name:
+                    return None
+                return proc.create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+    def is_alive(self, pid):
+        """True if pid is still the same client process we found earlier."""
+        with self._lock:
+            create_time = self._known.get(pid)
+        if create_time is None:
+            return pid in self.find()
+        import psutil
+        try:
+            return psutil.Process(pid).create_time() == create_time
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+
+class ProcessWatcher:
+    """
+    Detect client exit/restart and hand restarted clients back to bots.
+
+    In supervisor mode several bots share one watcher; each client process is
+    claimed by at most one bot.
+    """
+
+    def __init__(self, finder=None):
+        self.finder = finder or ProcessFinder()
+        self._claimed = set()
+        self._lock = threading.Lock()
+
+    def claim(self, pid):
+        """Reserve pid for the calling bot. Returns False if another bot has it."""
+        with self._lock:
+            if pid in self._claimed:
+                return False
+            self._claimed.add(pid)
+            return True
+
+    def release(self, pid):
+        with self._lock:
+            self._claimed.discard(pid)
+
+    def is_alive(self, pid):
+        return self.finder.is_alive(pid)
+
+    def wait_for_client(self, preferred_pid=None, stop_event=None, deadline=None, poll_interval=0.5):
+        """
+        Block until an unclaimed client is running and claim it.
+
+        preferred_pid is taken first if it is still alive (e.g. after a transient
+        read error). Returns the pid, or None if stopped or past the deadline.
+        """
+        while stop_event is None or not stop_event.is_set():
+            if preferred_pid is not None and self.finder.is_alive(preferred_pid) and self.claim(preferred_pid):
+                return preferred_pid
+            for pid in self.finder.find():
+                if self.claim(pid):
+                    return pid
+            if deadline is not None and time.time() >= deadline:
+                return None
+            time.sleep(poll_interval)
+        return None
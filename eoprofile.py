@@ -0,0 +1,256 @@
+import time
+import sys
+import os
+import math
+import threading
+import io
+from array import array
+from collections import defaultdict
+
+# Phase timing for the bot's control loop.
+# Each tick of main() is split into named phases (memory reads, spawn detection,
+# targeting, movement, sleeps...). Phases can nest, so time spent holding keys
+# inside move_toward_mob shows up as a child of that phase.
+
+PERCENTILES = (50, 90, 99)
+BAR_WIDTH = 30
+
+# Only one cProfile can be active per process (since Python 3.12 a second
+# enable() raises ValueError), so with several clients the first one to
+# start gets it and the others fall back to sampling.
+_cprofile_lock = threading.Lock()
+
+class _NullPhase:
+    """Context manager that does nothing (used when profiling is off)."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class NullProfiler:
+    """Drop-in profiler with no-op hooks so the disabled path costs one call."""
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def tick(self):
+        pass
+
+    def report(self):
+        pass
+
+class _Phase:
+    """Timer for one named phase, reused across ticks to avoid allocations."""
+    __slots__ = ('_profiler', '_name')
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        stack = self._profiler._stack
+        parent = stack[-1][0] if stack else ()
+        stack.append((parent + (self._name,), time.perf_counter()))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        path, start = self._profiler._stack.pop()
+        self._profiler._samples[path].append(end - start)
+        return False
+
+class PhaseProfiler:
+    """
+    Collect per-phase wall times with monotonic timers.
+
+    capture can be None, 'cprofile' or 'sample'; the capture starts on the first
+    tick (in the thread running the loop) and only lasts capture_window seconds
+    so long sessions don't pay for it.
+    """
+    enabled = True
+
+    def __init__(self, capture=None, capture_window=30.0, sample_interval=0.005, sample_file=None):
+        self._phases = {}
+        self._stack = []
+        self._samples = defaultdict(lambda: array('d'))
+        self._ticks = array('d')
+        self._last_tick = None
+        self._started = time.perf_counter()
+
+        self.capture = capture
+        self.capture_window = capture_window
+        self.sample_interval = sample_interval
+        self.sample_file = sample_file
+        self._capture_deadline = None
+        self._cprofile = None
+        self._sampler = None
+        self._sampler_stop = threading.Event()
+        self._stack_counts = defaultdict(int)
+        self._capture_report = None
+        self._capture_pending = capture is not None
+
+    def phase(self, name):
+        """Return the (cached) context manager timing phase `name`."""
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def tick(self):
+        """Mark the start of a control-loop tick."""
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            self._ticks.append(now - self._last_tick)
+        self._last_tick = now
+
+        if self._capture_pending:
+            self._capture_pending = False
+            self._start_capture()
+        elif self._capture_deadline is not None and now >= self._capture_deadline:
+            self._stop_capture()
+
+    # Capture (cProfile / sampling) for a fixed window
+
+    def _start_capture(self):
+        self._capture_deadline = time.perf_counter() + self.capture_window
+        if self.capture == 'cprofile':
+            self._start_cprofile()
+        if self.capture == 'sample':
+            target_id = threading.get_ident()
+            self._sampler = threading.Thread(target=self._sample_loop, args=(target_id,), daemon=True)
+            self._sampler.start()
+        elif self.capture != 'cprofile':
+            raise ValueError(f"Unknown capture mode '{self.capture}'")
+        print(f"Profiler: capturing {self.capture} profile for {self.capture_window:g}s")
+
+    def _start_cprofile(self):
+        """Enable cProfile, or switch this capture to 'sample' if another one is running."""
+        if _cprofile_lock.acquire(blocking=False):
+            import cProfile
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                self._cprofile = profile
+                return
+            except ValueError as e:
+                # Another profiling tool (not ours) is active
+                _cprofile_lock.release()
+                print(f"Profiler: cProfile unavailable ({e}), sampling instead")
+        else:
+            print("Profiler: cProfile is already capturing another client, sampling instead")
+        self.capture = 'sample'
+
+    def _sample_loop(self, target_id):
+        """Periodically record the main thread's stack in collapsed form."""
+        while not self._sampler_stop.wait(self.sample_interval):
+            frame = sys._current_frames().get(target_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self._stack_counts[';'.join(reversed(names))] += 1
+
+    def _stop_capture(self):
+        self._capture_deadline = None
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            _cprofile_lock.release()
+            import pstats
+            out = io.StringIO()
+            stats = pstats.Stats(self._cprofile, stream=out)
+            stats.sort_stats('cumulative').print_stats(25)
+            self._capture_report = out.getvalue()
+            self._cprofile = None
+        elif self._sampler is not None:
+            self._sampler_stop.set()
+            self._sampler.join()
+            self._sampler = None
+            self._capture_report = self._format_samples()
+        print("Profiler: capture window finished")
+
+    def _format_samples(self):
+        total = sum(self._stack_counts.values())
+        ordered = sorted(self._stack_counts.items(), key=lambda item: item[1], reverse=True)
+
+        if self.sample_file:
+            # Collapsed stacks, usable directly with flamegraph.pl / speedscope
+            with open(self.sample_file, 'w') as f:
+                for stack, count in ordered:
+                    f.write(f"{stack} {count}\n")
+
+        lines = [f"{total} samples every {self.sample_interval*1000:.0f}ms, hottest stacks:"]
+        for stack, count in ordered[:15]:
+            leaf = stack.rsplit(';', 1)[-1]
+            lines.append(f"  {count / total * 100:5.1f}%  {leaf}")
+            lines.append(f"         {stack}")
+        if self.sample_file:
+            lines.append(f"Collapsed stacks written to {self.sample_file}")
+        return '\n'.join(lines)
+
+    # Reporting
+
+    def report(self):
+        """Print a flame-style breakdown of where tick time went."""
+        if self._capture_deadline is not None:
+            self._stop_capture()
+
+        wall = time.perf_counter() - self._started
+        tick_total = sum(self._ticks)
+        print("\n=== Profile ===")
+        print(f"Wall time: {wall:.2f}s, ticks: {len(self._ticks)}, tick time: {tick_total:.2f}s")
+        if self._ticks:
+            print("Tick " + _format_percentiles(self._ticks))
+
+        header = f"{'phase':<34} {'total':>9} {'%':>6} {'calls':>7} " + \
+                 ' '.join(f"{'p' + str(p) + ' ms':>9}" for p in PERCENTILES) + f" {'max ms':>9}"
+        print(header)
+
+        base = wall
+        children = defaultdict(list)
+        for path in self._samples:
+            children[path[:-1]].append(path)
+        self._print_tree((), children, base, 0)
+
+        if self._capture_report:
+            print(f"\n=== {self.capture} capture ===")
+            print(self._capture_report)
+
+    def _print_tree(self, parent, children, base, depth):
+        kids = sorted(children.get(parent, []), key=lambda p: sum(self._samples[p]), reverse=True)
+        for path in kids:
+            values = self._samples[path]
+            total = sum(values)
+            share = total / base * 100 if base else 0.0
+            bar = '#' * min(BAR_WIDTH, int(round(share / 100 * BAR_WIDTH)))
+            label = ('  ' * depth + path[-1])[:34]
+            pcts = ' '.join(f"{_percentile(values, p)*1000:9.2f}" for p in PERCENTILES)
+            print(f"{label:<34} {total:8.2f}s {share:5.1f}% {len(values):7d} {pcts} "
+                  f"{max(values)*1000:9.2f} {bar}")
+            self._print_tree(path, children, base, depth + 1)
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a sequence of floats."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def _format_percentiles(values):
+    parts = [f"p{p}={_percentile(values, p)*1000:.2f}ms" for p in PERCENTILES]
+    return ', '.join(parts) + f", max={max(values)*1000:.2f}ms"
+
+def create_profiler(enabled, capture=None, capture_window=30.0, sample_file=None):
+    """Return a PhaseProfiler when enabled, otherwise the no-op NullProfiler."""
+    if not enabled:
+        return NullProfiler()
+    return PhaseProfiler(capture=capture, capture_window=capture_window, sample_file=sample_file)
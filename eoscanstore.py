@@ -0,0 +1,90 @@
+import numpy as np
+
+# Columnar storage for signature scan matches.
+# A scan yields (addresses, records) batches per chunk; the store keeps them
+# as NumPy arrays (scan number, address, raw record bytes) instead of a tuple,
+# hex string and dict per match. Hex text is produced only for what is shown.
+
+RECORD_SIZE = 32
+
+def records_at(buffer, offsets, record_size=RECORD_SIZE):
+    """Copy the records starting at offsets out of buffer as an (n, record_size) uint8 array."""
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    windows = np.lib.stride_tricks.sliding_window_view(data, record_size)
+    return windows[np.asarray(offsets, dtype=np.int64)]
+
+def format_record(record):
+    """Hex text of one raw record (as the scanners print it)."""
+    return ' '.join(f"{b:02X}" for b in bytes(record))
+
+class ScanStore:
+    """All matches from a series of scans."""
+
+    def __init__(self, record_size=RECORD_SIZE):
+        self.record_size = record_size
+        self._parts = []
+        self._columns = None
+
+    def add(self, scan_number, addresses, records):
+        """Append one batch of matches."""
+        if len(addresses) == 0:
+            return
+        self._parts.append((np.full(len(addresses), scan_number, dtype=np.int32),
+                            np.asarray(addresses, dtype=np.int64),
+                            np.asarray(records, dtype=np.uint8).reshape(-1, self.record_size)))
+        self._columns = None
+
+    def add_scan(self, scan_number, batches):
+        """Consume a scan's (addresses, records) generator. Returns the number of matches."""
+        count = 0
+        for addresses, records in batches:
+            self.add(scan_number, addresses, records)
+            count += len(addresses)
+        return count
+
+    def _concat(self):
+        if self._columns is None:
+            if self._parts:
+                self._columns = tuple(np.concatenate(column) for column in zip(*self._parts))
+                self._parts = [self._columns]
+            else:
+                self._columns = (np.empty(0, np.int32), np.empty(0, np.int64),
+                                 np.empty((0, self.record_size), np.uint8))
+        return self._columns
+
+    @property
+    def scans(self):
+        return self._concat()[0]
+
+    @property
+    def addresses(self):
+        return self._concat()[1]
+
+    @property
+    def records(self):
+        return self._concat()[2]
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def unique_addresses(self):
+        return np.unique(self.addresses)
+
+    def scan_counts(self):
+        """(addresses, number of scans each address matched in)."""
+        pairs = np.unique(np.stack([self.addresses, self.scans.astype(np.int64)]), axis=1)
+        return np.unique(pairs[0], return_counts=True)
+
+    def distinct_values(self, offset):
+        """(addresses, number of distinct values of the byte at offset for each address)."""
+        pairs = np.unique(np.stack([self.addresses, self.records[:, offset].astype(np.int64)]), axis=1)
+        return np.unique(pairs[0], return_counts=True)
+
+    def values(self, address, offset):
+        """Sorted distinct values of one byte for one address."""
+        return sorted(set(self.records[self.addresses == address, offset].tolist()))
+
+    def latest_record(self, address):
+        """Raw bytes of the most recent match at address."""
+        rows = np.flatnonzero(self.addresses == address)
+        return bytes(self.records[rows[-1]]) if len(rows) else None
@@ -0,0 +1,379 @@
+import time
+import zlib
+
+import numpy as np
+
+from eoscanstore import ScanStore, records_at
+
+# The byte signatures the scanners look for, as data.
+# matches() checks one offset (cheap re-checks of known addresses);
+# find() searches a whole buffer with NumPy, most selective byte first.
+# SignatureSet searches for several signatures at once, sharing the
+# full-buffer comparison between signatures that anchor on the same byte
+# test. scan_regions() runs several searches over memory in one pass;
+# with a PageCache, repeat passes only re-match the 4 KB pages whose hash
+# changed. ChangeSampler watches a small window at a high rate instead.
+
+CHUNK_SIZE = 4 * 1024 * 1024
+SAMPLE_INTERVAL = 0.002
+
+# A signature anchors on another signature's byte test when that test
+# matches at most this many times as often as its own best one
+SHARED_ANCHOR_SLACK = 4.0
+ZERO_SHARE = 0.5  # rough share of zero bytes in process memory
+PAGE_SIZE = 4096
+
+class Signature:
+    """
+    A fixed-size byte pattern.
+
+    ranges maps byte index -> (low, high) inclusive; unlisted bytes can be
+    anything. equal lists pairs of byte indexes that must hold the same value.
+    window is the address range the scanner searches by default.
+    """
+
+    def __init__(self, name, size, ranges, equal=(), window=None):
+        self.name = name
+        self.size = size
+        self.ranges = dict(ranges)
+        self.equal = list(equal)
+        self.window = window
+        # Exact bytes first (0xFF before 0x00: far rarer in memory), then the
+        # narrowest ranges
+        self._order = sorted(self.ranges, key=lambda i: (self.ranges[i][1] - self.ranges[i][0],
+                                                         -self.ranges[i][0], i))
+
+    def matches(self, buffer, offset=0):
+        """True if buffer[offset:offset + size] has the signature."""
+        if offset < 0 or offset + self.size > len(buffer):
+            return False
+        for index in self._order:
+            low, high = self.ranges[index]
+            if not low <= buffer[offset + index] <= high:
+                return False
+        return all(buffer[offset + a] == buffer[offset + b] for a, b in self.equal)
+
+    def count(self, data, limit=None):
+        """Number of offsets of data a match could start at."""
+        count = len(data) - self.size + 1
+        return count if limit is None else min(count, limit)
+
+    def find(self, buffer, limit=None):
+        """
+        Offsets of every match in buffer (bytes or uint8 array).
+
+        limit caps the highest offset checked (exclusive), e.g. to skip
+        positions the next chunk covers.
+        """
+        data = as_array(buffer)
+        count = self.count(data, limit)
+        if count <= 0:
+            return np.empty(0, dtype=np.int64)
+        index = self._order[0]
+        return self.narrow(data, _test(data[index:index + count], *self.ranges[index]), skip=index)
+
+    def narrow(self, data, candidates, skip=None):
+        """The candidate offsets that match, checking every byte except skip (already tested)."""
+        for index in self._order:
+            if index == skip:
+                continue
+            if len(candidates) == 0:
+                return candidates
+            low, high = self.ranges[index]
+            values = data[candidates + index]
+            candidates = candidates[(values >= low) & (values <= high)]
+        for a, b in self.equal:
+            candidates = candidates[data[candidates + a] == data[candidates + b]]
+        return candidates
+
+def as_array(buffer):
+    return np.frombuffer(buffer, dtype=np.uint8) if not isinstance(buffer, np.ndarray) else buffer
+
+def _test(values, low, high):
+    """Offsets where values fall in [low, high]."""
+    return np.flatnonzero((values >= low) & (values <= high) if low != high else values == low)
+
+def test_frequency(low, high):
+    """Rough share of memory bytes in [low, high]."""
+    nonzero = max(0, high - max(low, 1) + 1)
+    return (ZERO_SHARE if low == 0 else 0.0) + nonzero * (1 - ZERO_SHARE) / 255
+
+class SignatureSet:
+    """
+    Several signatures searched in one go over each buffer.
+
+    Every signature is anchored on one of its byte tests (value range at
+    an index); signatures whose anchors test the same range share one
+    comparison over the buffer: the positions passing it are found once and
+    shifted by each signature's anchor index, so a signature that shares an
+    anchor costs only the narrowing of its own candidates.
+    """
+
+    def __init__(self, signatures):
+        self.signatures = list(signatures)
+        self.anchors = {}  # (low, high) -> [(signature, index)]
+        for signature, (low, high), index in self._choose_anchors():
+            self.anchors.setdefault((low, high), []).append((signature, index))
+
+    def _choose_anchors(self):
+        """
+        Each signature's own most selective test, unless a test other
+        signatures have too is nearly as good (one already picked first).
+        """
+        tests = {}
+        for signature in self.signatures:
+            for test in signature.ranges.values():
+                tests.setdefault(test, set()).add(signature)
+
+        chosen = []
+        picked = set()
+        for signature in self.signatures:
+            options = sorted(signature.ranges.items(), key=lambda item: test_frequency(*item[1]))
+            best = test_frequency(*options[0][1])
+            shared = [(index, test) for index, test in options
+                      if len(tests[test]) > 1 and test_frequency(*test) <= best * SHARED_ANCHOR_SLACK]
+            shared.sort(key=lambda item: item[1] not in picked)
+            index, test = shared[0] if shared else options[0]
+            picked.add(test)
+            chosen.append((signature, test, index))
+        return chosen
+
+    def find(self, buffer, limit=None, signatures=None):
+        """
+        {signature: match offsets} for every signature (or those in
+        signatures) in buffer; limit as for Signature.find.
+        """
+        data = as_array(buffer)
+        wanted = self.signatures if signatures is None else signatures
+        results = {signature: np.empty(0, dtype=np.int64) for signature in wanted}
+        for (low, high), members in self.anchors.items():
+            members = [(signature, index) for signature, index in members if signature in results]
+            if not members:
+                continue
+            # One pass over the buffer for every signature anchored on this test
+            last = max(index + signature.count(data, limit) for signature, index in members)
+            positions = _test(data[:max(last, 0)], low, high)
+            for signature, index in members:
+                count = signature.count(data, limit)
+                lo, hi = np.searchsorted(positions, (index, index + count))
+                if hi > lo:
+                    results[signature] = signature.narrow(data, positions[lo:hi] - index, skip=index)
+        return results
+
+def _zeros(*indexes):
+    return {i: (0, 0) for i in indexes}
+
+# memoryscan-PLAYERloc_XYabove4.py:
+# (4-180) 00 00 00 (4-180) 00 00 00 ?? ?? 00 00 ?? ?? 00 00 00 00 00 00 00 00 00 00 ?? ?? ?? ?? ?? ?? FF FF
+PLAYER = Signature('player', 32, {
+    0: (4, 180), 4: (4, 180), 30: (0xFF, 0xFF), 31: (0xFF, 0xFF),
+    **_zeros(1, 2, 3, 5, 6, 7, 10, 11, *range(14, 24))},
+    window=(0x04000000, 0x07000000))
+
+# memoryscan-MOBloc.py:
+# [00-03] 00 00 00 [01-FF] 00 00 00 [01-FF] 00 00 00 [00-03] 00 00 00 [00-03] 00 00 00 00 ... 00
+# with the 13th and 17th bytes equal
+MOB = Signature('mob', 32, {
+    0: (0, 3), 4: (1, 255), 8: (1, 255), 12: (0, 3), 16: (0, 3),
+    **_zeros(1, 2, 3, 5, 6, 7, 9, 10, 11, 13, 14, 15, 17, 18, 19, *range(20, 32))},
+    equal=[(12, 16)], window=(0x0019A000, 0x0019D000))
+
+def page_hashes(buffer, page_size=PAGE_SIZE):
+    """CRC32 of each page of buffer (the last one may be short)."""
+    view = memoryview(buffer)
+    return np.fromiter((zlib.crc32(view[i:i + page_size]) for i in range(0, len(view), page_size)),
+                       dtype=np.uint32, count=-(-len(view) // page_size))
+
+def _dirty_runs(dirty):
+    """[start, end) page index runs of consecutive True values."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], dirty.view(np.int8), [0]))))
+    return edges.reshape(-1, 2).tolist()
+
+class PageCache:
+    """
+    Page hashes and matches of the last pass over each chunk.
+
+    A repeat search of a chunk hashes its pages (CRC32 per 4 KB page) and
+    re-matches only around the pages whose hash changed; matches that lie
+    entirely on unchanged pages are reused. A mostly idle client is then
+    rescanned at about memory-read speed instead of match speed.
+    """
+
+    def __init__(self, page_size=PAGE_SIZE):
+        self.page_size = page_size
+        self.pages = 0
+        self.changed_pages = 0
+        self._entries = {}  # key -> (hashes, limit, {signature: offsets})
+
+    def find(self, signature_set, key, buffer, limit=None, signatures=None):
+        """
+        signature_set.find(buffer, limit, signatures), reusing the matches
+        from the last call with the same key where pages are unchanged.
+        """
+        data = as_array(buffer)
+        wanted = signature_set.signatures if signatures is None else list(signatures)
+        key = (key, len(data), frozenset(wanted))
+        hashes = page_hashes(buffer, self.page_size)
+        self.pages += len(hashes)
+
+        entry = self._entries.get(key)
+        if entry is None or entry[1] != limit:
+            self.changed_pages += len(hashes)
+            matches = signature_set.find(data, limit, wanted)
+            self._entries[key] = (hashes, limit, matches)
+            return matches
+
+        old_hashes, _, old_matches = entry
+        dirty = hashes != old_hashes
+        changed = int(dirty.sum())
+        self.changed_pages += changed
+        if not changed:
+            return old_matches
+
+        page = self.page_size
+        overhang = max(signature.size for signature in wanted) - 1
+        matches = {}
+        for signature, offsets in old_matches.items():
+            # Keep matches whose first and last byte are on unchanged pages
+            keep = ~dirty[offsets // page] & ~dirty[(offsets + signature.size - 1) // page]
+            matches[signature] = [offsets[keep]]
+        for first, last in _dirty_runs(dirty):
+            # Matches starting up to one record before the run can reach into it
+            low = max(0, first * page - overhang)
+            high = last * page if limit is None else min(last * page, limit)
+            if high <= low:
+                continue
+            found = signature_set.find(data[low:min(len(data), high + overhang)], high - low, wanted)
+            for signature, offsets in found.items():
+                matches[signature].append(offsets + low)
+        matches = {signature: np.unique(np.concatenate(parts)) for signature, parts in matches.items()}
+        self._entries[key] = (hashes, limit, matches)
+        return matches
+
+    def summary(self):
+        if not self.pages:
+            return "no pages hashed"
+        return (f"{self.changed_pages}/{self.pages} pages re-matched "
+                f"({1 - self.changed_pages / self.pages:.0%} reused)")
+
+def scan_regions(pm, regions, searches, scan_number, chunk_size=CHUNK_SIZE, cache=None):
+    """
+    One pass over regions for several searches at once.
+
+    searches is a list of (signature, store, start, end). Each chunk is read
+    once and searched for every signature whose [start, end) overlaps it;
+    matches go into that search's ScanStore under scan_number. Pass the same
+    PageCache to every pass to skip unchanged pages on repeat passes.
+    """
+    if not searches:
+        return
+    overhang = max(signature.size for signature, _, _, _ in searches) - 1
+    signature_set = SignatureSet(dict.fromkeys(signature for signature, _, _, _ in searches))
+    for region in regions:
+        region_end = region.start + region.size
+        active = [search for search in searches if search[2] < region_end and search[3] > region.start]
+        if not active:
+            continue
+        low = max(region.start, min(search[2] for search in active))
+        high = min(region_end, max(search[3] for search in active))
+        for chunk_start in range(low, high, chunk_size):
+            chunk_end = min(chunk_start + chunk_size, high)
+            wanted = [search for search in active if search[2] < chunk_end and search[3] > chunk_start]
+            if not wanted:
+                continue
+            # Overlap by one record so matches across chunk boundaries are found
+            try:
+                data = pm.read_bytes(chunk_start, min(chunk_end + overhang, region_end) - chunk_start)
+            except Exception:
+                continue
+            signatures = {search[0] for search in wanted}
+            if cache is not None:
+                matches = cache.find(signature_set, chunk_start, data, chunk_end - chunk_start, signatures)
+            else:
+                matches = signature_set.find(data, chunk_end - chunk_start, signatures)
+            for signature, store, start, end in wanted:
+                offsets = matches[signature]
+                addresses = chunk_start + offsets
+                keep = (addresses >= start) & (addresses < end)
+                if keep.any():
+                    store.add(scan_number, addresses[keep], records_at(data, offsets[keep], signature.size))
+
+def stable_addresses(store, passes):
+    """Player records matched in every pass with the same x and y (first and fifth byte)."""
+    addresses, scan_counts = store.scan_counts()
+    _, x_values = store.distinct_values(0)
+    _, y_values = store.distinct_values(4)
+    return addresses[(scan_counts == passes) & (x_values == 1) & (y_values == 1)].tolist()
+
+def varied_addresses(store, min_values, min_scans=1):
+    """
+    Mob records seen in at least min_scans passes whose face, y and x
+    (first, fifth and ninth byte) took at least min_values distinct values
+    between them.
+    """
+    addresses, scan_counts = store.scan_counts()
+    _, faces = store.distinct_values(0)
+    _, ys = store.distinct_values(4)
+    _, xs = store.distinct_values(8)
+    return addresses[(scan_counts >= min_scans) & (faces + ys + xs >= min_values)].tolist()
+
+class ChangeSampler:
+    """
+    High-rate sampling of a small window (e.g. the 12 KB mob window).
+
+    The window is re-read every few milliseconds; a match is added to the
+    store only when its bytes differ from the last ones recorded for that
+    address, so the store's scan count per address is the number of distinct
+    states seen. samples counts the reads where anything in the window changed.
+    """
+
+    def __init__(self, signature, start=None, end=None, store=None):
+        self.signature = signature
+        self.start, self.end = signature.window if start is None else (start, end)
+        self.store = store if store is not None else ScanStore(signature.size)
+        self.reads = 0
+        self.samples = 0
+        self.matched = {}  # address -> changed samples it matched in
+        self._previous = None
+        self._last = {}
+
+    def sample(self, pm):
+        """Read the window once. Returns True if it changed since the last read."""
+        data = pm.read_bytes(self.start, self.end - self.start)
+        self.reads += 1
+        if data == self._previous:
+            return False
+        self._previous = data
+        self.samples += 1
+
+        offsets = self.signature.find(data)
+        changed = []
+        for offset in offsets.tolist():
+            address = self.start + offset
+            record = data[offset:offset + self.signature.size]
+            self.matched[address] = self.matched.get(address, 0) + 1
+            if self._last.get(address) != record:
+                self._last[address] = record
+                changed.append(offset)
+        if changed:
+            self.store.add(self.samples, [self.start + offset for offset in changed],
+                           records_at(data, changed, self.signature.size))
+        return True
+
+    def run(self, pm, done, timeout, interval=SAMPLE_INTERVAL, stop_event=None):
+        """
+        Sample until done(sampler) returns something truthy (returned), the
+        timeout passes or stop_event is set (None).
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline and (stop_event is None or not stop_event.is_set()):
+            if self.sample(pm):
+                result = done(self)
+                if result:
+                    return result
+            time.sleep(interval)
+        return None
+
+    def confidence(self, address):
+        """Share of the window changes in which address held the signature."""
+        return self.matched.get(address, 0) / self.samples if self.samples else 0.0
@@ -0,0 +1,434 @@
+import os
+import sys
+import time
+import heapq
+import random
+import struct
+import importlib.util
+import contextlib
+
+import eotiming
+
+# Headless model of the parts of the Endless Online client the bot touches.
+# It exposes the same memory layout the scanners find (mob update record,
+# spawn record, hit/kill bytes, player x/y) through read_int/read_bytes, and
+# accepts key down/up events, so the real bot loop can run against it on any
+# OS with a virtual clock. It also keeps an NPC table (one entry per live
+# mob, see NPC_TABLE_LAYOUT) for the bulk-read tracker.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Default addresses (any values work, the bot is reconfigured to match)
+DEFAULT_MOB_BASE_ADDR = 0x0019B500
+DEFAULT_CHAR_X_ADDR = 0x04F04BBC
+DEFAULT_NPC_TABLE_ADDR = 0x05A10000
+
+# NPC table entry: id, face, x, y, hp
+NPC_TABLE_STRIDE = 0x18
+NPC_TABLE_SLOTS = 64
+NPC_TABLE_FIELDS = {'id': 0x0, 'face': 0x4, 'x': 0x8, 'y': 0xC, 'hp': 0x10}
+
+# Key codes the bot sends
+VK_UP, VK_LEFT, VK_DOWN, VK_RIGHT, VK_CTRL = 0x68, 0x64, 0x62, 0x66, 0x11
+VK_DIRECTIONS = {VK_DOWN: 0, VK_LEFT: 1, VK_UP: 2, VK_RIGHT: 3}
+FACE_OFFSETS = {0: (0, 1), 1: (-1, 0), 2: (0, -1), 3: (1, 0)}  # down, left, up, right
+
+DEFAULT_PARAMS = {
+    'width': 30,
+    'height': 30,
+    'num_mobs': 6,
+    'mob_hp': 3,
+    'damage': 1,
+    'mob_move_min': 1.0,       # seconds between mob steps
+    'mob_move_max': 4.0,
+    'respawn_delay': 10.0,
+    'spawn_spacing': 0.3,      # stagger between initial spawns
+    'move_threshold': 0.025,   # hold needed before the player steps
+    'step_interval': 0.45,     # server walk rate (held key or separate presses)
+    'attack_threshold': 0.04,  # hold needed before ctrl swings
+    'attack_interval': 0.5,    # server attack cadence
+    'indicator_clear': 1.0,    # how long hit/kill bytes stay set
+    'read_latency': 0.00002,   # simulated cost of one memory read
+}
+
+def load_script(filename, module_name=None):
+    """
+    Load one of the repo's scripts (e.g. 'memoryscan-MOBloc.py') as a fresh module.
+
+    The scripts have dashes in their names, so they can't be imported normally.
+    Every call returns a new module object with its own globals.
+    """
+    path = os.path.join(SCRIPT_DIR, filename)
+    if module_name is None:
+        module_name = os.path.splitext(filename)[0].replace('-', '_')
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@contextlib.contextmanager
+def quiet():
+    """Silence print() output (the bot and scanners are chatty)."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+class VirtualClock:
+    """
+    Stand-in for the time module: sleep() advances simulated time instantly.
+
+    on_advance(target) is called so the world can process everything that
+    happens up to the new time before sleep() returns.
+    """
+
+    def __init__(self, start=1000.0, on_advance=None):
+        self.now = start
+        self.on_advance = on_advance
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.advance(max(0.0, seconds))
+
+    def advance(self, seconds):
+        target = self.now + seconds
+        if self.on_advance is not None:
+            self.on_advance(target)
+        self.now = target
+
+class BufferMemory:
+    """Process-like object backed by a flat buffer starting at base_addr."""
+
+    def __init__(self, base_addr, data):
+        self.base_addr = base_addr
+        self.data = bytes(data)
+
+    def read_bytes(self, address, size):
+        offset = address - self.base_addr
+        if offset < 0 or offset + size > len(self.data):
+            raise MemoryError(f"Could not read memory at: {address}, length: {size}")
+        return self.data[offset:offset + size]
+
+    def read_int(self, address):
+        return struct.unpack('<i', self.read_bytes(address, 4))[0]
+
+class SimulatedGame:
+    """
+    Grid world with wandering, respawning mobs and one player.
+
+    Implements the subset of the pymem.Pymem interface the bot uses
+    (read_int, read_bytes, plus eolinux's read_many) and the eoinput interface (key_down, key_up, hold).
+    """
+
+    def __init__(self, seed=0, params=None, mob_base_addr=DEFAULT_MOB_BASE_ADDR,
+                 char_x_addr=DEFAULT_CHAR_X_ADDR, npc_table_addr=DEFAULT_NPC_TABLE_ADDR, clock=None):
+        self.params = dict(DEFAULT_PARAMS)
+        if params:
+            self.params.update(params)
+        self.rng = random.Random(seed)
+        self.clock = clock or VirtualClock()
+        self.clock.on_advance = self.advance_to
+        # Holds are timed like the real input backends, on the virtual clock
+        self.timer = eotiming.PreciseTimer(self.clock)
+        self.start_time = self.clock.now
+
+        self.mob_base_addr = mob_base_addr
+        self.char_x_addr = char_x_addr
+        self.npc_table_addr = npc_table_addr
+        self.memory = {}
+        # Bytes of the NPC table too, so bulk reads of it are one slice
+        self.npc_table_data = bytearray(NPC_TABLE_SLOTS * NPC_TABLE_STRIDE)
+
+        self.player_x = self.params['width'] // 2
+        self.player_y = self.params['height'] // 2
+        self.player_face = 0
+        self.mobs = {}
+        self.next_npc_index = 1
+        self.kill_counter = 0
+        self.held_keys = {}
+        self.last_attack_time = float('-inf')
+        self.last_step_time = float('-inf')
+
+        self._events = []
+        self._event_seq = 0
+
+        self.stats = {'kills': 0, 'attacks': 0, 'hits': 0, 'steps': 0,
+                      'blocked_steps': 0, 'key_presses': 0, 'reads': 0}
+
+        self._write_player()
+        for i in range(self.params['num_mobs']):
+            self._schedule(self.clock.now + i * self.params['spawn_spacing'], 'spawn', None)
+
+    # Scheduling
+
+    def _schedule(self, when, kind, payload):
+        self._event_seq += 1
+        heapq.heappush(self._events, (when, self._event_seq, kind, payload))
+
+    def advance_to(self, target):
+        """Process mob events and held keys up to `target`."""
+        while True:
+            next_time = self._events[0][0] if self._events else float('inf')
+            next_key = None
+            for vk, when in self.held_keys.items():
+                if when < next_time:
+                    next_time, next_key = when, vk
+            if next_time > target:
+                break
+
+            self.clock.now = max(self.clock.now, next_time)
+            if next_key is not None:
+                self._held_key_action(next_key)
+            else:
+                _, _, kind, payload = heapq.heappop(self._events)
+                getattr(self, '_on_' + kind)(payload)
+
+    @property
+    def elapsed(self):
+        return self.clock.now - self.start_time
+
+    # Memory
+
+    def _write(self, address, value):
+        self.memory[address] = value
+
+    def _write_player(self):
+        self._write(self.char_x_addr, self.player_x)
+        self._write(self.char_x_addr + 0x4, self.player_y)
+
+    def _write_npc(self, mob):
+        entry = self.npc_table_addr + mob['slot'] * NPC_TABLE_STRIDE
+        for field, offset in NPC_TABLE_FIELDS.items():
+            self._write(entry + offset, mob[field])
+            struct.pack_into('<i', self.npc_table_data, entry + offset - self.npc_table_addr, mob[field])
+
+    def _clear_npc(self, slot):
+        entry = self.npc_table_addr + slot * NPC_TABLE_STRIDE
+        for offset in NPC_TABLE_FIELDS.values():
+            self._write(entry + offset, 0)
+            struct.pack_into('<i', self.npc_table_data, entry + offset - self.npc_table_addr, 0)
+
+    def read_int(self, address):
+        self.stats['reads'] += 1
+        self.clock.advance(self.params['read_latency'])
+        return self.memory.get(address, 0)
+
+    def read_bytes(self, address, size):
+        self.stats['reads'] += 1
+        self.clock.advance(self.params['read_latency'])
+        return self._read(address, size)
+
+    def read_many(self, spans):
+        # One call for all blocks, like eolinux.LinuxProcess.read_many
+        self.stats['reads'] += 1
+        self.clock.advance(self.params['read_latency'])
+        return [self._read(address, size) for address, size in spans]
+
+    def _read(self, address, size):
+        table_offset = address - self.npc_table_addr
+        if 0 <= table_offset and table_offset + size <= len(self.npc_table_data):
+            return bytes(self.npc_table_data[table_offset:table_offset + size])
+        start = address - (address % 4)
+        memory = self.memory
+        words = [memory.get(word_addr, 0) for word_addr in range(start, address + size, 4)]
+        out = struct.pack(f'<{len(words)}i', *words)
+        offset = address - start
+        return out[offset:offset + size]
+
+    # World
+
+    def _occupied(self, x, y):
+        if not (0 <= x < self.params['width'] and 0 <= y < self.params['height']):
+            return True
+        if x == self.player_x and y == self.player_y:
+            return True
+        return any(m['x'] == x and m['y'] == y for m in self.mobs.values())
+
+    def _random_free_tile(self):
+        while True:
+            x = self.rng.randrange(self.params['width'])
+            y = self.rng.randrange(self.params['height'])
+            if not self._occupied(x, y):
+                return x, y
+
+    def _on_spawn(self, _payload):
+        npc_index = self.next_npc_index
+        self.next_npc_index = self.next_npc_index % 255 + 1
+        x, y = self._random_free_tile()
+        face = self.rng.randrange(4)
+        taken = {m['slot'] for m in self.mobs.values()}
+        slot = next(i for i in range(NPC_TABLE_SLOTS) if i not in taken)
+        mob = self.mobs[npc_index] = {'id': npc_index, 'slot': slot, 'x': x, 'y': y,
+                                      'face': face, 'hp': self.params['mob_hp']}
+        self._write_npc(mob)
+
+        base = self.mob_base_addr
+        self._write(base - 0x14, face)
+        self._write(base - 0x10, y)
+        self._write(base - 0xC, x)
+        self._schedule_mob_move(npc_index)
+
+    def _schedule_mob_move(self, npc_index):
+        delay = self.rng.uniform(self.params['mob_move_min'], self.params['mob_move_max'])
+        self._schedule(self.clock.now + delay, 'mob_move', npc_index)
+
+    def _on_mob_move(self, npc_index):
+        mob = self.mobs.get(npc_index)
+        if mob is None:
+            return
+        face = self.rng.randrange(4)
+        dx, dy = FACE_OFFSETS[face]
+        if not self._occupied(mob['x'] + dx, mob['y'] + dy):
+            mob['x'] += dx
+            mob['y'] += dy
+            mob['face'] = face
+            self._write_npc(mob)
+            base = self.mob_base_addr
+            self._write(base, face)
+            self._write(base + 0x4, mob['y'])
+            self._write(base + 0x8, mob['x'])
+        self._schedule_mob_move(npc_index)
+
+    def _on_clear(self, address):
+        self._write(address, 0)
+
+    # Input
+
+    def key_up(self, vk_code):
+        self.held_keys.pop(vk_code, None)
+
+    def hold(self, vk_code, duration):
+        self.key_down(vk_code)
+        self.timer.wait(duration)
+        self.key_up(vk_code)
+
+    def key_down(self, vk_code):
+        """Apply a key press the way the client would receive it."""
+        now = self.clock.now
+        if vk_code in self.held_keys:
+            return
+
+        self.stats['key_presses'] += 1
+        if vk_code == VK_CTRL:
+            first_swing = max(now + self.params['attack_threshold'],
+                              self.last_attack_time + self.params['attack_interval'])
+            self.held_keys[vk_code] = first_swing
+        elif vk_code in VK_DIRECTIONS:
+            self.player_face = VK_DIRECTIONS[vk_code]
+            # A press during the previous step's walk is only taken once it ends
+            self.held_keys[vk_code] = max(now + self.params['move_threshold'],
+                                          self.last_step_time + self.params['step_interval'])
+
+    def _held_key_action(self, vk_code):
+        if vk_code == VK_CTRL:
+            self._attack()
+            self.held_keys[vk_code] = self.clock.now + self.params['attack_interval']
+        else:
+            self._step(VK_DIRECTIONS[vk_code])
+            self.held_keys[vk_code] = self.clock.now + self.params['step_interval']
+
+    def _step(self, face):
+        self.player_face = face
+        dx, dy = FACE_OFFSETS[face]
+        if self._occupied(self.player_x + dx, self.player_y + dy):
+            self.stats['blocked_steps'] += 1
+            return
+        self.player_x += dx
+        self.player_y += dy
+        self.last_step_time = self.clock.now
+        self.stats['steps'] += 1
+        self._write_player()
+
+    def _attack(self):
+        self.last_attack_time = self.clock.now
+        self.stats['attacks'] += 1
+
+        dx, dy = FACE_OFFSETS[self.player_face]
+        tx, ty = self.player_x + dx, self.player_y + dy
+        target = None
+        for npc_index, mob in self.mobs.items():
+            if mob['x'] == tx and mob['y'] == ty:
+                target = npc_index
+                break
+        if target is None:
+            return
+
+        base = self.mob_base_addr
+        clear_at = self.clock.now + self.params['indicator_clear']
+        self.stats['hits'] += 1
+        self._write(base + 0x98, target)
+        self._schedule(clear_at, 'clear', base + 0x98)
+
+        mob = self.mobs[target]
+        mob['hp'] -= self.params['damage']
+        self._write_npc(mob)
+        if mob['hp'] <= 0:
+            del self.mobs[target]
+            self._clear_npc(mob['slot'])
+            self.stats['kills'] += 1
+            self.kill_counter = self.kill_counter % 255 + 1
+            self._write(base + 0x9C, self.kill_counter)
+            self._schedule(clear_at, 'clear', base + 0x9C)
+            self._schedule(self.clock.now + self.params['respawn_delay'], 'spawn', None)
+
+    def summary(self):
+        """Session statistics including kills per simulated hour."""
+        elapsed = self.elapsed
+        result = dict(self.stats)
+        result['sim_seconds'] = elapsed
+        result['kills_per_hour'] = self.stats['kills'] / elapsed * 3600 if elapsed > 0 else 0.0
+        return result
+
+def npc_table_layout(game):
+    """The layout eonpcscan.py would find for the game's NPC table."""
+    import eonpctable
+    fields = NPC_TABLE_FIELDS
+    return eonpctable.NpcTableLayout(game.npc_table_addr, NPC_TABLE_STRIDE, NPC_TABLE_SLOTS,
+                                     fields['x'], fields['y'], id_offset=fields['id'],
+                                     hp_offset=fields['hp'], face_offset=fields['face'])
+
+def attach_bot(bot, game, name=None, npc_table=False):
+    """
+    Run a freshly loaded bot module on the game's clock; returns a BotClient for it.
+
+    With npc_table the bot tracks mobs through the NPC table instead of the
+    "last moved mob" record.
+    """
+    bot.time = game.clock
+    addrs = bot.Addresses(game.mob_base_addr, game.char_x_addr)
+    layout = npc_table_layout(game) if npc_table else None
+    return bot.BotClient(game, addrs, game, name=name, npc_table=layout)
+
+def run_bot_session(duration=3600.0, seed=0, params=None, bot_settings=None, verbose=False,
+                    npc_table=False):
+    """
+    Run eobot032025.run_bot against a SimulatedGame for `duration` simulated seconds.
+
+    bot_settings overrides module-level constants of the bot (e.g. FACING_DURATION).
+    Returns the game summary plus the real time the session took.
+    """
+    started = time.perf_counter()
+    with quiet():
+        bot = load_script('eobot032025.py', 'eobot_sim')
+    game = SimulatedGame(seed=seed, params=params)
+    for name, value in (bot_settings or {}).items():
+        setattr(bot, name, value)
+    client = attach_bot(bot, game, npc_table=npc_table)
+
+    if verbose:
+        bot.run_bot(client, duration)
+    else:
+        with quiet():
+            bot.run_bot(client, duration)
+
+    result = game.summary()
+    result['real_seconds'] = time.perf_counter() - started
+    return result
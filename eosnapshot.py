@@ -0,0 +1,376 @@
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import argparse
+
+import numpy as np
+
+import eomemory
+
+# Memory snapshots and snapshot diffing.
+# A snapshot is a compressed dump of selected regions. Opening it unpacks it
+# once into a .raw file next to it that is memory-mapped, so later runs (and
+# big dumps) cost no decompression and little RAM. Snapshot objects also work
+# as offline process stand-ins for eomemory (regions/modules/read_bytes).
+#
+# Diffing narrows candidate addresses across a series of snapshots:
+#   python eosnapshot.py diff a.eosnap b.eosnap c.eosnap --step increased --step decreased
+# keeps addresses whose value went up from a to b, then down from b to c.
+
+MAGIC = b'EOSNAP1\n'
+TRAILER = struct.Struct('<Q8s')
+CHUNK_SIZE = 4 * 1024 * 1024
+COMPRESS_LEVEL = 1
+
+TYPES = {'i8': '<i1', 'i16': '<i2', 'i32': '<i4', 'u8': '<u1', 'u16': '<u2', 'u32': '<u4'}
+STEPS = ('changed', 'unchanged', 'increased', 'decreased', 'any')
+
+class Snapshot:
+    """A saved snapshot, memory-mapped."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            f.seek(-TRAILER.size, os.SEEK_END)
+            index_offset, magic = TRAILER.unpack(f.read(TRAILER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a snapshot")
+            f.seek(index_offset)
+            self.info = json.loads(f.read(os.path.getsize(path) - TRAILER.size - index_offset))
+
+        self._regions = [eomemory.Region(r['start'], r['size'], r['protect']) for r in self.info['regions']]
+        self._raw_offsets = [r['raw_offset'] for r in self.info['regions']]
+        self._starts = np.array([r.start for r in self._regions], dtype=np.int64)
+        self.data = self._map_raw()
+
+    @property
+    def raw_path(self):
+        return self.path + '.raw'
+
+    def _map_raw(self):
+        total = sum(r.size for r in self._regions)
+        if total == 0:
+            return np.zeros(0, dtype=np.uint8)
+        raw = self.raw_path
+        if (not os.path.exists(raw) or os.path.getsize(raw) != total
+                or os.path.getmtime(raw) < os.path.getmtime(self.path)):
+            self._unpack(raw)
+        return np.memmap(raw, dtype=np.uint8, mode='r')
+
+    def _unpack(self, raw):
+        tmp = raw + '.tmp'
+        with open(self.path, 'rb') as src, open(tmp, 'wb') as dst:
+            for entry in self.info['regions']:
+                src.seek(entry['file_offset'])
+                remaining = entry['compressed_size']
+                decompressor = zlib.decompressobj()
+                while remaining:
+                    block = src.read(min(CHUNK_SIZE, remaining))
+                    remaining -= len(block)
+                    dst.write(decompressor.decompress(block))
+                dst.write(decompressor.flush())
+        os.replace(tmp, raw)
+
+    # Process-like interface (see eomemory)
+
+    def regions(self):
+        return list(self._regions)
+
+    def modules(self):
+        return [eomemory.Module(m['name'], m['base'], m['size']) for m in self.info.get('modules', [])]
+
+    def region_data(self, start, size):
+        """uint8 view of [start, start + size), which must lie inside one region."""
+        i = int(np.searchsorted(self._starts, start, side='right')) - 1
+        if i < 0 or start + size > self._regions[i].start + self._regions[i].size:
+            raise MemoryError(f"0x{start:08X}+{size} is not in the snapshot")
+        offset = self._raw_offsets[i] + start - self._regions[i].start
+        return self.data[offset:offset + size]
+
+    def read_bytes(self, address, size):
+        return bytes(self.region_data(address, size))
+
+    def read_int(self, address):
+        return struct.unpack('<i', self.read_bytes(address, 4))[0]
+
+def write_snapshot(path, pm, regions, modules=(), meta=None):
+    """Dump regions of a live process (zlib-compressed, unreadable chunks as zeros)."""
+    entries = []
+    raw_offset = 0
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        for region in regions:
+            compressor = zlib.compressobj(COMPRESS_LEVEL)
+            file_offset = f.tell()
+            address = region.start
+            end = region.start + region.size
+            while address < end:
+                length = min(CHUNK_SIZE, end - address)
+                try:
+                    block = pm.read_bytes(address, length)
+                except Exception:
+                    block = bytes(length)
+                f.write(compressor.compress(block))
+                address += length
+            f.write(compressor.flush())
+            entries.append({'start': region.start, 'size': region.size, 'protect': region.protect,
+                            'raw_offset': raw_offset, 'file_offset': file_offset,
+                            'compressed_size': f.tell() - file_offset})
+            raw_offset += region.size
+
+        index = dict(meta or {}, regions=entries,
+                     modules=[{'name': m.name, 'base': m.base, 'size': m.size} for m in modules])
+        index_offset = f.tell()
+        f.write(json.dumps(index).encode())
+        f.write(TRAILER.pack(index_offset, MAGIC))
+    os.replace(tmp, path)
+    return raw_offset
+
+def common_regions(snapshots):
+    """Address ranges present in every snapshot, split at region boundaries."""
+    ranges = [(r.start, r.start + r.size) for r in snapshots[0].regions()]
+    for snapshot in snapshots[1:]:
+        other = sorted((r.start, r.start + r.size) for r in snapshot.regions())
+        merged = []
+        i = j = 0
+        ranges.sort()
+        while i < len(ranges) and j < len(other):
+            lo = max(ranges[i][0], other[j][0])
+            hi = min(ranges[i][1], other[j][1])
+            if lo < hi:
+                merged.append((lo, hi))
+            if ranges[i][1] < other[j][1]:
+                i += 1
+            else:
+                j += 1
+        ranges = merged
+    return [eomemory.Region(lo, hi - lo, 0) for lo, hi in ranges]
+
+def typed_view(data, dtype, aligned=True):
+    """
+    Integer view of a uint8 array: one element per aligned slot, or (unaligned)
+    one element starting at every byte.
+    """
+    dtype = np.dtype(dtype)
+    size = dtype.itemsize
+    if aligned:
+        return data[:len(data) // size * size].view(dtype)
+    count = max(len(data) - size + 1, 0)
+    return np.ndarray((count,), dtype=dtype, buffer=data, strides=(1,))
+
+class CandidateSet:
+    """
+    Candidate addresses, kept per region as uint32 arrays of byte offsets.
+
+    A region with offsets None still has every position as a candidate; the
+    first refine() over it runs on the whole region at once.
+    """
+
+    def __init__(self, regions, dtype='<i4', aligned=True):
+        self.regions = list(regions)
+        self.dtype = np.dtype(dtype)
+        self.aligned = aligned
+        self.step = self.dtype.itemsize if aligned else 1
+        self.offsets = {region.start: None for region in self.regions}
+
+    def _positions(self, region):
+        size = self.dtype.itemsize
+        return region.size // size if self.aligned else max(region.size - size + 1, 0)
+
+    def __len__(self):
+        return sum(self._positions(r) if self.offsets[r.start] is None else len(self.offsets[r.start])
+                   for r in self.regions)
+
+    def refine(self, region_data, predicate):
+        """
+        Keep candidates for which predicate(*values) is true.
+
+        region_data(region) returns the uint8 arrays (one per source, e.g.
+        snapshot) to compare; predicate gets the matching typed values.
+        """
+        for region in self.regions:
+            offsets = self.offsets[region.start]
+            if offsets is not None and len(offsets) == 0:
+                continue
+            views = [typed_view(data, self.dtype, self.aligned) for data in region_data(region)]
+            if offsets is None:
+                index = np.flatnonzero(predicate(*views))
+            else:
+                index = offsets // self.step
+                index = index[predicate(*[view[index] for view in views])]
+            self.offsets[region.start] = (index * self.step).astype(np.uint32)
+        return len(self)
+
+    def addresses(self, limit=None):
+        """Absolute candidate addresses (the first `limit` of them)."""
+        found = []
+        for region in self.regions:
+            offsets = self.offsets[region.start]
+            if offsets is None:
+                offsets = np.arange(0, self._positions(region) * self.step, self.step)
+            found.extend((region.start + offsets[:None if limit is None else limit - len(found)]).tolist())
+            if limit is not None and len(found) >= limit:
+                break
+        return found
+
+def step_predicate(step, dtype):
+    """Comparison for one snapshot pair: a named step or a number for "changed by N"."""
+    if step == 'changed':
+        return lambda a, b: a != b
+    if step == 'unchanged':
+        return lambda a, b: a == b
+    if step == 'increased':
+        return lambda a, b: b > a
+    if step == 'decreased':
+        return lambda a, b: b < a
+    if step == 'any':
+        return None
+    delta = np.array(int(step, 0)).astype(dtype)
+    return lambda a, b: (b - a) == delta
+
+def diff_snapshots(snapshots, steps, dtype='<i4', aligned=True):
+    """
+    Filter addresses across a series of snapshots.
+
+    steps has one entry per consecutive pair (or one entry for all pairs).
+    Returns the CandidateSet left after every step.
+    """
+    if len(steps) == 1:
+        steps = steps * (len(snapshots) - 1)
+    if len(steps) != len(snapshots) - 1:
+        raise ValueError(f"{len(snapshots)} snapshots need {len(snapshots) - 1} steps, got {len(steps)}")
+
+    candidates = CandidateSet(common_regions(snapshots), dtype, aligned)
+    for i, step in enumerate(steps):
+        predicate = step_predicate(step, candidates.dtype)
+        if predicate is None:
+            continue
+        pair = snapshots[i:i + 2]
+        candidates.refine(lambda r: [s.region_data(r.start, r.size) for s in pair], predicate)
+    return candidates
+
+def select_regions(pm, ranges=None, readable=False):
+    """Writable regions (or every readable one), optionally limited to address ranges."""
+    if not ranges:
+        return eomemory.enumerate_regions(pm, writable_only=not readable)
+    regions = []
+    for start, end in ranges:
+        regions.extend(eomemory.enumerate_regions(pm, start, end, writable_only=not readable))
+    return regions
+
+def parse_range(text):
+    start, end = text.split('-')
+    return int(start, 16), int(end, 16)
+
+def snapshot_path(output, stamp, count, k):
+    """File for snapshot k of count: with several, output is numbered (FILE-1.eosnap, FILE-2.eosnap...)."""
+    if output is None:
+        return f"snap-{stamp}-{k + 1}.eosnap" if count > 1 else f"snap-{stamp}.eosnap"
+    if count == 1:
+        return output
+    root, ext = os.path.splitext(output)
+    return f"{root}-{k + 1}{ext or '.eosnap'}"
+
+def capture(args):
+    from eobot032025 import select_endless_pid
+
+    pid = select_endless_pid()
+    if pid is None:
+        return
+    pm = eomemory.open_process(pid)
+    regions = select_regions(pm, args.range, args.readable)
+    modules = eomemory.enumerate_modules(pm)
+    total = sum(r.size for r in regions)
+    print(f"{len(regions)} regions, {total / 1e6:.1f} MB per snapshot")
+
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    for k in range(args.count):
+        path = snapshot_path(args.output, stamp, args.count, k)
+        start = time.time()
+        write_snapshot(path, pm, regions, modules, {'pid': pid, 'time': time.time()})
+        print(f"Snapshot {k + 1}/{args.count}: {path} "
+              f"({os.path.getsize(path) / 1e6:.1f} MB on disk, {time.time() - start:.1f}s)")
+        if k + 1 < args.count:
+            if args.interval is None:
+                input("Press Enter for the next snapshot...")
+            else:
+                time.sleep(args.interval)
+
+def info(args):
+    for path in args.snapshots:
+        snapshot = Snapshot(path)
+        regions = snapshot.regions()
+        print(f"{path}: {len(regions)} regions, {sum(r.size for r in regions) / 1e6:.1f} MB, "
+              f"{len(snapshot.modules())} modules")
+        for region in regions[:args.show]:
+            print(f"  0x{region.start:08X} - 0x{region.start + region.size:08X}")
+
+def diff(args):
+    start = time.time()
+    snapshots = [Snapshot(path) for path in args.snapshots]
+    steps = args.step or ['changed']
+    for step in steps:
+        if step not in STEPS:
+            try:
+                int(step, 0)
+            except ValueError:
+                sys.exit(f"Unknown step '{step}' (use {', '.join(STEPS)} or a number)")
+
+    candidates = diff_snapshots(snapshots, steps, TYPES[args.type], not args.unaligned)
+    print(f"{len(candidates)} candidates ({time.time() - start:.1f}s)")
+
+    dtype = TYPES[args.type]
+    size = np.dtype(dtype).itemsize
+    shown = candidates.addresses(args.show)
+    for address in shown:
+        values = [int(np.frombuffer(s.read_bytes(address, size), dtype)[0]) for s in snapshots]
+        print(f"  0x{address:08X}: " + ' -> '.join(str(v) for v in values))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            for address in candidates.addresses():
+                f.write(f"0x{address:08X}\n")
+        print(f"Candidates written to: {args.output}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture memory snapshots and diff them")
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    capture_parser = commands.add_parser('capture', help="dump regions of the running client")
+    capture_parser.add_argument('--range', type=parse_range, action='append',
+                                help="only this address range, e.g. 04000000-07000000 (repeatable)")
+    capture_parser.add_argument('--readable', action='store_true',
+                                help="include read-only regions (default: writable only)")
+    capture_parser.add_argument('--count', type=int, default=1, help="number of snapshots to take")
+    capture_parser.add_argument('--interval', type=float,
+                                help="seconds between snapshots (default: wait for Enter)")
+    capture_parser.add_argument('--output', '-o',
+                                help="snapshot file; with --count, numbered FILE-1.eosnap, FILE-2.eosnap...")
+    capture_parser.set_defaults(func=capture)
+
+    info_parser = commands.add_parser('info', help="describe snapshots")
+    info_parser.add_argument('snapshots', nargs='+')
+    info_parser.add_argument('--show', type=int, default=10)
+    info_parser.set_defaults(func=info)
+
+    diff_parser = commands.add_parser('diff', help="filter addresses across snapshots")
+    diff_parser.add_argument('snapshots', nargs='+')
+    diff_parser.add_argument('--type', choices=sorted(TYPES), default='i32')
+    diff_parser.add_argument('--unaligned', action='store_true', help="consider every byte offset")
+    diff_parser.add_argument('--step', action='append',
+                             help="changed, unchanged, increased, decreased, any, or a number N "
+                                  "(changed by N); one per snapshot pair, or one for all pairs")
+    diff_parser.add_argument('--show', type=int, default=20)
+    diff_parser.add_argument('--output', '-o', help="write every candidate address to this file")
+    diff_parser.set_defaults(func=diff)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import time
+import threading
+
+# Live bot status over local HTTP, instead of screenshots.
+# Each bot publishes a small JSON snapshot (player tile, tracked mobs,
+# target, kills, adaptive durations, loop rate) to a StatusBoard at most a
+# few times a second, and only when something changed (plus a heartbeat).
+# serve() exposes the board on localhost (eostatushttp.py):
+#
+#   /         eostatus.html, a page drawing each client's surroundings as a grid
+#   /status   every client's latest snapshot as JSON
+#   /events   Server-Sent Events: one "status" event per snapshot change
+#
+# A client with a dozen mobs in view costs a few hundred bytes per update.
+
+DEFAULT_PORT = 8765
+
+PUBLISH_INTERVAL = 0.25  # seconds between snapshots of one client, at most
+HEARTBEAT_INTERVAL = 2.0  # a snapshot this often even when nothing changed
+
+class StatusBoard:
+    """Latest snapshot per client; readers wait for the version to move."""
+
+    def __init__(self):
+        self._snapshots = {}
+        self._versions = {}
+        self._version = 0
+        self._changed = threading.Condition()
+
+    def update(self, name, snapshot):
+        with self._changed:
+            self._version += 1
+            self._snapshots[name] = snapshot
+            self._versions[name] = self._version
+            self._changed.notify_all()
+
+    def snapshot(self):
+        with self._changed:
+            return dict(self._snapshots)
+
+    def wait(self, since, timeout):
+        """(version, {name: snapshot}) of the clients updated after version since."""
+        with self._changed:
+            self._changed.wait_for(lambda: self._version > since, timeout)
+            changed = {name: self._snapshots[name] for name, version in self._versions.items()
+                       if version > since}
+            return self._version, changed
+
+class NullStatus:
+    """Drop-in publisher that does nothing (status server off)."""
+    enabled = False
+
+    def publish(self, client, char_x, char_y, mobs, target_id):
+        pass
+
+    def close(self, client):
+        pass
+
+class StatusPublisher:
+    """
+    Builds one client's snapshots for a StatusBoard.
+
+    publish() is called once per loop iteration and is cheap when it is
+    too soon for a snapshot: it only counts the tick. clock is the bot's
+    time function (the simulator's virtual clock in eosim sessions).
+    """
+    enabled = True
+
+    def __init__(self, board, name, interval=PUBLISH_INTERVAL, clock=time.time):
+        self.board = board
+        self.name = name
+        self.interval = interval
+        self.clock = clock
+        self.started = clock()
+        self._last_check = self._last_sent = self.started
+        self._last_state = None
+        self._ticks = 0
+        self._tick_rate = 0.0
+
+    def publish(self, client, char_x, char_y, mobs, target_id):
+        self._ticks += 1
+        now = self.clock()
+        if now - self._last_check < self.interval:
+            return
+        self._tick_rate = self._ticks / (now - self._last_check)
+        self._ticks = 0
+        self._last_check = now
+
+        state = ((char_x, char_y), target_id, client.kills, client.paused.is_set(),
+                 tuple((mob_id, mob['x'], mob['y']) for mob_id, mob in mobs.items()))
+        if state == self._last_state and now - self._last_sent < HEARTBEAT_INTERVAL:
+            return
+        self._last_state = state
+        self._last_sent = now
+        self.board.update(self.name, self._snapshot(client, state, now, running=True))
+
+    def close(self, client):
+        """Final snapshot marking the client as stopped."""
+        if self._last_state is not None:
+            self.board.update(self.name, self._snapshot(client, self._last_state, self.clock(), running=False))
+
+    def _snapshot(self, client, state, now, running):
+        (char_x, char_y), target_id, kills, paused, mobs = state
+        elapsed = now - self.started
+        return {
+            'name': self.name,
+            'pid': client.pid,
+            'running': running,
+            'paused': paused,
+            'time': round(elapsed, 1),
+            'player': [char_x, char_y],
+            'target': target_id,
+            'mobs': [list(mob) for mob in mobs],
+            'kills': kills,
+            'kills_per_hour': round(kills / elapsed * 3600, 1) if elapsed > 0 else 0.0,
+            'ticks_per_second': round(self._tick_rate, 1),
+            'move_ms': {key: round(value * 1000) for key, value in client.movement_durations.items()},
+            'ctrl_ms': round(client.ctrl_duration * 1000),
+            'hold_error_ms': self._hold_error(client),
+            'tracking': 'table' if client.npc_table is not None else 'record',
+        }
+
+    @staticmethod
+    def _hold_error(client):
+        """p95 error of the key holds (eotiming), or None if the input isn't timed."""
+        timer = getattr(client.input, 'timer', None)
+        return round(timer.stats.percentile(95) * 1000, 2) if timer is not None else None
+
+def serve(board, port=DEFAULT_PORT, host='127.0.0.1'):
+    """Serve board from a background thread; returns the StatusServer (stop() it when done)."""
+    # http.server is only loaded when the status server is on
+    from eostatushttp import StatusServer
+    server = StatusServer(board, host, port)
+    threading.Thread(target=server.serve_forever, name='status-server', daemon=True).start()
+    return server
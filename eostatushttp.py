@@ -0,0 +1,80 @@
+import os
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# HTTP side of eostatus: the page, the JSON snapshot and the SSE stream.
+# Kept apart so the bot only loads http.server when --status-port is given.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGE_FILE = 'eostatus.html'
+KEEPALIVE_INTERVAL = 15.0  # SSE comment line so proxies don't drop idle streams
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/':
+            self._page()
+        elif path == '/status':
+            self._send(200, 'application/json', json.dumps(self.server.board.snapshot()).encode())
+        elif path == '/events':
+            self._events()
+        else:
+            self._send(404, 'text/plain', b'not found')
+
+    def _send(self, code, content_type, body):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _page(self):
+        try:
+            with open(os.path.join(SCRIPT_DIR, PAGE_FILE), 'rb') as f:
+                body = f.read()
+        except OSError:
+            self._send(404, 'text/plain', f"{PAGE_FILE} is missing".encode())
+            return
+        self._send(200, 'text/html; charset=utf-8', body)
+
+    def _events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        board = self.server.board
+        version = 0
+        self.close_connection = True
+        try:
+            while not self.server.stopping.is_set():
+                version, changed = board.wait(version, KEEPALIVE_INTERVAL)
+                if changed:
+                    lines = ''.join(f"event: status\ndata: {json.dumps(snapshot, separators=(',', ':'))}\n\n"
+                                    for snapshot in changed.values())
+                else:
+                    lines = ": keepalive\n\n"
+                self.wfile.write(lines.encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+class StatusServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, board, host, port):
+        super().__init__((host, port), _StatusHandler)
+        self.board = board
+        self.stopping = threading.Event()
+
+    def stop(self):
+        self.stopping.set()
+        self.shutdown()
+        self.server_close()
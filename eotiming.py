@@ -0,0 +1,126 @@
+import sys
+import time
+import atexit
+from collections import deque
+
+# Precise waits for key holds.
+# time.sleep() can overshoot by a whole timer tick (~15.6 ms on Windows
+# unless something raised the timer resolution), so a "30 ms" press lasts
+# 31 or 47 ms and the adaptive key durations tune against noise. A
+# PreciseTimer waits for a monotonic deadline instead: it sleeps for most of
+# the wait, leaving a margin learned from how late its sleeps wake up, then
+# spins the rest (yielding the GIL each round). The spin is capped at
+# MAX_SPIN per wait, so the CPU cost stays bounded; on Windows the system
+# timer is also set to 1 ms (timeBeginPeriod) while timers are in use, so
+# the sleeps themselves wake within about a millisecond.
+#
+# Each wait records how far the achieved duration was from the requested
+# one (TimingStats). clock can be anything with perf_counter() and sleep(),
+# e.g. eosim.VirtualClock.
+
+MIN_SPIN = 0.0005     # spin margin before anything is known about the sleeps
+MAX_SPIN = 0.004      # never spin longer than this per wait
+MARGIN_FACTOR = 1.5   # margin = typical oversleep times this
+OVERSLEEP_DECAY = 0.9
+STATS_WINDOW = 1000   # waits kept for the percentiles
+TIMER_PERIOD_MS = 1
+
+_timer_period_set = False
+
+def use_fine_timer():
+    """Ask Windows for a 1 ms timer tick for the rest of the process (no-op elsewhere)."""
+    global _timer_period_set
+    if _timer_period_set or sys.platform != 'win32':
+        return
+    try:
+        import ctypes
+        winmm = ctypes.windll.winmm
+        if winmm.timeBeginPeriod(TIMER_PERIOD_MS) == 0:
+            _timer_period_set = True
+            atexit.register(winmm.timeEndPeriod, TIMER_PERIOD_MS)
+    except Exception:
+        pass
+
+class TimingStats:
+    """Achieved minus requested duration of recent waits (seconds)."""
+
+    def __init__(self, window=STATS_WINDOW):
+        self.errors = deque(maxlen=window)
+        self.count = 0
+        self.spin_time = 0.0
+        self.wait_time = 0.0
+
+    def add(self, requested, achieved, spun):
+        self.errors.append(achieved - requested)
+        self.count += 1
+        self.spin_time += spun
+        self.wait_time += achieved
+
+    def percentile(self, pct):
+        """Percentile of the absolute errors in the window."""
+        if not self.errors:
+            return 0.0
+        ordered = sorted(abs(error) for error in self.errors)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def mean(self):
+        return sum(self.errors) / len(self.errors) if self.errors else 0.0
+
+    def summary(self):
+        if not self.errors:
+            return "no timed waits"
+        spin_share = self.spin_time / self.wait_time if self.wait_time > 0 else 0.0
+        return (f"{self.count} timed waits, error mean {self.mean() * 1000:+.2f}ms, "
+                f"p50 {self.percentile(50) * 1000:.2f}ms, p95 {self.percentile(95) * 1000:.2f}ms, "
+                f"max {max(abs(e) for e in self.errors) * 1000:.2f}ms, {spin_share:.0%} of the time spinning")
+
+class PreciseTimer:
+    """Sleep-then-spin waits against a monotonic deadline."""
+
+    def __init__(self, clock=time, max_spin=MAX_SPIN):
+        if clock is time:
+            use_fine_timer()
+        self.clock = clock
+        self.max_spin = max_spin
+        self.oversleep = 0.0
+        self.stats = TimingStats()
+
+    def now(self):
+        return self.clock.perf_counter()
+
+    def margin(self):
+        return min(self.max_spin, max(MIN_SPIN, self.oversleep * MARGIN_FACTOR))
+
+    def wait_until(self, deadline):
+        """Return at deadline (perf_counter time), or as soon after it as possible."""
+        clock = self.clock
+        now = clock.perf_counter()
+        coarse = deadline - now - self.margin()
+        if coarse > 0:
+            clock.sleep(coarse)
+            woke = clock.perf_counter()
+            late = max(0.0, woke - (now + coarse))
+            self.oversleep = max(late, self.oversleep * OVERSLEEP_DECAY)
+            now = woke
+
+        spin_started = now
+        while now < deadline:
+            clock.sleep(0)
+            later = clock.perf_counter()
+            if later == now:
+                # A clock that only moves when slept on (virtual clock)
+                clock.sleep(deadline - now)
+                later = clock.perf_counter()
+            now = later
+        return now - spin_started
+
+    def wait(self, duration, since=None):
+        """
+        Wait until duration after since (default now). Returns the achieved
+        duration and records its error.
+        """
+        started = self.now() if since is None else since
+        spun = self.wait_until(started + duration)
+        achieved = self.now() - started
+        self.stats.add(duration, achieved, spun)
+        return achieved
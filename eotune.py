@@ -0,0 +1,223 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import eosim
+
+# Tune the bot's constants in the simulator.
+# Every trial runs the real bot loop (eosim.run_bot_session) on the same
+# seeds, so trials differ only by their constants. Sessions run in a process
+# pool. The search is random, or Bayesian: a Gaussian process over the
+# trials so far proposes each batch by expected improvement. The best
+# trials are re-run on fresh seeds before the winner is chosen (the best of
+# many noisy scores is usually lucky). The winner goes to tuned.json, which
+# the bot loads at startup.
+#
+#   python eotune.py --trials 48 --search bayes
+#   python eotune.py --npc-table --hours 1 --seeds 4
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (low, high, integer); names must be in the bot's TUNABLE
+SPACE = {
+    'INITIAL_MOVEMENT_DURATION': (0.02, 0.05, False),  # up to MAX_MOVEMENT_DURATION
+    'MAX_CTRL_DURATION': (0.1, 0.5, False),
+    'FACING_DURATION': (0.1, 0.8, False),
+    'MOVEMENT_COOLDOWN': (0.0, 0.2, False),
+    'STUCK_TIMEOUT': (0.3, 3.0, False),
+    'INACTIVITY_TIMEOUT': (2, 15, True),
+    'TARGET_HYSTERESIS': (0, 4, True),
+}
+NAMES = list(SPACE)
+
+CONFIRM_SEED_OFFSET = 1000  # fresh seeds for re-running the best trials
+CANDIDATES = 2000           # random points scored by expected improvement per batch
+LENGTH_SCALE = 0.3          # GP kernel length scale in the unit cube
+PENALTY_RADIUS = 0.15       # keep points of one batch this far apart (unit cube)
+
+def to_params(point):
+    """Unit-cube point -> {name: value}."""
+    params = {}
+    for name, u in zip(NAMES, point):
+        low, high, integer = SPACE[name]
+        value = low + u * (high - low)
+        params[name] = int(round(value)) if integer else round(value, 4)
+    return params
+
+def to_point(params):
+    return [(params[name] - SPACE[name][0]) / (SPACE[name][1] - SPACE[name][0]) for name in NAMES]
+
+def defaults(bot):
+    return {name: getattr(bot, name) for name in NAMES}
+
+def run_session(task):
+    """One simulated session in a worker process: (params, seed, hours, npc_table) -> kills/h."""
+    params, seed, hours, npc_table = task
+    result = eosim.run_bot_session(duration=hours * 3600, seed=seed, bot_settings=params,
+                                   npc_table=npc_table)
+    return result['kills_per_hour']
+
+class Trial:
+    def __init__(self, params):
+        self.params = params
+        self.scores = []
+        self.confirmed = []
+
+    @property
+    def mean(self):
+        return statistics.mean(self.scores) if self.scores else 0.0
+
+    @property
+    def stdev(self):
+        return statistics.stdev(self.scores) if len(self.scores) > 1 else 0.0
+
+    def __repr__(self):
+        return ', '.join(f"{name}={value:g}" for name, value in self.params.items())
+
+def evaluate(pool, trials, seeds, hours, npc_table):
+    """Run every trial on every seed, all sessions spread over the pool. Returns the score lists."""
+    tasks = [(trial.params, seed, hours, npc_table) for trial in trials for seed in seeds]
+    scores = list(pool.map(run_session, tasks))
+    return [scores[i * len(seeds):(i + 1) * len(seeds)] for i in range(len(trials))]
+
+def random_points(rng, count):
+    return [[rng.random() for _ in NAMES] for _ in range(count)]
+
+def _kernel(a, b):
+    distances = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+    return np.exp(-distances / (2 * LENGTH_SCALE ** 2))
+
+def expected_improvement(points, scores, candidates):
+    """GP (RBF kernel, standardized scores) expected improvement of each candidate."""
+    x = np.array(points)
+    y = np.array(scores, dtype=float)
+    std = y.std() or 1.0
+    y = (y - y.mean()) / std
+    noise = 0.1  # sessions are noisy; don't interpolate them exactly
+    k = _kernel(x, x) + noise * np.eye(len(x))
+    k_inv = np.linalg.inv(k)
+    c = np.array(candidates)
+    k_star = _kernel(c, x)
+    mean = k_star @ k_inv @ y
+    variance = np.clip(1.0 - np.einsum('ij,jk,ik->i', k_star, k_inv, k_star), 1e-9, None)
+    sigma = np.sqrt(variance)
+    z = (mean - y.max()) / sigma
+    cdf = 0.5 * (1 + np.vectorize(math.erf)(z / np.sqrt(2)))
+    pdf = np.exp(-z ** 2 / 2) / np.sqrt(2 * np.pi)
+    return (mean - y.max()) * cdf + sigma * pdf
+
+def propose_batch(rng, trials, size):
+    """size new points with the highest expected improvement, spread apart."""
+    candidates = random_points(rng, CANDIDATES)
+    ei = expected_improvement([to_point(t.params) for t in trials], [t.mean for t in trials], candidates)
+    chosen = []
+    for index in np.argsort(-ei):
+        point = np.array(candidates[index])
+        if all(np.linalg.norm(point - other) >= PENALTY_RADIUS for other in chosen):
+            chosen.append(point)
+            if len(chosen) == size:
+                break
+    return [list(point) for point in chosen]
+
+def write_profile(path, trial, args, baseline):
+    profile = {
+        'params': trial.params,
+        'kills_per_hour': statistics.mean(trial.confirmed),
+        'stdev': statistics.stdev(trial.confirmed) if len(trial.confirmed) > 1 else 0.0,
+        'per_seed': trial.confirmed,
+        'baseline_kills_per_hour': statistics.mean(baseline.confirmed),
+        'baseline_stdev': statistics.stdev(baseline.confirmed) if len(baseline.confirmed) > 1 else 0.0,
+        'search': args.search,
+        'trials': args.trials,
+        'seeds': args.seeds,
+        'hours': args.hours,
+        'npc_table': args.npc_table,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(profile, f, indent=1)
+    os.replace(tmp, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the bot's constants against the simulator")
+    parser.add_argument('--trials', type=int, default=48, help="parameter sets to try (default 48)")
+    parser.add_argument('--search', choices=['random', 'bayes'], default='bayes')
+    parser.add_argument('--seeds', type=int, default=3, help="sessions per trial (default 3)")
+    parser.add_argument('--hours', type=float, default=0.5, help="simulated hours per session (default 0.5)")
+    parser.add_argument('--npc-table', action='store_true', help="tune the NPC-table tracking mode")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--confirm', type=int, default=3, help="best trials re-run on fresh seeds (default 3)")
+    parser.add_argument('--random-seed', type=int, default=0)
+    parser.add_argument('--output', default=os.path.join(SCRIPT_DIR, 'tuned.json'))
+    args = parser.parse_args()
+
+    with eosim.quiet():
+        bot = eosim.load_script('eobot032025.py', 'eobot_tune')
+    unknown = [name for name in NAMES if name not in bot.TUNABLE]
+    if unknown:
+        print(f"Not tunable in the bot: {', '.join(unknown)}")
+        return 1
+
+    rng = random.Random(args.random_seed)
+    seeds = list(range(args.seeds))
+    confirm_seeds = [CONFIRM_SEED_OFFSET + seed for seed in seeds]
+    batch_size = max(1, args.workers // args.seeds)
+    started = time.time()
+
+    # The built-in constants are scored with the first batch, as a reference
+    baseline = Trial(defaults(bot))
+    trials = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        pending = [baseline] + [Trial(to_params(point))
+                                for point in random_points(rng, max(batch_size, len(NAMES) + 1))]
+        while pending:
+            for trial, scores in zip(pending, evaluate(pool, pending, seeds, args.hours, args.npc_table)):
+                trial.scores = scores
+            trials += pending
+            best = max(trials, key=lambda t: t.mean)
+            print(f"{len(trials) - 1}/{args.trials} trials, best {best.mean:.1f} +- {best.stdev:.1f} kills/h "
+                  f"(defaults {baseline.mean:.1f}), {time.time() - started:.0f}s")
+
+            remaining = args.trials - (len(trials) - 1)
+            if remaining <= 0:
+                break
+            size = min(batch_size, remaining)
+            if args.search == 'bayes':
+                points = propose_batch(rng, trials, size)
+            else:
+                points = random_points(rng, size)
+            pending = [Trial(to_params(point)) for point in points]
+
+        # Re-run the best trials (and the defaults) on fresh seeds
+        finalists = sorted(trials[1:], key=lambda t: t.mean, reverse=True)[:args.confirm] + [baseline]
+        for trial, scores in zip(finalists, evaluate(pool, finalists, confirm_seeds, args.hours, args.npc_table)):
+            trial.confirmed = scores
+
+    print(f"\nConfirmation on seeds {confirm_seeds[0]}..{confirm_seeds[-1]}:")
+    for trial in finalists:
+        label = "defaults" if trial is baseline else "trial"
+        print(f"  {label:8s} {statistics.mean(trial.confirmed):7.1f} kills/h "
+              f"(search {trial.mean:.1f} +- {trial.stdev:.1f})  {trial}")
+    winner = max(finalists, key=lambda t: statistics.mean(t.confirmed))
+    if winner is baseline:
+        print("\nNo trial beat the built-in constants on fresh seeds; no profile written.")
+        return 0
+
+    write_profile(args.output, winner, args, baseline)
+    print(f"\nBest: {statistics.mean(winner.confirmed):.1f} kills/h "
+          f"(stdev {statistics.stdev(winner.confirmed) if len(winner.confirmed) > 1 else 0.0:.1f}, "
+          f"defaults {statistics.mean(baseline.confirmed):.1f})")
+    print(f"Written to: {args.output} (loaded by the bot at startup)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
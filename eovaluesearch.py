@@ -0,0 +1,195 @@
+import os
+import argparse
+
+import numpy as np
+
+import eomemory
+import eocandidates
+from eosnapshot import CandidateSet, typed_view, select_regions, parse_range, TYPES
+
+# Exact-value search.
+# The first search compares every (aligned or unaligned) int8/16/32 in the
+# selected regions with the value; later searches only re-read the pages that
+# still hold candidates. Candidates are uint32 offset arrays per region.
+#
+# Player mode looks for the tile you stand on (x, then y 4 bytes later, the
+# layout the bot reads) and puts it first in playerxy.txt once one address is
+# left, usually after two or three moves.
+
+CHUNK_SIZE = 4 * 1024 * 1024
+PAGE_SIZE = 0x1000
+
+class ValueSearch:
+    """Narrow down the addresses holding a value as it changes."""
+
+    def __init__(self, pm, regions, dtype='<i4', aligned=True):
+        self.pm = pm
+        self.candidates = CandidateSet(regions, dtype, aligned)
+        self.dtype = self.candidates.dtype
+        self.searches = 0
+
+    def _target(self, value):
+        info = np.iinfo(self.dtype)
+        if not info.min <= value <= info.max:
+            raise ValueError(f"{value} does not fit in {self.dtype}")
+        return self.dtype.type(value)
+
+    def _check(self, value, extra):
+        """(target, [(element step, target)]) for a value plus (byte offset, value) extras."""
+        checks = []
+        for offset, extra_value in extra:
+            if offset <= 0 or offset % self.candidates.step:
+                raise ValueError(f"extra offset {offset} must be a positive multiple of {self.candidates.step}")
+            checks.append((offset // self.candidates.step, self._target(extra_value)))
+        return self._target(value), checks
+
+    def search(self, value, extra=()):
+        """
+        Keep addresses equal to value (and, for each (offset, v) in extra, with
+        v at address + offset). Returns the number of candidates left.
+        """
+        target, checks = self._check(value, extra)
+        reach = max([offset for offset, _ in extra], default=0)
+        for region in self.candidates.regions:
+            offsets = self.candidates.offsets[region.start]
+            if offsets is None:
+                offsets = self._scan(region, target, checks)
+            elif len(offsets):
+                offsets = self._narrow(region, offsets, target, checks, reach)
+            self.candidates.offsets[region.start] = offsets
+        self.searches += 1
+        return len(self.candidates)
+
+    def _scan(self, region, target, checks):
+        """First search: compare every position in the region, chunk by chunk."""
+        size = self.dtype.itemsize
+        step = self.candidates.step
+        overhang = size - 1 + max([k * step for k, _ in checks], default=0)
+        found = []
+        for chunk_start in range(0, region.size, CHUNK_SIZE):
+            length = min(CHUNK_SIZE + overhang, region.size - chunk_start)
+            try:
+                data = np.frombuffer(self.pm.read_bytes(region.start + chunk_start, length), dtype=np.uint8)
+            except Exception:
+                continue
+            view = typed_view(data, self.dtype, self.candidates.aligned)
+            # Only positions that start inside this chunk
+            count = min(len(view), CHUNK_SIZE // step)
+            mask = view[:count] == target
+            for k, extra_target in checks:
+                shifted = np.zeros(count, dtype=bool)
+                limit = max(min(count, len(view) - k), 0)
+                shifted[:limit] = view[k:k + limit] == extra_target
+                mask &= shifted
+            found.append((chunk_start + np.flatnonzero(mask) * step).astype(np.uint32))
+        return np.concatenate(found) if found else np.empty(0, dtype=np.uint32)
+
+    def _narrow(self, region, offsets, target, checks, reach):
+        """Later searches: read only runs of pages that hold candidates."""
+        size = self.dtype.itemsize
+        step = self.candidates.step
+        keep = np.zeros(len(offsets), dtype=bool)
+        pages = offsets // PAGE_SIZE
+        bounds = np.flatnonzero(np.diff(pages) > 1) + 1
+        for run in np.split(np.arange(len(offsets)), bounds):
+            # Candidates on consecutive pages, read in one call
+            run_offsets = offsets[run].astype(np.int64)
+            start = int(pages[run[0]]) * PAGE_SIZE
+            end = min(int(run_offsets[-1]) + size + reach, region.size)
+            try:
+                data = np.frombuffer(self.pm.read_bytes(region.start + start, end - start), dtype=np.uint8)
+            except Exception:
+                continue
+            view = typed_view(data, self.dtype, self.candidates.aligned)
+            index = (run_offsets - start) // step
+            ok = view[index] == target
+            for k, extra_target in checks:
+                inside = index + k < len(view)
+                ok &= inside & (view[np.minimum(index + k, len(view) - 1)] == extra_target)
+            keep[run] = ok
+        return offsets[keep]
+
+    def addresses(self, limit=None):
+        return self.candidates.addresses(limit)
+
+def write_player_address(address):
+    """Put address first in playerxy.txt (atomically), keeping the other candidates listed."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    filename = os.path.join(script_dir, "playerxy.txt")
+    eocandidates.promote(filename, address)
+    print(f"Address written to: {filename}")
+
+def ask_values(prompt, count):
+    """Read `count` integers from the user (None to stop)."""
+    while True:
+        text = input(prompt).strip()
+        if not text:
+            return None
+        parts = text.replace(',', ' ').split()
+        try:
+            values = [int(part, 0) for part in parts]
+        except ValueError:
+            values = []
+        if len(values) == count:
+            return values
+        print(f"Enter {count} number(s).")
+
+def open_target(args):
+    """The running client, or a saved snapshot with --snapshot."""
+    if args.snapshot:
+        from eosnapshot import Snapshot
+        return Snapshot(args.snapshot)
+    from eobot032025 import select_endless_pid
+    pid = select_endless_pid()
+    return eomemory.open_process(pid) if pid is not None else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Find addresses by their current value")
+    parser.add_argument('mode', nargs='?', choices=['value', 'player'], default='value',
+                        help="value: any number you can watch; player: your x/y tile (writes playerxy.txt)")
+    parser.add_argument('--type', choices=sorted(TYPES), default='i32')
+    parser.add_argument('--unaligned', action='store_true', help="consider every byte offset")
+    parser.add_argument('--range', type=parse_range, action='append',
+                        help="only this address range, e.g. 04000000-07000000 (repeatable)")
+    parser.add_argument('--readable', action='store_true', help="include read-only regions")
+    parser.add_argument('--snapshot', help="search a saved .eosnap instead of the client")
+    parser.add_argument('--show', type=int, default=10)
+    args = parser.parse_args()
+
+    pm = open_target(args)
+    if pm is None:
+        return
+    regions = select_regions(pm, args.range, args.readable)
+    dtype = '<i4' if args.mode == 'player' else TYPES[args.type]
+    search = ValueSearch(pm, regions, dtype, aligned=not args.unaligned)
+    print(f"Searching {sum(r.size for r in regions) / 1e6:.1f} MB in {len(regions)} regions")
+
+    while True:
+        if args.mode == 'player':
+            values = ask_values("Your x y (empty to stop): ", 2)
+        else:
+            values = ask_values("Current value (empty to stop): ", 1)
+        if values is None:
+            break
+
+        extra = [(4, values[1])] if args.mode == 'player' else []
+        try:
+            left = search.search(values[0], extra)
+        except ValueError as e:
+            print(e)
+            continue
+        print(f"{left} candidates")
+        for address in search.addresses(args.show):
+            print(f"  0x{address:08X}")
+
+        if left == 1 and args.mode == 'player':
+            write_player_address(search.addresses(1)[0])
+            break
+        if left == 0:
+            print("Nothing left; start over (the value may have changed mid-search).")
+            break
+        if args.mode == 'player':
+            print("Take a step and enter the new position.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+import time
+import threading
+
+import eomemory
+
+# Address watchdog.
+# If the client reallocates the player structure, the configured address
+# silently points at garbage. The watchdog re-checks the configured
+# addresses every few seconds with the bot's own plausibility test (the
+# player on a map tile, 0..255 and not (0, 0); see plausible_candidates in
+# eobot032025.py), not the scanners' discovery signatures: those only
+# cover x/y 4..180, and a player standing on tile 2 is not lost. When an
+# address fails it pauses the bot and rescans from its own thread: the
+# scanners' other ranked candidates first (one read, see eocandidates.py),
+# then pointer chains and address files, then the memory around the old
+# address, then the scanner's whole window. The memory rescans use the
+# discovery signatures, the player's first with x/y pinned to the tile it
+# was last seen on (the bot is paused, so it is still there). The new addresses
+# are handed to the running loop through BotClient.relocate(). The bot calls
+# alert() when it reads an implausible position, so that doesn't wait for
+# the next check.
+#
+# eosignatures (and with it numpy) is imported by the methods that need it;
+# the watchdog thread loads it when it starts, off the bot's startup path.
+
+CHECK_INTERVAL = 3.0
+CONFIRM_DELAY = 0.3       # a failed check is repeated once before pausing
+RETRY_DELAY = 2.0         # between rescans that found nothing
+NEARBY_RANGE = 0x200000   # region-limited rescan: +-2 MB around the old address
+
+# Player: matched in every pass with the same x/y (as memoryscan-PLAYERloc_XYabove4.py)
+PLAYER_PASSES = 2
+PLAYER_PASS_DELAY = 0.5
+
+# Mob: the record changes as mobs move; enough distinct face/x/y values
+# across the samples (as memoryscan-MOBloc.py)
+MOB_SAMPLES = 4
+MOB_SAMPLE_DELAY = 0.75
+MOB_MIN_VALUES = 4
+
+def readable(pm, target, addresses):
+    """
+    The default liveness test: the addresses whose record can be read, for
+    the player only those on a map tile (0..255, not the (0, 0) of zeroed
+    memory). The bot passes its own, stricter plausible_candidates.
+    """
+    records = eomemory.read_each(pm, [(address, 8) for address in addresses])
+    live = []
+    for address, record in zip(addresses, records):
+        if record is None:
+            continue
+        if target == 'player':
+            x, y = int.from_bytes(record[0:4], 'little'), int.from_bytes(record[4:8], 'little')
+            if not (0 <= x <= 255 and 0 <= y <= 255) or (x, y) == (0, 0):
+                continue
+        live.append(address)
+    return live
+
+def tile_signature(x, y):
+    """The player signature with x/y fixed to one tile (any tile of the map, not just 4..180)."""
+    from eosignatures import PLAYER, Signature
+    return Signature(PLAYER.name, PLAYER.size, {**PLAYER.ranges, 0: (x, x), 4: (y, y)}, window=PLAYER.window)
+
+def search_ranges(signature, old_address):
+    """The region around the old address, then the scanner's whole window."""
+    low, high = signature.window
+    ranges = []
+    if old_address is not None:
+        nearby = (max(low, old_address - NEARBY_RANGE), min(high, old_address + NEARBY_RANGE))
+        if nearby[1] <= nearby[0]:
+            # Old address outside the window: look around it anyway
+            nearby = (max(eomemory.MIN_ADDRESS, old_address - NEARBY_RANGE), old_address + NEARBY_RANGE)
+        ranges.append(nearby)
+    if (low, high) not in ranges:
+        ranges.append((low, high))
+    return ranges
+
+def by_distance(addresses, old_address):
+    if old_address is None:
+        return list(addresses)
+    return sorted(addresses, key=lambda address: abs(address - old_address))
+
+class AddressWatchdog:
+    """
+    Background re-validation of a client's addresses.
+
+    locate(pm) returns the addresses from pointer chains / address files
+    (an Addresses-like object); it is tried before any memory scan.
+    plausible(pm, target, addresses) returns the addresses ('player' or
+    'mob' base addresses) whose data looks live, in order (default: readable).
+    """
+
+    def __init__(self, client, interval=CHECK_INTERVAL, locate=None, stop_event=None, plausible=None):
+        self.client = client
+        self.interval = interval
+        self.locate = locate
+        self.plausible = plausible or readable
+        self.stop_event = stop_event
+        self.last_position = None
+        self.relocations = 0
+        self._stop = threading.Event()
+        self._alert = threading.Event()
+        self._thread = None
+
+    def start(self):
+        name = f"watchdog-{self.client.pid}" if self.client.pid is not None else "watchdog"
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._alert.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+    def _wait(self, seconds):
+        """Sleep; False if the watchdog or the bot is stopping."""
+        if self._stop.wait(seconds):
+            return False
+        return self.stop_event is None or not self.stop_event.is_set()
+
+    def alert(self):
+        """Check now instead of at the next interval."""
+        self._alert.set()
+
+    def _run(self):
+        import eosignatures  # numpy loads here, on this thread, before the first check
+        while True:
+            self._alert.wait(self.interval)
+            self._alert.clear()
+            if not self._wait(0):
+                return
+            try:
+                broken = self.check()
+                if broken and self._wait(CONFIRM_DELAY):
+                    broken = self.check()
+                    if broken:
+                        self.recover(broken)
+            except Exception as e:
+                self.client.log(f"Watchdog error: {e}")
+
+    def check(self):
+        """
+        Targets ('player', 'mob') whose data no longer looks live.
+
+        None if memory can't be read at all: the process is gone or
+        restarting, which the bot's own read-failure handling deals with.
+        """
+        pm, addrs = self.client.pm, self.client.addrs
+        try:
+            player, _ = eomemory.read_many(pm, [(addrs.char_x_addr, 8), (addrs.mob_base_addr, 4)])
+        except Exception:
+            return None
+        broken = [target for target, address in (('player', addrs.char_x_addr), ('mob', addrs.mob_base_addr))
+                  if not self.plausible(pm, target, [address])]
+        if 'player' not in broken:
+            self.last_position = (int.from_bytes(player[0:4], 'little'), int.from_bytes(player[4:8], 'little'))
+        return broken
+
+    def recover(self, broken):
+        """Pause the bot until the addresses look live again (or new ones are found)."""
+        client = self.client
+        client.log(f"Watchdog: {' and '.join(broken)} address stopped holding live data, pausing and rescanning")
+        client.paused.set()
+        started = time.time()
+        try:
+            while True:
+                pm, addrs = client.pm, client.addrs
+                found = self.rescan(pm, addrs, broken)
+                if found is not None:
+                    mob_addr, player_addr = found
+                    client.relocate(mob_addr, player_addr)
+                    self.relocations += 1
+                    client.log(f"Watchdog: player 0x{player_addr:08X}, mob 0x{mob_addr:08X} "
+                               f"(found in {time.time() - started:.1f}s), resuming")
+                    return
+                if not self._wait(RETRY_DELAY):
+                    return
+                # A map change can scramble the record for a moment
+                broken = self.check()
+                if not broken:
+                    if broken is not None:
+                        client.log("Watchdog: addresses are valid again, resuming")
+                    return
+        finally:
+            client.paused.clear()
+
+    def rescan(self, pm, addrs, broken):
+        """(mob address, player address) that both look live, or None."""
+        found = {'mob': addrs.mob_base_addr, 'player': addrs.char_x_addr}
+
+        # The scanners' next candidates: no scan needed
+        for target in list(broken):
+            address = self.next_candidate(pm, addrs, target)
+            if address is not None:
+                self.client.log(f"Watchdog: failing over to {target} candidate 0x{address:08X}")
+                found[target] = address
+                broken.remove(target)
+        if not broken:
+            return found['mob'], found['player']
+
+        # Pointer chains, or address files the user just rewrote
+        if self.locate is not None:
+            located = self.locate(pm)
+            for target, address in (('mob', located.mob_base_addr), ('player', located.char_x_addr)):
+                if target not in broken or address is None:
+                    continue
+                if self.plausible(pm, target, [address]):
+                    found[target] = address
+                    broken = [name for name in broken if name != target]
+
+        for target in broken:
+            finder = self.find_player if target == 'player' else self.find_mob
+            candidates = finder(pm, found[target])
+            if not candidates:
+                return None
+            found[target] = candidates[0]
+        return found['mob'], found['player']
+
+    def next_candidate(self, pm, addrs, target):
+        """
+        The best of the other ranked candidates (addrs.candidates) whose
+        data looks live now. For the player, one on the tile last seen
+        comes first; for the mob, one holding the mob signature (zeroed
+        memory looks like a plausible mob record anywhere).
+        """
+        from eosignatures import PLAYER, MOB
+        signature = PLAYER if target == 'player' else MOB
+        current = addrs.char_x_addr if target == 'player' else addrs.mob_base_addr
+        others = [address for address in getattr(addrs, 'candidates', {}).get(target, []) if address != current]
+        if not others:
+            return None
+        live = self.plausible(pm, target, others)
+        if not live:
+            return None
+        records = eomemory.read_each(pm, [(address, signature.size) for address in live])
+        if target == 'player':
+            first = [address for address, record in zip(live, records)
+                     if record is not None and self.last_position is not None
+                     and (int.from_bytes(record[0:4], 'little'), int.from_bytes(record[4:8], 'little')) == self.last_position]
+        else:
+            first = [address for address, record in zip(live, records)
+                     if record is not None and signature.matches(record)]
+        return (first or live)[0]
+
+    def find_player(self, pm, old_address):
+        """
+        Player record candidates, nearest first. The bot was paused, so the
+        player is most likely on the tile it was last seen on: that tile is
+        searched for first (it can be outside the signature's 4..180), then
+        any tile the signature covers.
+        """
+        from eoscanstore import ScanStore
+        from eosignatures import PLAYER, PageCache, scan_regions, stable_addresses
+        signatures = [PLAYER]
+        if self.last_position is not None and all(0 <= value <= 255 for value in self.last_position):
+            signatures.insert(0, tile_signature(*self.last_position))
+        for signature in signatures:
+            for start, end in search_ranges(PLAYER, old_address):
+                regions = eomemory.enumerate_regions(pm, start, end, writable_only=True)
+                store = ScanStore(PLAYER.size)
+                cache = PageCache()
+                for scan_number in range(PLAYER_PASSES):
+                    if scan_number and not self._wait(PLAYER_PASS_DELAY):
+                        return []
+                    scan_regions(pm, regions, [(signature, store, start, end)], scan_number, cache=cache)
+                stable = stable_addresses(store, PLAYER_PASSES) if len(store) else []
+                live = self.plausible(pm, 'player', by_distance(stable, old_address)) if stable else []
+                if live:
+                    return live
+        return []
+
+    def find_mob(self, pm, old_address):
+        """Mob record candidates, nearest to the old address first."""
+        from eoscanstore import ScanStore
+        from eosignatures import MOB, PageCache, scan_regions, varied_addresses
+        for start, end in search_ranges(MOB, old_address):
+            regions = eomemory.enumerate_regions(pm, start, end, writable_only=True)
+            store = ScanStore(MOB.size)
+            cache = PageCache()
+            for scan_number in range(MOB_SAMPLES):
+                if scan_number and not self._wait(MOB_SAMPLE_DELAY):
+                    return []
+                scan_regions(pm, regions, [(MOB, store, start, end)], scan_number, cache=cache)
+            varied = varied_addresses(store, MOB_MIN_VALUES) if len(store) else []
+            if varied:
+                return by_distance(varied, old_address)
+        return []
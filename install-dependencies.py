@@ -1,84 +1,138 @@
 #!/usr/bin/env python3
 
-import subprocess
-import sys
 import os
+import sys
+import argparse
+import subprocess
+import importlib.util
+from importlib import metadata
+
+# Installed packages are checked in-process (importlib.metadata) instead of
+# one "pip show" subprocess each, and whatever is missing is installed with
+# a single pip call. On hosts without internet access, put the wheels in a
+# wheelhouse folder next to this script (pip download -d wheelhouse ...) or
+# pass --wheelhouse DIR.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WHEELHOUSE = os.path.join(SCRIPT_DIR, "wheelhouse")
+
+# Package -> platforms it is needed on (None: all). pymem is the Windows
+# memory backend; elsewhere (a client under Wine) eolinux.py reads memory.
+DEPENDENCIES = {
+    "pymem": ("win32",),
+    "psutil": None,
+    "numpy": None,
+}
+
+def required_dependencies():
+    """The packages this platform needs."""
+    return [package for package, platforms in DEPENDENCIES.items()
+            if platforms is None or sys.platform in platforms]
+
+def missing_dependencies():
+    """The required packages that aren't installed."""
+    missing = []
+    for package in required_dependencies():
+        try:
+            print(f"{package} {metadata.version(package)} is already installed.")
+        except metadata.PackageNotFoundError:
+            missing.append(package)
+    return missing
+
+def installed(package):
+    try:
+        metadata.version(package)
+        return True
+    except metadata.PackageNotFoundError:
+        return False
 
 def check_pip():
     """Check if pip is installed and install it if not."""
+    if importlib.util.find_spec("pip") is not None:
+        return True
+    print("pip is not installed. Installing pip...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "--version"], 
-                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        print("pip is already installed.")
+        # This method uses ensurepip module which should be available in Python 3.4+
+        subprocess.check_call([sys.executable, "-m", "ensurepip", "--upgrade"],
+                            stdout=subprocess.PIPE)
+        print("pip has been installed successfully.")
         return True
     except subprocess.CalledProcessError:
-        print("pip is not installed. Installing pip...")
-        try:
-            # This method uses ensurepip module which should be available in Python 3.4+
-            subprocess.check_call([sys.executable, "-m", "ensurepip", "--upgrade"], 
-                                stdout=subprocess.PIPE)
-            print("pip has been installed successfully.")
-            return True
-        except subprocess.CalledProcessError:
-            print("Failed to install pip using ensurepip.")
-            print("Please install pip manually following the instructions at:")
-            print("https://pip.pypa.io/en/stable/installation/")
-            return False
-
-def install_dependencies():
-    """Install required dependencies for the script."""
-    dependencies = [
-        "pymem",
-        "psutil"
-    ]
-    
-    print("\nChecking and installing required dependencies...")
-    for package in dependencies:
-        try:
-            # Check if package is already installed
-            subprocess.check_call([sys.executable, "-m", "pip", "show", package], 
-                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            print(f"{package} is already installed.")
-        except subprocess.CalledProcessError:
-            print(f"Installing {package}...")
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-                print(f"{package} has been installed successfully.")
-            except subprocess.CalledProcessError:
-                print(f"Failed to install {package}. Please install it manually.")
-                return False
-    
+        print("Failed to install pip using ensurepip.")
+        print("Please install pip manually following the instructions at:")
+        print("https://pip.pypa.io/en/stable/installation/")
+        return False
+
+def install_dependencies(wheelhouse=None):
+    """Install the missing dependencies in one pip call (from wheelhouse only, if given)."""
+    print("\nChecking required dependencies...")
+    missing = missing_dependencies()
+    if not missing:
+        return True
+    if not check_pip():
+        return False
+
+    command = [sys.executable, "-m", "pip", "install"]
+    if wheelhouse:
+        print(f"Installing from the wheelhouse {wheelhouse}")
+        command += ["--no-index", "--find-links", wheelhouse]
+    print(f"Installing {', '.join(missing)}...")
+    try:
+        subprocess.check_call(command + missing)
+    except subprocess.CalledProcessError:
+        print(f"Failed to install {', '.join(missing)}. Please install them manually.")
+        return False
+
+    still_missing = [package for package in missing if not installed(package)]
+    if still_missing:
+        print(f"Still missing after pip: {', '.join(still_missing)}")
+        return False
+    print(f"{', '.join(missing)} installed successfully.")
     return True
 
 def main():
+    parser = argparse.ArgumentParser(description="Check and install the scripts' dependencies")
+    parser.add_argument("--wheelhouse", metavar="DIR",
+                        help="install from the wheels in DIR only, no index (default: ./wheelhouse if it exists)")
+    parser.add_argument("--check", action="store_true",
+                        help="only report missing packages (exit status 1 if any)")
+    args = parser.parse_args()
+
     print("=== Dependency Installation for Memory Scanner Scripts ===")
-    
+
     # Check Python version
     python_version = sys.version_info
     print(f"Python version: {python_version.major}.{python_version.minor}.{python_version.micro}")
-    
-    if python_version.major < 3 or (python_version.major == 3 and python_version.minor < 6):
-        print("Warning: These scripts were designed for Python 3.6 or later.")
+
+    if args.check:
+        missing = missing_dependencies()
+        if missing:
+            print(f"Missing: {', '.join(missing)} (run this script without --check to install them)")
+        return 1 if missing else 0
+
+    if python_version.major < 3 or (python_version.major == 3 and python_version.minor < 8):
+        print("Warning: These scripts were designed for Python 3.8 or later.")
         print("Some features might not work correctly with your current Python version.")
-        
+
         response = input("Do you want to continue anyway? (y/n): ")
         if response.lower() != 'y':
             print("Installation aborted.")
-            return
-    
-    # Check and install pip if needed
-    if not check_pip():
-        return
-    
+            return 1
+
+    wheelhouse = args.wheelhouse
+    if wheelhouse is None and os.path.isdir(WHEELHOUSE):
+        wheelhouse = WHEELHOUSE
+
     # Install dependencies
-    if install_dependencies():
+    if install_dependencies(wheelhouse):
         print("\nAll dependencies have been successfully installed!")
         print("\nYou can now run the memory scanner scripts:")
         print("1. memoryscan-PLAYERloc_XYabove4.py - Find player location")
         print("2. memoryscan-MOBloc.py - Find enemy locations")
         print("3. eobot032025.py - Bot that uses the above addresses")
-    else:
-        print("\nFailed to install all dependencies. Please check the error messages above.")
+        return 0
+    print("\nFailed to install all dependencies. Please check the error messages above.")
+    return 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
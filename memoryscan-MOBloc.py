@@ -1,10 +1,13 @@
 import time
-import pymem
-import psutil
+import eomemory
+import eoprocess
 import os
 import struct
+import argparse
+import eocandidates
 from datetime import datetime
-from collections import defaultdict
+from eoscanstore import ScanStore, records_at
+from eosignatures import MOB, ChangeSampler, varied_addresses
 
 # Pattern description with dynamic values:
 # [00-03] 00 00 00 [01-FF] 00 00 00 [01-FF] 00 00 00 [00-03] 00 00 00 [00-03] 00 00 00 00 00 00 00 00 00 00 00
@@ -21,12 +24,12 @@ MIN_SCANS = 4
 # Minimum number of different values required for dynamic fields
 MIN_DIFFERENT_VALUES = 4
 
+# High-rate sampling: give up if no mob moves for this long
+SAMPLE_TIMEOUT = 30.0
+
 def select_endless_pid():
     """Find all processes named 'endless.exe' and let user pick one if there's more than one."""
-    endless_pids = []
-    for proc in psutil.process_iter():
-        if proc.name().lower() == 'endless.exe':
-            endless_pids.append(proc.pid)
+    endless_pids = eoprocess.ProcessFinder().find()
 
     if not endless_pids:
         print("No 'endless.exe' process found.")
@@ -110,23 +113,13 @@ def is_pattern_match(buffer, offset):
         # If we're near the end of the buffer, we might get an index error
         return False
 
-def extract_dynamic_values(buffer, offset):
-    """Extract the dynamic values from the matched pattern."""
-    return {
-        'first_byte': buffer[offset],
-        'fifth_byte': buffer[offset+4],
-        'ninth_byte': buffer[offset+8],
-        'control_bytes': buffer[offset+12]  # 13th and 17th bytes should be the same
-    }
-
-def format_pattern(buffer, offset):
-    """Format the matched pattern for display."""
-    pattern_bytes = buffer[offset:offset+32]
-    hex_values = ' '.join(f"{b:02X}" for b in pattern_bytes)
-    return hex_values
-
 def scan_memory(pm, scan_number):
-    """Scan memory for the pattern."""
+    """
+    Scan memory for the pattern.
+
+    Yields (addresses, records) batches: match addresses and their raw
+    32-byte records as arrays, ready for a ScanStore.
+    """
     print(f"\nScan #{scan_number}: Scanning memory range 0x{START_ADDR:08X} to 0x{END_ADDR:08X}...")
     
     # Calculate the size of memory to read
@@ -135,45 +128,26 @@ def scan_memory(pm, scan_number):
     try:
         # Read the memory block
         buffer = pm.read_bytes(START_ADDR, memory_size)
-        
-        # Found matches list: (addr, pattern_string, dynamic_values)
-        matches = []
-        
-        # Scan the buffer
-        for offset in range(0, len(buffer) - 32):
-            if is_pattern_match(buffer, offset):
-                addr = START_ADDR + offset
-                pattern = format_pattern(buffer, offset)
-                dynamic_values = extract_dynamic_values(buffer, offset)
-                matches.append((addr, pattern, dynamic_values))
-        
-        return matches
-    
     except Exception as e:
         print(f"Error scanning memory: {e}")
-        return []
+        return
 
-def check_pattern_changes(address_scans):
+    # Scan the buffer
+    offsets = MOB.find(buffer, limit=len(buffer) - 32).tolist()
+    if offsets:
+        yield [START_ADDR + offset for offset in offsets], records_at(buffer, offsets)
+
+def check_pattern_changes(store, address):
     """
     Check if the dynamic fields have enough variation across scans.
     
     According to requirements, we need at least 4 different values across the scans
     for the first three dynamic fields: first byte (00-03), fifth byte (01-FF), and ninth byte (01-FF).
     """
-    # Extract all values from the dynamic fields across all scans
-    first_bytes = []   # First byte (index 0)
-    fifth_bytes = []   # Fifth byte (index 4)
-    ninth_bytes = []   # Ninth byte (index 8)
-    
-    for _, _, dynamic_values in address_scans:
-        first_bytes.append(dynamic_values['first_byte'])
-        fifth_bytes.append(dynamic_values['fifth_byte'])
-        ninth_bytes.append(dynamic_values['ninth_byte'])
-    
     # Get unique values for each dynamic field
-    unique_first = set(first_bytes)
-    unique_fifth = set(fifth_bytes)
-    unique_ninth = set(ninth_bytes)
+    unique_first = store.values(address, 0)
+    unique_fifth = store.values(address, 4)
+    unique_ninth = store.values(address, 8)
     
     # Count total number of different values across the three fields
     total_different_values = len(unique_first) + len(unique_fifth) + len(unique_ninth)
@@ -188,87 +162,126 @@ def check_pattern_changes(address_scans):
     # We must have at least 4 different values across ALL these fields combined
     return total_different_values >= 4
 
-def write_address_to_file(valid_addresses):
-    """Write only the memory address to mobxy.txt file."""
+def output_file():
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    filename = os.path.join(script_dir, "mobxy.txt")
-    
-    with open(filename, "w") as f:
-        if valid_addresses:
-            # Write only the first valid address (hex format with 0x prefix)
-            f.write(f"0x{valid_addresses[0]:08X}")
+    return os.path.join(script_dir, "mobxy.txt")
+
+def write_address_to_file(candidates):
+    """Write every candidate to mobxy.txt, best first (see eocandidates.py)."""
+    filename = output_file()
+    eocandidates.write_candidates(filename, candidates)
     
-    print(f"\nAddress written to: {filename}")
+    print(f"\nAddresses written to: {filename}")
     return filename
 
+def sample_memory(pm):
+    """
+    Read the window at a high rate and record a match only when its bytes change.
+
+    Stops as soon as an address has been seen in MIN_SCANS different states
+    with at least MIN_DIFFERENT_VALUES values across the dynamic fields.
+    Returns the valid addresses as ranked candidates, best first.
+    """
+    print(f"Sampling 0x{START_ADDR:08X}-0x{END_ADDR:08X} until a candidate has changed enough (move near some mobs)...")
+    sampler = ChangeSampler(MOB, START_ADDR, END_ADDR)
+    started = time.time()
+    valid_addresses = sampler.run(pm, lambda s: varied_addresses(s.store, MIN_DIFFERENT_VALUES, MIN_SCANS),
+                                  SAMPLE_TIMEOUT) or []
+    print(f"{sampler.reads} reads, {sampler.samples} changes in {time.time() - started:.2f}s")
+    
+    # Confidence: share of the window changes in which the address held the pattern
+    valid_addresses.sort(key=sampler.confidence, reverse=True)
+    for addr in valid_addresses:
+        print(f"Address 0x{addr:08X}: {len(sampler.store.values(addr, 4))} y / {len(sampler.store.values(addr, 8))} x values, "
+              f"matched in {sampler.matched[addr]}/{sampler.samples} changes (confidence {sampler.confidence(addr):.0%})")
+    return eocandidates.rank(valid_addresses, {addr: sampler.confidence(addr) for addr in valid_addresses},
+                             eocandidates.store_variance(sampler.store) if valid_addresses else {},
+                             eocandidates.known_good(output_file()))
+
+def scan_passes(pm):
+    """Full scans of the window one second apart (the original mode). Returns ranked candidates."""
+    # Track all addresses across scans
+    store = ScanStore()
+    total_scan_count = 0
+    valid_addresses = []
+    
+    # Keep scanning until we find at least one valid address or hit a limit
+    scan_limit = 100  # Limit to prevent infinite scanning
+    
+    print(f"Beginning memory scans. Looking for patterns with at least {MIN_DIFFERENT_VALUES} different values.")
+    print(f"Will perform at least {MIN_SCANS} scans, and continue if needed.")
+    
+    while total_scan_count < scan_limit and (total_scan_count < MIN_SCANS or not valid_addresses):
+        total_scan_count += 1
+        
+        # Perform scan
+        match_count = store.add_scan(total_scan_count, scan_memory(pm, total_scan_count))
+        
+        # Process results
+        if match_count:
+            print(f"Scan #{total_scan_count}: Found {match_count} matching patterns.")
+            
+            # After minimum scans, check for valid addresses
+            if total_scan_count >= MIN_SCANS:
+                # Find addresses with proper variance
+                valid_addresses = []
+                print("\nEvaluating pattern changes for each address:")
+                addresses, scan_counts = store.scan_counts()
+                for addr in addresses[scan_counts >= MIN_SCANS].tolist():
+                    print(f"Address 0x{addr:08X}:")
+                    if check_pattern_changes(store, addr):
+                        valid_addresses.append(addr)
+                        print(f"  ✓ VALID - Has at least 4 changes across dynamic fields")
+                    else:
+                        print(f"  ✗ INVALID - Not enough changes in dynamic fields")
+                
+                if valid_addresses:
+                    print(f"\nFound {len(valid_addresses)} valid addresses with sufficient value changes.")
+                    print("Addresses found:")
+                    for addr in valid_addresses:
+                        print(f"  0x{addr:08X}")
+        else:
+            print(f"Scan #{total_scan_count}: No matching patterns found.")
+        
+        # Wait for next scan
+        if not valid_addresses or total_scan_count < MIN_SCANS:
+            print(f"Waiting for next scan (1 second)...")
+            time.sleep(1)
+    
+    if not valid_addresses:
+        return []
+    return eocandidates.rank(valid_addresses, eocandidates.store_consistency(store, total_scan_count),
+                             eocandidates.store_variance(store), eocandidates.known_good(output_file()))
+
 def main():
+    parser = argparse.ArgumentParser(description="Find the mob location address")
+    parser.add_argument('--passes', action='store_true',
+                        help="scan once per second instead of sampling at a high rate")
+    args = parser.parse_args()
+    
     pid = select_endless_pid()
     if pid is None:
         return
 
     try:
-        pm = pymem.Pymem(pid)
+        pm = eomemory.open_process(pid)
         print(f"Successfully attached to process ID {pid}")
         
-        # Track all addresses across scans
-        address_scans = defaultdict(list)
-        total_scan_count = 0
-        valid_addresses = []
-        
-        # Keep scanning until we find at least one valid address or hit a limit
-        scan_limit = 100  # Limit to prevent infinite scanning
-        
-        print(f"Beginning memory scans. Looking for patterns with at least {MIN_DIFFERENT_VALUES} different values.")
-        print(f"Will perform at least {MIN_SCANS} scans, and continue if needed.")
-        
-        while total_scan_count < scan_limit and (total_scan_count < MIN_SCANS or not valid_addresses):
-            total_scan_count += 1
-            
-            # Perform scan
-            scan_results = scan_memory(pm, total_scan_count)
-            
-            # Process results
-            if scan_results:
-                print(f"Scan #{total_scan_count}: Found {len(scan_results)} matching patterns.")
-                
-                # Add results to address tracking
-                for addr, pattern, dynamic_values in scan_results:
-                    address_scans[addr].append((total_scan_count, pattern, dynamic_values))
-                
-                # After minimum scans, check for valid addresses
-                if total_scan_count >= MIN_SCANS:
-                    # Find addresses with proper variance
-                    valid_addresses = []
-                    print("\nEvaluating pattern changes for each address:")
-                    for addr, scans in address_scans.items():
-                        if len(scans) >= MIN_SCANS:
-                            print(f"Address 0x{addr:08X}:")
-                            if check_pattern_changes(scans):
-                                valid_addresses.append(addr)
-                                print(f"  ✓ VALID - Has at least 4 changes across dynamic fields")
-                            else:
-                                print(f"  ✗ INVALID - Not enough changes in dynamic fields")
-                    
-                    if valid_addresses:
-                        print(f"\nFound {len(valid_addresses)} valid addresses with sufficient value changes.")
-                        print("Addresses found:")
-                        for addr in valid_addresses:
-                            print(f"  0x{addr:08X}")
-            else:
-                print(f"Scan #{total_scan_count}: No matching patterns found.")
-            
-            # Wait for next scan
-            if not valid_addresses or total_scan_count < MIN_SCANS:
-                print(f"Waiting for next scan (1 second)...")
-                time.sleep(1)
+        if args.passes:
+            valid_addresses = scan_passes(pm)
+        else:
+            valid_addresses = sample_memory(pm)
         
         # Final report and output address to file
         if valid_addresses:
+            print("\nRanked candidates:")
+            for candidate in valid_addresses:
+                print(f"  {candidate.line()}")
             result_file = write_address_to_file(valid_addresses)
             print(f"\nScan complete! {len(valid_addresses)} valid patterns found.")
-            print(f"Address has been saved to {result_file}")
+            print(f"Addresses have been saved to {result_file} (the bot tries them in this order)")
         else:
-            print(f"\nAfter {total_scan_count} scans, no valid patterns were found matching the criteria.")
+            print("\nNo valid patterns were found matching the criteria.")
             print("Try adjusting the memory range or pattern requirements.")
         
     except Exception as e:
@@ -1,9 +1,11 @@
 import time
-import pymem
-import psutil
+import eomemory
+import eoprocess
+import eocandidates
 import os
 from datetime import datetime
-from collections import defaultdict
+from eoscanstore import ScanStore, records_at, format_record
+from eosignatures import PLAYER, SignatureSet, PageCache
 
 # Pattern description:
 # (digit 4-180) 00 00 00 (digit 4-180) 00 00 00 ?? ?? 00 00 ?? ?? 00 00 00 00 00 00 00 00 00 00 ?? ?? ?? ?? ?? ?? FF FF
@@ -19,13 +21,11 @@ NUM_SCANS = 2
 
 # Chunk size for memory reading to handle the larger range
 CHUNK_SIZE = 1024 * 1024  # 1 MB chunks
+SIGNATURES = SignatureSet([PLAYER])
 
 def select_endless_pid():
     """Find all processes named 'endless.exe' and let user pick one if there's more than one."""
-    endless_pids = []
-    for proc in psutil.process_iter():
-        if proc.name().lower() == 'endless.exe':
-            endless_pids.append(proc.pid)
+    endless_pids = eoprocess.ProcessFinder().find()
 
     if not endless_pids:
         print("No 'endless.exe' process found.")
@@ -132,28 +132,21 @@ def is_pattern_match(buffer, offset, debug=False):
             print(f"  Fail: IndexError at address 0x{addr:08X}")
         return False
 
-def extract_static_values(buffer, offset):
-    """Extract the static values from the matched pattern."""
-    return {
-        'first_byte': buffer[offset],
-        'fifth_byte': buffer[offset+4],
-    }
-
 def format_pattern(buffer, offset):
     """Format the matched pattern for display."""
-    pattern_bytes = buffer[offset:offset+32]
-    hex_values = ' '.join(f"{b:02X}" for b in pattern_bytes)
-    return hex_values
+    return format_record(buffer[offset:offset+32])
+
+def scan_memory_chunk(pm, start_addr, chunk_size, scan_number, debug_mode=False, cache=None):
+    """
+    Scan a chunk of memory for the pattern.
 
-def scan_memory_chunk(pm, start_addr, chunk_size, scan_number, debug_mode=False):
-    """Scan a chunk of memory for the pattern."""
+    Returns (addresses, records): match addresses and their raw 32-byte records.
+    With a PageCache only the pages that changed since the last scan are re-matched.
+    """
     try:
         # Read the memory chunk
         buffer = pm.read_bytes(start_addr, chunk_size)
         
-        # Found matches list: (addr, pattern_string, static_values)
-        matches = []
-        
         # Special case: If the address range includes our example address, add debug info
         contains_example = (0x04F04BB0 <= start_addr <= 0x04F04BE0) or (start_addr <= 0x04F04BB0 <= start_addr + chunk_size)
         
@@ -177,27 +170,38 @@ def scan_memory_chunk(pm, start_addr, chunk_size, scan_number, debug_mode=False)
         # Enable debug mode in this specific region
         local_debug = contains_example and debug_mode
         
-        # Scan the buffer
-        for offset in range(0, len(buffer) - 32):
-            if is_pattern_match(buffer, offset, debug=local_debug):
-                addr = start_addr + offset
-                pattern = format_pattern(buffer, offset)
-                static_values = extract_static_values(buffer, offset)
-                matches.append((addr, pattern, static_values))
+        # Scan the buffer (the per-offset check only when debugging the example region)
+        if local_debug:
+            offsets = [offset for offset in range(0, len(buffer) - 32)
+                       if is_pattern_match(buffer, offset, debug=True)]
+        elif cache is not None:
+            offsets = cache.find(SIGNATURES, start_addr, buffer, len(buffer) - 32)[PLAYER].tolist()
+        else:
+            offsets = PLAYER.find(buffer, limit=len(buffer) - 32).tolist()
+        if local_debug:
+            for offset in offsets:
+                print(f"  Match at 0x{start_addr + offset:08X}: {format_pattern(buffer, offset)}")
         
-        return matches
+        return [start_addr + offset for offset in offsets], records_at(buffer, offsets)
     
     except Exception as e:
         # Print error but continue with next chunk
         print(f"Error scanning memory at 0x{start_addr:08X}: {e}")
-        return []
+        return [], None
+
+def scan_memory(pm, scan_number, debug_mode=False, cache=None):
+    """
+    Scan memory for the pattern, chunk by chunk.
 
-def scan_memory(pm, scan_number, debug_mode=False):
-    """Scan memory for the pattern, chunk by chunk."""
+    Yields one (addresses, records) batch per chunk with matches, so matches
+    stream into a ScanStore instead of piling up as Python objects. Pass the
+    same PageCache to every scan to skip pages that didn't change.
+    """
     print(f"\nScan #{scan_number}: Scanning memory range 0x{START_ADDR:08X} to 0x{END_ADDR:08X}...")
     
-    all_matches = []
+    match_count = 0
     chunks_scanned = 0
+    pages_before = (cache.pages, cache.changed_pages) if cache is not None else None
     
     # Process memory in chunks
     current_addr = START_ADDR
@@ -213,8 +217,10 @@ def scan_memory(pm, scan_number, debug_mode=False):
         
         try:
             # Scan this chunk
-            matches = scan_memory_chunk(pm, current_addr, size, scan_number, debug_mode)
-            all_matches.extend(matches)
+            addresses, records = scan_memory_chunk(pm, current_addr, size, scan_number, debug_mode, cache)
+            if addresses:
+                match_count += len(addresses)
+                yield addresses, records
             
         except Exception as e:
             print(f"Error processing chunk at 0x{current_addr:08X}: {e}")
@@ -222,38 +228,64 @@ def scan_memory(pm, scan_number, debug_mode=False):
         # Move to next chunk
         current_addr += size
     
-    print(f"Scan #{scan_number} complete. Total matches found: {len(all_matches)}")
-    return all_matches
+    print(f"Scan #{scan_number} complete. Total matches found: {match_count}")
+    if pages_before is not None and scan_number > 1:
+        pages = cache.pages - pages_before[0]
+        changed = cache.changed_pages - pages_before[1]
+        print(f"  {pages - changed} of {pages} pages unchanged since the last scan (matches reused)")
 
-def verify_consistent_patterns(address_scans):
+def verify_consistent_patterns(store):
     """
     Verify that the static values remain consistent across all scans.
     Return addresses that had the same values in all scans.
     """
-    consistent_addresses = []
+    # All three come back aligned on the same sorted address array
+    addresses, scan_counts = store.scan_counts()
+    _, first_values = store.distinct_values(0)
+    _, fifth_values = store.distinct_values(4)
     
-    for addr, scans in address_scans.items():
-        # Check if we have the right number of scans
-        if len(scans) == NUM_SCANS:
-            # Check if static values are consistent across all scans
-            first_values = set(values['first_byte'] for _, _, values in scans)
-            fifth_values = set(values['fifth_byte'] for _, _, values in scans)
-            
-            # If there's only one unique value for each static field, 
-            # then the pattern is consistent
-            if len(first_values) == 1 and len(fifth_values) == 1:
-                consistent_addresses.append(addr)
-    
-    return consistent_addresses
+    # Matched in every scan, with only one unique value for each static field
+    consistent = (scan_counts == NUM_SCANS) & (first_values == 1) & (fifth_values == 1)
+    return addresses[consistent].tolist()
+
+def read_positions(pm, addresses):
+    """The (x, y) at each address, None where it can't be read."""
+    return [(int.from_bytes(block[0:4], 'little'), int.from_bytes(block[4:8], 'little')) if block else None
+            for block in eomemory.read_each(pm, [(address, 8) for address in addresses])]
 
-def write_results_to_file(consistent_addresses, address_scans):
-    """Write scan results to a simple text file."""
+def movement_check(pm, addresses):
+    """
+    Ask the user to take one step and see which addresses followed it.
+
+    Every address passed the scans by holding still, stale copies of the
+    position included; only the live one moves with the character.
+    Returns address -> 1.0 (moved one tile) or 0.0, or None if skipped.
+    """
+    if len(addresses) < 2:
+        return None
+    before = read_positions(pm, addresses)
+    answer = input("\nMove your character one tile, then press Enter (s + Enter to skip): ").strip().lower()
+    if answer == 's':
+        return None
+    after = read_positions(pm, addresses)
+    moved = {}
+    for address, old, new in zip(addresses, before, after):
+        stepped = old is not None and new is not None and abs(new[0] - old[0]) + abs(new[1] - old[1]) == 1
+        moved[address] = 1.0 if stepped else 0.0
+    print(f"{sum(moved.values()):.0f} of {len(addresses)} addresses followed the step.")
+    return moved
+
+def write_results_to_file(consistent_addresses, store, moved=None):
+    """Write the consistent addresses to playerxy.txt as ranked candidates (see eocandidates.py)."""
     script_dir = os.path.dirname(os.path.abspath(__file__))
     filename = os.path.join(script_dir, "playerxy.txt")
     
-    with open(filename, "w") as f:
-        for addr in consistent_addresses:
-            f.write(f"0x{addr:08X}\n")
+    # Addresses that followed the step first, then those closest to one the bot confirmed
+    candidates = eocandidates.rank(consistent_addresses, eocandidates.store_consistency(store, NUM_SCANS),
+                                   known=eocandidates.known_good(filename), moved=moved)
+    eocandidates.write_candidates(filename, candidates)
+    for candidate in candidates:
+        print(f"  {candidate.line()}")
     
     print(f"\nResults written to: {filename}")
     return filename
@@ -268,11 +300,12 @@ def main():
     specific_addr = None
     
     try:
-        pm = pymem.Pymem(pid)
+        pm = eomemory.open_process(pid)
         print(f"Successfully attached to process ID {pid}")
         
-        # Track all addresses across scans
-        address_scans = defaultdict(list)
+        # Track all addresses across scans; later scans re-match changed pages only
+        store = ScanStore()
+        cache = PageCache()
         
         print(f"\nBeginning {NUM_SCANS} memory scans. Looking for consistent patterns across all scans.")
         print(f"Pattern: (digit 4-180) 00 00 00 (digit 4-180) 00 00 00 ?? ?? 00 00 ?? ?? 00 00 00 00 00 00 00 00 00 00 ?? ?? FF FF ?? ?? FF FF")
@@ -281,18 +314,14 @@ def main():
         # Perform all scans
         for scan_num in range(1, NUM_SCANS + 1):
             # Perform scan
-            scan_results = scan_memory(pm, scan_num, debug_mode)
+            match_count = store.add_scan(scan_num, scan_memory(pm, scan_num, debug_mode, cache))
             
             # Process results
-            if scan_results:
-                print(f"Scan #{scan_num}: Found {len(scan_results)} matching patterns.")
-                
-                # Add results to address tracking
-                for addr, pattern, static_values in scan_results:
-                    address_scans[addr].append((scan_num, pattern, static_values))
+            if match_count:
+                print(f"Scan #{scan_num}: Found {match_count} matching patterns.")
                 
                 # Progress display
-                print(f"Current unique addresses being tracked: {len(address_scans)}")
+                print(f"Current unique addresses being tracked: {len(store.unique_addresses())}")
             else:
                 print(f"Scan #{scan_num}: No matching patterns found.")
             
@@ -305,7 +334,7 @@ def main():
         print("\nAll scans complete. Analyzing results...")
         
         # Find addresses that maintained consistent values across all scans
-        consistent_addresses = verify_consistent_patterns(address_scans)
+        consistent_addresses = verify_consistent_patterns(store)
         
         # Final report
         if consistent_addresses:
@@ -315,7 +344,8 @@ def main():
                 print(f"0x{addr:08X}")
                 
             # Write to file
-            result_file = write_results_to_file(consistent_addresses, address_scans)
+            moved = movement_check(pm, consistent_addresses)
+            result_file = write_results_to_file(consistent_addresses, store, moved)
             print(f"\nScan complete! {len(consistent_addresses)} consistent patterns found.")
             print(f"Results have been saved to {result_file}")
         else: